@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""document template sharing flag
+
+Revision ID: 0002_template_is_shared
+Revises: 0001_initial
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0002_template_is_shared"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.add_column(
+        "document_templates",
+        sa.Column("is_shared", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    migrations.drop_column("document_templates", "is_shared")
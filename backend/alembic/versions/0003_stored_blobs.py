@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+"""content-addressed blob store
+
+Revision ID: 0003_stored_blobs
+Revises: 0002_template_is_shared
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0003_stored_blobs"
+down_revision = "0002_template_is_shared"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.create_table(
+        "stored_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("storage_path", sa.String(500), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    migrations.drop_table("stored_blobs")
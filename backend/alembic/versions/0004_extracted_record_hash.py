@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+"""canonical content hash on extracted records
+
+Revision ID: 0004_extracted_record_hash
+Revises: 0003_stored_blobs
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0004_extracted_record_hash"
+down_revision = "0003_stored_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.add_column("extracted_records", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    migrations.drop_column("extracted_records", "content_hash")
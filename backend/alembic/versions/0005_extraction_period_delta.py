@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+"""period-over-period delta on extractions
+
+Revision ID: 0005_extraction_period_delta
+Revises: 0004_extracted_record_hash
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0005_extraction_period_delta"
+down_revision = "0004_extracted_record_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.add_column("extractions", sa.Column("period_delta", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    migrations.drop_column("extractions", "period_delta")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+"""versioned reference datasets stored as deltas
+
+Revision ID: 0006_reference_versions
+Revises: 0005_extraction_period_delta
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from app.db import migrations
+
+revision = "0006_reference_versions"
+down_revision = "0005_extraction_period_delta"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.add_column("reference_datasets", sa.Column("lineage_id", sa.Uuid(), nullable=True))
+    migrations.create_index("ix_reference_datasets_lineage_id", "reference_datasets", ["lineage_id"])
+    migrations.add_column("reference_datasets", sa.Column("previous_version_id", sa.Uuid(), nullable=True))
+    migrations.create_foreign_key(
+        "fk_reference_datasets_previous_version_id",
+        "reference_datasets",
+        "reference_datasets",
+        ["previous_version_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    migrations.add_column(
+        "reference_datasets", sa.Column("version_number", sa.Integer(), nullable=False, server_default="1")
+    )
+    migrations.add_column(
+        "reference_datasets", sa.Column("storage_mode", sa.String(10), nullable=False, server_default="full")
+    )
+    migrations.add_column(
+        "reference_datasets", sa.Column("delta_summary", sa.JSON(), nullable=False, server_default=sa.text("'{}'"))
+    )
+
+    migrations.add_column("reference_records", sa.Column("record_key", sa.String(255), nullable=True))
+    migrations.create_index("ix_reference_records_record_key", "reference_records", ["record_key"])
+    migrations.add_column("reference_records", sa.Column("content_hash", sa.String(64), nullable=True))
+    migrations.add_column(
+        "reference_records", sa.Column("change_type", sa.String(20), nullable=False, server_default="full")
+    )
+
+
+def downgrade() -> None:
+    migrations.drop_index("ix_reference_records_record_key", "reference_records")
+    for column in ("change_type", "content_hash", "record_key"):
+        migrations.drop_column("reference_records", column)
+    migrations.drop_index("ix_reference_datasets_lineage_id", "reference_datasets")
+    migrations.drop_foreign_key("fk_reference_datasets_previous_version_id", "reference_datasets")
+    for column in ("delta_summary", "storage_mode", "version_number", "previous_version_id", "lineage_id"):
+        migrations.drop_column("reference_datasets", column)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+"""audit chain head row
+
+Revision ID: 0007_audit_chain_head
+Revises: 0006_reference_versions
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0007_audit_chain_head"
+down_revision = "0006_reference_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.create_table(
+        "audit_chain_head",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("last_entry_id", sa.Integer(), nullable=True),
+        sa.Column("last_hash", sa.String(64), nullable=True),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    migrations.drop_table("audit_chain_head")
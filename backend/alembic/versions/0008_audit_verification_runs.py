@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+"""background audit verification runs
+
+Revision ID: 0008_audit_verification_runs
+Revises: 0007_audit_chain_head
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0008_audit_verification_runs"
+down_revision = "0007_audit_chain_head"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.create_table(
+        "audit_verification_runs",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("requested_by", sa.Uuid(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("total_entries", sa.Integer(), nullable=False),
+        sa.Column("checked_entries", sa.Integer(), nullable=False),
+        sa.Column("valid", sa.Boolean(), nullable=True),
+        sa.Column("first_invalid_id", sa.Integer(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    migrations.create_index("ix_audit_verification_runs_status", "audit_verification_runs", ["status"])
+    migrations.create_index("ix_audit_verification_runs_created_at", "audit_verification_runs", ["created_at"])
+
+
+def downgrade() -> None:
+    migrations.drop_table("audit_verification_runs")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+"""signed audit verification checkpoints
+
+Revision ID: 0009_audit_checkpoints
+Revises: 0008_audit_verification_runs
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0009_audit_checkpoints"
+down_revision = "0008_audit_verification_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.add_column(
+        "audit_verification_runs", sa.Column("full", sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    migrations.add_column("audit_verification_runs", sa.Column("start_after_id", sa.Integer(), nullable=True))
+    migrations.create_table(
+        "audit_verification_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("last_entry_id", sa.Integer(), nullable=False),
+        sa.Column("last_hash", sa.String(64), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "run_id",
+            sa.Uuid(),
+            sa.ForeignKey("audit_verification_runs.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("signature", sa.String(64), nullable=False),
+    )
+    migrations.create_index(
+        "ix_audit_verification_checkpoints_last_entry_id", "audit_verification_checkpoints", ["last_entry_id"]
+    )
+
+
+def downgrade() -> None:
+    migrations.drop_table("audit_verification_checkpoints")
+    migrations.drop_column("audit_verification_runs", "start_after_id")
+    migrations.drop_column("audit_verification_runs", "full")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+"""Merkle index over the audit log
+
+Revision ID: 0010_audit_merkle
+Revises: 0009_audit_checkpoints
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0010_audit_merkle"
+down_revision = "0009_audit_checkpoints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Entries written before this revision join the index only after
+    # app.scripts.rebuild_audit_merkle has been run.
+    migrations.add_column(
+        "audit_chain_head", sa.Column("merkle_size", sa.Integer(), nullable=False, server_default="0")
+    )
+    migrations.add_column(
+        "audit_chain_head", sa.Column("merkle_peaks", sa.JSON(), nullable=False, server_default=sa.text("'[]'"))
+    )
+    migrations.add_column("audit_chain_head", sa.Column("merkle_period", sa.String(20), nullable=True))
+    migrations.create_table(
+        "audit_merkle_nodes",
+        sa.Column("level", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("node_index", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("entry_id", sa.Integer(), nullable=True),
+        sa.Column("hash", sa.String(64), nullable=False),
+    )
+    migrations.create_index("ix_audit_merkle_nodes_entry_id", "audit_merkle_nodes", ["entry_id"])
+    migrations.create_table(
+        "audit_merkle_roots",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("period", sa.String(20), nullable=False),
+        sa.Column("tree_size", sa.Integer(), nullable=False),
+        sa.Column("root_hash", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    migrations.create_index("ix_audit_merkle_roots_period", "audit_merkle_roots", ["period"])
+
+
+def downgrade() -> None:
+    migrations.drop_table("audit_merkle_roots")
+    migrations.drop_table("audit_merkle_nodes")
+    for column in ("merkle_period", "merkle_peaks", "merkle_size"):
+        migrations.drop_column("audit_chain_head", column)
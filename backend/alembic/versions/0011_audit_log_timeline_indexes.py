@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+"""composite (filter, timestamp, id) indexes on audit_log
+
+Revision ID: 0011_audit_log_timeline_indexes
+Revises: 0010_audit_merkle
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+from app.db import migrations
+
+revision = "0011_audit_log_timeline_indexes"
+down_revision = "0010_audit_merkle"
+branch_labels = None
+depends_on = None
+
+SINGLE_COLUMN = ("timestamp", "actor_id", "request_id", "action", "entity_type")
+TIMELINE = {
+    "ix_audit_log_timeline": ["timestamp", "id"],
+    "ix_audit_log_actor_timeline": ["actor_id", "timestamp", "id"],
+    "ix_audit_log_request_timeline": ["request_id", "timestamp", "id"],
+    "ix_audit_log_action_timeline": ["action", "timestamp", "id"],
+    "ix_audit_log_entity_timeline": ["entity_type", "entity_id", "timestamp", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in TIMELINE.items():
+        migrations.create_index(name, "audit_log", columns)
+    for column in SINGLE_COLUMN:
+        migrations.drop_index(f"ix_audit_log_{column}", "audit_log")
+
+
+def downgrade() -> None:
+    for column in SINGLE_COLUMN:
+        migrations.create_index(f"ix_audit_log_{column}", "audit_log", [column])
+    for name in TIMELINE:
+        migrations.drop_index(name, "audit_log")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+"""archived audit log segments
+
+Revision ID: 0012_audit_archive_segments
+Revises: 0011_audit_log_timeline_indexes
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0012_audit_archive_segments"
+down_revision = "0011_audit_log_timeline_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    migrations.create_table(
+        "audit_archive_segments",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("period", sa.String(20), nullable=False),
+        sa.Column("first_entry_id", sa.Integer(), nullable=False, unique=True),
+        sa.Column("last_entry_id", sa.Integer(), nullable=False, unique=True),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("first_previous_hash", sa.String(64), nullable=True),
+        sa.Column("last_hash", sa.String(64), nullable=False),
+        sa.Column("first_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("storage_key", sa.String(255), nullable=False),
+        sa.Column("file_sha256", sa.String(64), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    migrations.create_index("ix_audit_archive_segments_period", "audit_archive_segments", ["period"])
+
+
+def downgrade() -> None:
+    migrations.drop_table("audit_archive_segments")
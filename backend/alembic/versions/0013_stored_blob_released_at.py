@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""tombstone timestamp for released blobs
+
+Revision ID: 0013_stored_blob_released_at
+Revises: 0012_audit_archive_segments
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0013_stored_blob_released_at"
+down_revision = "0012_audit_archive_segments"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not migrations.has_column("stored_blobs", "released_at"):
+        op.add_column("stored_blobs", sa.Column("released_at", sa.DateTime(timezone=True), nullable=True))
+        # Blobs already unreferenced start their grace period now.
+        op.execute(sa.text("UPDATE stored_blobs SET released_at = CURRENT_TIMESTAMP WHERE ref_count <= 0"))
+
+
+def downgrade() -> None:
+    migrations.drop_column("stored_blobs", "released_at")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+"""archive segment key filters and storage-backend keys
+
+Revision ID: 0014_audit_archive_key_filter
+Revises: 0013_stored_blob_released_at
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0014_audit_archive_key_filter"
+down_revision = "0013_stored_blob_released_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Segments archived before this revision keep no key filter and are
+    # always scanned. Their files already sit under audit-archive/ in local
+    # storage, which is where the storage backend now resolves them from.
+    migrations.add_column("audit_archive_segments", sa.Column("key_filter", sa.LargeBinary(), nullable=True))
+    op.execute(
+        sa.text(
+            "UPDATE audit_archive_segments SET storage_key = 'audit-archive/' || storage_key "
+            "WHERE storage_key NOT LIKE 'audit-archive/%'"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        sa.text(
+            "UPDATE audit_archive_segments SET storage_key = substr(storage_key, 15) "
+            "WHERE storage_key LIKE 'audit-archive/%'"
+        )
+    )
+    migrations.drop_column("audit_archive_segments", "key_filter")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+"""one version number per reference lineage
+
+Revision ID: 0015_reference_version_unique
+Revises: 0014_audit_archive_key_filter
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db import migrations
+
+revision = "0015_reference_version_unique"
+down_revision = "0014_audit_archive_key_filter"
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = "uq_reference_datasets_lineage_version"
+
+
+def upgrade() -> None:
+    # Concurrent uploads may already have forked a lineage into duplicate
+    # version numbers; those lineages are renumbered in upload order first.
+    bind = op.get_bind()
+    datasets = sa.table(
+        "reference_datasets",
+        sa.column("id", sa.Uuid()),
+        sa.column("lineage_id", sa.Uuid()),
+        sa.column("version_number", sa.Integer()),
+        sa.column("uploaded_at", sa.DateTime(timezone=True)),
+    )
+    duplicated = (
+        sa.select(datasets.c.lineage_id)
+        .where(datasets.c.lineage_id.is_not(None))
+        .group_by(datasets.c.lineage_id, datasets.c.version_number)
+        .having(sa.func.count() > 1)
+    )
+    rows = bind.execute(
+        sa.select(datasets.c.id, datasets.c.lineage_id)
+        .where(datasets.c.lineage_id.in_(duplicated))
+        .order_by(datasets.c.lineage_id, datasets.c.version_number, datasets.c.uploaded_at, datasets.c.id)
+    ).all()
+    numbers: dict[object, int] = {}
+    for row in rows:
+        numbers[row.lineage_id] = numbers.get(row.lineage_id, 0) + 1
+        bind.execute(
+            datasets.update().where(datasets.c.id == row.id).values(version_number=numbers[row.lineage_id])
+        )
+
+    migrations.create_unique_constraint(CONSTRAINT, "reference_datasets", ["lineage_id", "version_number"])
+
+
+def downgrade() -> None:
+    migrations.drop_constraint(CONSTRAINT, "reference_datasets")
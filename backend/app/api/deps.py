@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import TokenPayloadError, decode_access_token
 from app.db.session import get_db
 from app.models import User
+from app.services.audit_writer import audit_writer, read_access_event, should_record_read
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -60,12 +61,15 @@ async def get_current_user_optional(
 
 
 def require_roles(*allowed_roles: str) -> Callable[[User], User]:
-    async def _require_role(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+    async def _require_role(request: Request, current_user: Annotated[User, Depends(get_current_user)]) -> User:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
             )
+        if should_record_read(request, current_user):
+            # Read access is audited write-behind so GETs never wait on the chain.
+            await audit_writer.enqueue(read_access_event(request, current_user))
         return current_user
 
     return _require_role
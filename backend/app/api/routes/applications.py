@@ -18,6 +18,7 @@ from app.schemas.application import (
 )
 from app.schemas.common import MessageResponse
 from app.services.audit_service import record_audit_event
+from app.services.template_index import template_index
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -174,6 +175,7 @@ async def create_template(
         mapping=payload.mapping,
         validation=payload.validation,
         confidence_threshold=payload.confidence_threshold,
+        is_shared=payload.is_shared,
         created_by=current_user.id,
     )
     db.add(template)
@@ -192,6 +194,7 @@ async def create_template(
 
     await db.commit()
     await db.refresh(template)
+    template_index.upsert(template)
     return DocumentTemplateOut.model_validate(template)
 
 
@@ -255,6 +258,7 @@ async def update_template(
 
     await db.commit()
     await db.refresh(template)
+    template_index.upsert(template)
     return DocumentTemplateOut.model_validate(template)
 
 
@@ -291,4 +295,5 @@ async def delete_template(
         request_id=get_request_id(request),
     )
     await db.commit()
+    template_index.remove(template.id)
     return MessageResponse(message="Template archived")
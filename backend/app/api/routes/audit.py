@@ -1,53 +1,216 @@
 from __future__ import annotations
 
-import csv
-import io
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, require_roles
-from app.models import AuditLog, User
-from app.schemas.audit import AuditEntryOut, AuditVerificationResponse
-from app.services.audit_service import verify_audit_hash_chain
+from app.api.deps import get_db, get_request_id, require_roles
+from app.models import AuditArchiveSegment, AuditChainHead, AuditLog, AuditMerkleRoot, AuditVerificationRun, User
+from app.schemas.audit import (
+    AuditArchiveSegmentOut,
+    AuditEntryOut,
+    AuditEntryPage,
+    AuditVerificationResponse,
+    AuditVerificationRunOut,
+    ConsistencyProofOut,
+    InclusionProofOut,
+    MerkleRootOut,
+)
+from app.services.audit_export import EXPORT_FORMATS, iter_audit_export
+from app.services.audit_merkle import (
+    MerkleProofError,
+    consistency_proof,
+    current_tree_size,
+    inclusion_proof,
+    root_from_peaks,
+)
+from app.services.audit_archive import ArchiveIntegrityError
+from app.services.audit_query import AuditFilters, InvalidCursorError, audit_filters, page_audit_entries
+from app.services.audit_service import (
+    CHAIN_HEAD_ID,
+    record_audit_event,
+    record_verification_checkpoint,
+    verify_audit_chain_job,
+    verify_audit_hash_chain,
+)
+from app.services.task_service import background_jobs
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
 
-@router.get("", response_model=list[AuditEntryOut])
+@router.get("", response_model=AuditEntryPage)
 async def list_audit_entries(
     _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
     db: Annotated[AsyncSession, Depends(get_db)],
-    entity_type: str | None = None,
-    action: str | None = None,
+    filters: Annotated[AuditFilters, Depends(audit_filters)],
+    cursor: str | None = None,
     limit: int = 200,
-) -> list[AuditEntryOut]:
-    query = select(AuditLog).order_by(AuditLog.timestamp.desc()).limit(min(limit, 500))
-    if entity_type:
-        query = query.where(AuditLog.entity_type == entity_type)
-    if action:
-        query = query.where(AuditLog.action == action)
+) -> AuditEntryPage:
+    return await _audit_page(db, filters, cursor, limit)
 
-    result = await db.execute(query)
-    return [AuditEntryOut.model_validate(item) for item in result.scalars().all()]
+
+@router.get("/entities/{entity_type}/{entity_id}", response_model=AuditEntryPage)
+async def entity_timeline(
+    entity_type: str,
+    entity_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cursor: str | None = None,
+    limit: int = 200,
+) -> AuditEntryPage:
+    filters = AuditFilters(entity_type=entity_type, entity_id=entity_id)
+    return await _audit_page(db, filters, cursor, limit)
+
+
+async def _audit_page(
+    db: AsyncSession,
+    filters: AuditFilters,
+    cursor: str | None,
+    limit: int,
+) -> AuditEntryPage:
+    try:
+        entries, next_cursor = await page_audit_entries(db, filters, cursor=cursor, limit=limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except ArchiveIntegrityError as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    return AuditEntryPage(
+        items=[AuditEntryOut.model_validate(item) for item in entries],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
 
 
 @router.post("/verify", response_model=AuditVerificationResponse)
 async def verify_chain(
     _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    full: bool = False,
 ) -> AuditVerificationResponse:
-    result = await verify_audit_hash_chain(db)
+    result = await verify_audit_hash_chain(db, full=full)
+    if await record_verification_checkpoint(db, result):
+        await db.commit()
     return AuditVerificationResponse(
         valid=result.valid,
         checked_entries=result.checked_entries,
         first_invalid_id=result.first_invalid_id,
         message=result.message,
+        start_after_id=result.start_after_id,
+        last_entry_id=result.last_entry_id,
+    )
+
+
+@router.post("/verify/runs", response_model=AuditVerificationRunOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_verification_run(
+    request: Request,
+    current_user: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    full: bool = False,
+) -> AuditVerificationRunOut:
+    run = AuditVerificationRun(status="pending", requested_by=current_user.id, full=full)
+    db.add(run)
+    await db.flush()
+
+    await record_audit_event(
+        db,
+        actor_id=current_user.id,
+        actor_type="USER",
+        action="verify",
+        entity_type="audit_log",
+        entity_id=run.id,
+        before_state=None,
+        after_state={"status": "pending", "full": full},
+        request_id=get_request_id(request),
+    )
+    await db.commit()
+    await db.refresh(run)
+    background_jobs.submit(verify_audit_chain_job(run.id))
+    return AuditVerificationRunOut.model_validate(run)
+
+
+@router.get("/verify/runs", response_model=list[AuditVerificationRunOut])
+async def list_verification_runs(
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = 20,
+) -> list[AuditVerificationRunOut]:
+    result = await db.execute(
+        select(AuditVerificationRun).order_by(AuditVerificationRun.created_at.desc()).limit(min(limit, 100))
     )
+    return [AuditVerificationRunOut.model_validate(item) for item in result.scalars().all()]
+
+
+@router.get("/verify/runs/{run_id}", response_model=AuditVerificationRunOut)
+async def get_verification_run(
+    run_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AuditVerificationRunOut:
+    run = await db.get(AuditVerificationRun, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Verification run not found")
+    return AuditVerificationRunOut.model_validate(run)
+
+
+@router.get("/merkle/root", response_model=MerkleRootOut)
+async def get_merkle_root(
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> MerkleRootOut:
+    head = await db.get(AuditChainHead, CHAIN_HEAD_ID)
+    if head is None or not head.merkle_size:
+        return MerkleRootOut(tree_size=0, root_hash=None)
+    return MerkleRootOut(tree_size=head.merkle_size, root_hash=root_from_peaks(head.merkle_peaks))
+
+
+@router.get("/merkle/roots", response_model=list[MerkleRootOut])
+async def list_merkle_roots(
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = 90,
+) -> list[MerkleRootOut]:
+    result = await db.execute(select(AuditMerkleRoot).order_by(AuditMerkleRoot.tree_size.desc()).limit(min(limit, 500)))
+    return [MerkleRootOut.model_validate(item) for item in result.scalars().all()]
+
+
+@router.get("/merkle/inclusion/{entry_id}", response_model=InclusionProofOut)
+async def get_inclusion_proof(
+    entry_id: int,
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    tree_size: int | None = None,
+) -> InclusionProofOut:
+    current_size = await current_tree_size(db)
+    if tree_size is not None and not 0 < tree_size <= current_size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tree size out of range")
+    try:
+        proof = await inclusion_proof(db, entry_id, tree_size or current_size)
+    except MerkleProofError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return InclusionProofOut(**proof)
+
+
+@router.get("/merkle/consistency", response_model=ConsistencyProofOut)
+async def get_consistency_proof(
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    first: int,
+    second: int | None = None,
+) -> ConsistencyProofOut:
+    current_size = await current_tree_size(db)
+    second = second or current_size
+    if second > current_size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tree size out of range")
+    try:
+        proof = await consistency_proof(db, first, second)
+    except MerkleProofError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return ConsistencyProofOut(**proof)
 
 
 @router.get("/stats")
@@ -57,62 +220,46 @@ async def audit_stats(
 ) -> dict[str, int | str]:
     total_result = await db.execute(select(func.count()).select_from(AuditLog))
     total = int(total_result.scalar() or 0)
+    archived_result = await db.execute(select(func.coalesce(func.sum(AuditArchiveSegment.entry_count), 0)))
+    archived = int(archived_result.scalar() or 0)
 
     latest_result = await db.execute(select(AuditLog).order_by(AuditLog.id.desc()).limit(1))
     latest = latest_result.scalar_one_or_none()
 
     return {
-        "entries": total,
+        "entries": total + archived,
+        "live_entries": total,
+        "archived_entries": archived,
         "last_entry_at": latest.timestamp.isoformat() if latest else "",
     }
 
 
+@router.get("/archive/segments", response_model=list[AuditArchiveSegmentOut])
+async def list_archive_segments(
+    _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[AuditArchiveSegmentOut]:
+    result = await db.execute(select(AuditArchiveSegment).order_by(AuditArchiveSegment.first_entry_id.asc()))
+    return [AuditArchiveSegmentOut.model_validate(item) for item in result.scalars().all()]
+
+
 @router.get("/export")
 async def export_audit(
     _: Annotated[User, Depends(require_roles("admin", "auditor", "examiner"))],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    filters: Annotated[AuditFilters, Depends(audit_filters)],
     fmt: str = "json",
-):
-    result = await db.execute(select(AuditLog).order_by(AuditLog.id.asc()))
-    entries = list(result.scalars().all())
-
-    if fmt.lower() == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["id", "timestamp", "actor_id", "action", "entity_type", "entity_id", "content_hash", "previous_hash"])
-        for entry in entries:
-            writer.writerow(
-                [
-                    entry.id,
-                    entry.timestamp.isoformat(),
-                    str(entry.actor_id) if entry.actor_id else "",
-                    entry.action,
-                    entry.entity_type,
-                    str(entry.entity_id) if entry.entity_id else "",
-                    entry.content_hash,
-                    entry.previous_hash or "",
-                ]
-            )
-
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=audit-{datetime.utcnow().date().isoformat()}.csv"},
-        )
-
-    payload = [
-        {
-            "id": entry.id,
-            "timestamp": entry.timestamp.isoformat(),
-            "actor_id": str(entry.actor_id) if entry.actor_id else None,
-            "action": entry.action,
-            "entity_type": entry.entity_type,
-            "entity_id": str(entry.entity_id) if entry.entity_id else None,
-            "content_hash": entry.content_hash,
-            "previous_hash": entry.previous_hash,
-            "metadata": entry.audit_metadata,
-        }
-        for entry in entries
-    ]
-    return payload
+    gzip: bool = False,
+) -> StreamingResponse:
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported export format")
+
+    filename = f"audit-{datetime.now(UTC).date().isoformat()}.{fmt}"
+    media_type = EXPORT_FORMATS[fmt]
+    if gzip:
+        filename, media_type = f"{filename}.gz", "application/gzip"
+    return StreamingResponse(
+        iter_audit_export(fmt, filters, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
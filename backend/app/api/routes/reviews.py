@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import json
-import uuid
+from dataclasses import asdict
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_request_id, require_roles
 from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
 from app.models import (
     Document,
     DocumentTemplate,
@@ -38,24 +41,47 @@ from app.schemas.review import (
     AnalyzeResponse,
     DocumentOut,
     ExtractionOut,
+    ExtractionPreviewOut,
+    PreviewColumn,
     ReviewCreate,
     ReviewOut,
     ReviewStatusUpdate,
     ReviewUpdate,
 )
 from app.services.analysis_service import run_review_analysis
-from app.services.audit_service import record_audit_event
+from app.services.audit_service import AuditEvent, record_audit_event, record_audit_events_batch
+from app.services.blob_store import collect_unreferenced_blobs, release_blob, staging_dir, store_blob
+from app.services.bulk_loader import bulk_insert_rows
+from app.services.delta_service import compute_extraction_delta
+from app.services.extraction_snapshot import load_payloads_by_id, snapshot_extraction_job
 from app.services.extraction_service import (
+    ExtractionChecksum,
+    ExtractionError,
     apply_mapping,
-    compute_extraction_checksum,
-    compute_sha256,
-    load_rows_from_bytes,
+    infer_column_types,
     parse_iso_datetime,
 )
+from app.services.parallel_extraction import AmbiguousCsvSplitError, extract_csv_parallel, should_extract_in_parallel
+from app.services.parse_cache import load_rows_cached, read_stored_encoding, read_stored_header, read_stored_rows
+from app.services.reference_versions import (
+    delta_chain_length,
+    label_removed_rows,
+    load_reference_records,
+    lock_previous_version,
+    next_version_number,
+    plan_version,
+    previous_version_state,
+    write_version_index,
+)
+from app.services.storage import get_storage_backend
+from app.services.task_service import TaskState, background_jobs, task_registry
+from app.services.template_index import template_index
+from app.services.upload_service import StagedUpload, UploadTooLargeError, discard_upload, stage_upload
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 ALLOWED_UPLOAD_EXTENSIONS = {".csv", ".xlsx", ".xls", ".json", ".xml", ".pdf"}
+PREVIEW_MAX_ROWS = 500
 
 VALID_REVIEW_TRANSITIONS = {
     "created": {"documents_uploaded", "cancelled"},
@@ -81,36 +107,51 @@ async def _resolve_matching_template(
     db: AsyncSession,
     review: Review,
     filename: str,
-    rows: list[dict[str, Any]],
+    file_hash: str,
+    storage_key: str,
 ) -> tuple[DocumentTemplate | None, float]:
     ext = Path(filename).suffix.lower().replace(".", "")
+    await template_index.ensure_fresh(db)
+
+    detection_key = (file_hash, review.application_id, ext)
+    detection = template_index.cached_detection(detection_key)
+    if detection is None:
+        try:
+            columns = await asyncio.to_thread(read_stored_header, filename, storage_key)
+        except Exception:
+            columns = []
+        detection = template_index.detect(review.application_id, ext, columns) if columns else (None, 0.0)
+        template_index.remember_detection(detection_key, detection)
+
+    template_id, confidence = detection
+    if template_id is None:
+        return None, 0.0
 
     result = await db.execute(
-        select(DocumentTemplate).where(
-            DocumentTemplate.application_id == review.application_id,
-            DocumentTemplate.is_active.is_(True),
-            DocumentTemplate.format == ext,
-        )
+        select(DocumentTemplate).where(DocumentTemplate.id == template_id, DocumentTemplate.is_active.is_(True))
     )
-    templates = list(result.scalars().all())
-
-    if not templates or not rows:
+    template = result.scalar_one_or_none()
+    if not template:
         return None, 0.0
+    return template, confidence
 
-    row_keys = set(rows[0].keys())
-    best: tuple[DocumentTemplate | None, float] = (None, 0.0)
-    for template in templates:
-        required = set(
-            (template.detection or {}).get("required_columns", [])
-        )
-        required = {key.strip().lower().replace(" ", "_") for key in required}
-        if not required:
-            continue
-        overlap = len(required.intersection(row_keys)) / len(required)
-        if overlap > best[1]:
-            best = (template, overlap)
 
-    return best
+async def _validate_previous_review(
+    db: AsyncSession,
+    application_id: UUID,
+    previous_review_id: UUID,
+    review_id: UUID | None = None,
+) -> None:
+    if previous_review_id == review_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A review cannot precede itself")
+    result = await db.execute(select(Review).where(Review.id == previous_review_id, Review.is_active.is_(True)))
+    previous = result.scalar_one_or_none()
+    if not previous:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Previous review not found")
+    if previous.application_id != application_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Previous review must belong to the same application"
+        )
 
 
 @router.get("", response_model=list[ReviewOut])
@@ -152,6 +193,9 @@ async def create_review(
     if not framework:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Framework not found")
 
+    if payload.previous_review_id:
+        await _validate_previous_review(db, payload.application_id, payload.previous_review_id)
+
     review = Review(
         name=payload.name,
         application_id=payload.application_id,
@@ -161,6 +205,7 @@ async def create_review(
         period_end=payload.period_end,
         due_date=payload.due_date,
         assigned_to=payload.assigned_to,
+        previous_review_id=payload.previous_review_id,
         status="created",
         created_by=current_user.id,
     )
@@ -215,9 +260,12 @@ async def update_review(
         "due_date": review.due_date.isoformat() if review.due_date else None,
         "assigned_to": str(review.assigned_to) if review.assigned_to else None,
         "reviewer_notes": review.reviewer_notes,
+        "previous_review_id": str(review.previous_review_id) if review.previous_review_id else None,
     }
 
     updates = payload.model_dump(exclude_unset=True)
+    if updates.get("previous_review_id"):
+        await _validate_previous_review(db, review.application_id, updates["previous_review_id"], review.id)
     for field, value in updates.items():
         setattr(review, field, value)
 
@@ -336,66 +384,41 @@ async def delete_review(
     return MessageResponse(message="Review deleted")
 
 
-@router.post("/{review_id}/documents", response_model=DocumentOut)
-async def upload_document(
-    review_id: UUID,
-    file: UploadFile = File(...),
-    document_role: str = Form("primary"),
-    request: Request = None,
-    current_user: User = Depends(require_roles("admin", "analyst", "reviewer")),
-    db: AsyncSession = Depends(get_db),
-) -> DocumentOut:
-    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
-    review = review_result.scalar_one_or_none()
-    if not review:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
-
-    ext = Path(file.filename).suffix.lower()
-    if ext not in ALLOWED_UPLOAD_EXTENSIONS:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="FILE_FORMAT_UNSUPPORTED")
-
-    content = await file.read()
-    max_bytes = get_settings().max_file_size_mb * 1024 * 1024
-    if len(content) > max_bytes:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="FILE_TOO_LARGE")
-
-    file_hash = compute_sha256(content)
-
+async def _ingest_document(
+    db: AsyncSession,
+    review: Review,
+    staged: StagedUpload,
+    filename: str,
+    document_role: str,
+    actor_id: UUID,
+    request_id: str | None,
+) -> Document:
     duplicate = await db.execute(
         select(Document).where(
             Document.review_id == review.id,
-            Document.file_hash == file_hash,
+            Document.file_hash == staged.file_hash,
             Document.is_active.is_(True),
         )
     )
     if duplicate.scalar_one_or_none():
+        await discard_upload(staged)
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Duplicate file upload")
 
-    upload_dir = Path(get_settings().file_storage_path)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    stored_name = f"{uuid.uuid4()}{ext}"
-    stored_path = upload_dir / stored_name
-    stored_path.write_bytes(content)
-
-    parsed_rows: list[dict[str, Any]] = []
-    try:
-        parsed_rows = load_rows_from_bytes(file.filename, content)
-    except Exception:
-        parsed_rows = []
+    blob = await store_blob(db, staged)
 
-    template, confidence = await _resolve_matching_template(db, review, file.filename, parsed_rows)
+    template, confidence = await _resolve_matching_template(db, review, filename, staged.file_hash, blob.storage_path)
 
     document = Document(
         review_id=review.id,
-        filename=file.filename,
-        stored_path=str(stored_path),
-        file_hash=file_hash,
-        file_size=len(content),
-        file_format=ext.replace(".", ""),
+        filename=filename,
+        stored_path=blob.storage_path,
+        file_hash=staged.file_hash,
+        file_size=staged.size,
+        file_format=Path(filename).suffix.lower().replace(".", ""),
         template_id=template.id if template else None,
         template_match_confidence=round(confidence, 2) if template else None,
         document_role=document_role,
-        uploaded_by=current_user.id,
+        uploaded_by=actor_id,
     )
     db.add(document)
 
@@ -404,7 +427,7 @@ async def upload_document(
 
     await record_audit_event(
         db,
-        actor_id=current_user.id,
+        actor_id=actor_id,
         actor_type="USER",
         action="upload",
         entity_type="document",
@@ -415,7 +438,37 @@ async def upload_document(
             "file_hash": document.file_hash,
             "template_id": str(document.template_id) if document.template_id else None,
         },
-        request_id=get_request_id(request),
+        request_id=request_id,
+    )
+    return document
+
+
+@router.post("/{review_id}/documents", response_model=DocumentOut)
+async def upload_document(
+    review_id: UUID,
+    file: UploadFile = File(...),
+    document_role: str = Form("primary"),
+    request: Request = None,
+    current_user: User = Depends(require_roles("admin", "analyst", "reviewer")),
+    db: AsyncSession = Depends(get_db),
+) -> DocumentOut:
+    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
+    review = review_result.scalar_one_or_none()
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+
+    ext = Path(file.filename).suffix.lower()
+    if ext not in ALLOWED_UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="FILE_FORMAT_UNSUPPORTED")
+
+    max_bytes = get_settings().max_file_size_mb * 1024 * 1024
+    try:
+        staged = await stage_upload(file, staging_dir(), max_bytes)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="FILE_TOO_LARGE") from exc
+
+    document = await _ingest_document(
+        db, review, staged, file.filename, document_role, current_user.id, get_request_id(request)
     )
 
     await db.commit()
@@ -423,6 +476,147 @@ async def upload_document(
     return DocumentOut.model_validate(document)
 
 
+async def _stage_batch_file(file: UploadFile, max_bytes: int) -> StagedUpload:
+    if Path(file.filename or "").suffix.lower() not in ALLOWED_UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="FILE_FORMAT_UNSUPPORTED")
+    try:
+        return await stage_upload(file, staging_dir(), max_bytes)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="FILE_TOO_LARGE") from exc
+
+
+async def _process_batch_document(
+    task: TaskState,
+    review_id: UUID,
+    staged: StagedUpload,
+    filename: str,
+    document_role: str,
+    auto_extract: bool,
+    actor_id: UUID,
+    request_id: str | None,
+) -> None:
+    task_registry.start(task, message=f"Storing {filename}")
+    async with AsyncSessionLocal() as db:
+        try:
+            review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
+            review = review_result.scalar_one_or_none()
+            if not review:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+
+            document = await _ingest_document(db, review, staged, filename, document_role, actor_id, request_id)
+            await db.commit()
+        except HTTPException as exc:
+            await discard_upload(staged)
+            task_registry.fail(task, str(exc.detail))
+            return
+        except Exception as exc:
+            await discard_upload(staged)
+            task_registry.fail(task, str(exc))
+            raise
+        task.result.update(
+            {
+                "document_id": str(document.id),
+                "template_id": str(document.template_id) if document.template_id else None,
+            }
+        )
+
+        # The document is committed from here on and its blob is in use, so an
+        # extraction failure leaves the upload completed with the error noted.
+        if auto_extract and document.template_id:
+            task_registry.report(task, 50, 100, message=f"Extracting {filename}")
+            try:
+                extraction = await _extract_document(db, review, document, actor_id, request_id)
+            except HTTPException as exc:
+                task_registry.complete(task, {"extraction_error": str(exc.detail)})
+                return
+            except Exception as exc:
+                task_registry.complete(task, {"extraction_error": str(exc)})
+                raise
+            task.result.update({"extraction_id": str(extraction.id), "record_count": extraction.record_count})
+    task_registry.complete(task)
+
+
+def _batch_status(batch_id: str, tasks: list[TaskState]) -> dict[str, Any]:
+    counts = {state: 0 for state in ("pending", "processing", "completed", "failed")}
+    for task in tasks:
+        counts[task.status] = counts.get(task.status, 0) + 1
+    return {
+        "batch_id": batch_id,
+        "total": len(tasks),
+        "counts": counts,
+        "done": counts["completed"] + counts["failed"] == len(tasks),
+        "files": [task.to_dict() for task in tasks],
+    }
+
+
+@router.post("/{review_id}/documents/batch", status_code=status.HTTP_202_ACCEPTED)
+async def upload_documents_batch(
+    review_id: UUID,
+    files: list[UploadFile] = File(...),
+    document_role: str = Form("primary"),
+    auto_extract: bool = Form(False),
+    request: Request = None,
+    current_user: User = Depends(require_roles("admin", "analyst", "reviewer")),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
+    review = review_result.scalar_one_or_none()
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+
+    settings = get_settings()
+    if len(files) > settings.batch_upload_max_files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="TOO_MANY_FILES")
+
+    batch_id = str(uuid4())
+    tasks = []
+    for file in files:
+        task = task_registry.create("document_upload", review_id=review.id, group_id=batch_id)
+        task.result = {"batch_id": batch_id, "filename": file.filename}
+        tasks.append(task)
+
+    # The request body is only readable until the response is sent, so staging
+    # happens here; everything after the hash is handed to background jobs.
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+    staged_files = await asyncio.gather(
+        *(_stage_batch_file(file, max_bytes) for file in files), return_exceptions=True
+    )
+
+    request_id = get_request_id(request)
+    seen_hashes: set[str] = set()
+    for task, file, staged in zip(tasks, files, staged_files):
+        if isinstance(staged, HTTPException):
+            task_registry.fail(task, str(staged.detail))
+            continue
+        if isinstance(staged, BaseException):
+            task_registry.fail(task, str(staged))
+            continue
+        if staged.file_hash in seen_hashes:
+            await discard_upload(staged)
+            task_registry.fail(task, "Duplicate file upload")
+            continue
+        seen_hashes.add(staged.file_hash)
+        background_jobs.submit(
+            _process_batch_document(
+                task, review.id, staged, file.filename, document_role, auto_extract, current_user.id, request_id
+            )
+        )
+
+    return _batch_status(batch_id, tasks)
+
+
+@router.get("/{review_id}/documents/batch/{batch_id}")
+async def get_document_batch(
+    review_id: UUID,
+    batch_id: str,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
+) -> dict[str, Any]:
+    tasks = [task for task in task_registry.list_for_group(batch_id) if task.review_id == str(review_id)]
+    if not tasks:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return _batch_status(batch_id, tasks)
+
+
 @router.get("/{review_id}/documents", response_model=list[DocumentOut])
 async def list_documents(
     review_id: UUID,
@@ -437,6 +631,79 @@ async def list_documents(
     return [DocumentOut.model_validate(item) for item in result.scalars().all()]
 
 
+@router.get("/{review_id}/documents/{document_id}/download-url")
+async def document_download_url(
+    review_id: UUID,
+    document_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, str]:
+    doc_result = await db.execute(
+        select(Document).where(Document.id == document_id, Document.review_id == review_id, Document.is_active.is_(True))
+    )
+    document = doc_result.scalar_one_or_none()
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    url, expires_at = await get_storage_backend().create_download_url(
+        document.stored_path, document.filename, get_settings().download_url_ttl_seconds
+    )
+    return {"url": url, "expires_at": expires_at.isoformat()}
+
+
+@router.get("/{review_id}/documents/{document_id}/preview", response_model=ExtractionPreviewOut)
+async def preview_document(
+    review_id: UUID,
+    document_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    rows: Annotated[int, Query(ge=1, le=PREVIEW_MAX_ROWS)] = 10,
+    template_id: UUID | None = None,
+) -> ExtractionPreviewOut:
+    doc_result = await db.execute(
+        select(Document).where(Document.id == document_id, Document.review_id == review_id, Document.is_active.is_(True))
+    )
+    document = doc_result.scalar_one_or_none()
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    template: DocumentTemplate | None = None
+    if template_id or document.template_id:
+        template_result = await db.execute(
+            select(DocumentTemplate).where(
+                DocumentTemplate.id == (template_id or document.template_id),
+                DocumentTemplate.is_active.is_(True),
+            )
+        )
+        template = template_result.scalar_one_or_none()
+        if template_id and not template:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+
+    try:
+        sample = await asyncio.to_thread(
+            read_stored_rows, document.filename, document.file_hash, document.stored_path, rows
+        )
+    except ExtractionError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    records: list[dict[str, Any]] = []
+    warnings: list[dict[str, Any]] = []
+    confidence: float | None = None
+    if template:
+        records, warnings, confidence = apply_mapping(sample, template.mapping)
+
+    return ExtractionPreviewOut(
+        document_id=document.id,
+        template_id=template.id if template else None,
+        row_count=len(sample),
+        columns=[PreviewColumn(name=name, type=kind) for name, kind in infer_column_types(sample).items()],
+        rows=sample,
+        records=records,
+        warnings=warnings,
+        confidence=confidence,
+    )
+
+
 @router.delete("/{review_id}/documents/{document_id}", response_model=MessageResponse)
 async def delete_document(
     review_id: UUID,
@@ -460,6 +727,7 @@ async def delete_document(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
     doc.is_active = False
+    await release_blob(db, doc.file_hash)
 
     await record_audit_event(
         db,
@@ -473,29 +741,18 @@ async def delete_document(
         request_id=get_request_id(request),
     )
     await db.commit()
+    await collect_unreferenced_blobs(db)
+    await db.commit()
     return MessageResponse(message="Document removed")
 
 
-@router.post("/{review_id}/documents/{document_id}/extract", response_model=ExtractionOut)
-async def extract_document(
-    review_id: UUID,
-    document_id: UUID,
-    request: Request,
-    current_user: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer"))],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> ExtractionOut:
-    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
-    review = review_result.scalar_one_or_none()
-    if not review:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
-
-    doc_result = await db.execute(
-        select(Document).where(Document.id == document_id, Document.review_id == review_id, Document.is_active.is_(True))
-    )
-    document = doc_result.scalar_one_or_none()
-    if not document:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
-
+async def _extract_document(
+    db: AsyncSession,
+    review: Review,
+    document: Document,
+    actor_id: UUID,
+    request_id: str | None,
+) -> Extraction:
     template: DocumentTemplate | None = None
     if document.template_id:
         template_result = await db.execute(
@@ -506,9 +763,27 @@ async def extract_document(
     if not template:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No template matched for extraction")
 
-    content = Path(document.stored_path).read_bytes()
-    rows = load_rows_from_bytes(document.filename, content)
-    extracted_rows, warnings, confidence = apply_mapping(rows, template.mapping)
+    checksum = ExtractionChecksum()
+    extraction_tool = "pandas/csv"
+    local_path = get_storage_backend().local_path(document.stored_path)
+    encoding = await asyncio.to_thread(read_stored_encoding, document.filename, document.stored_path)
+    mapped = None
+    if should_extract_in_parallel(document.filename, document.file_size, local_path, encoding):
+        try:
+            mapped = await asyncio.to_thread(
+                extract_csv_parallel, local_path, template.mapping, checksum=checksum, encoding=encoding.encoding
+            )
+            extraction_tool = "csv/parallel"
+        except AmbiguousCsvSplitError:
+            # The file cannot be split safely; the serial parser handles any quoting.
+            pass
+    if mapped is None:
+        rows = await asyncio.to_thread(load_rows_cached, document.filename, document.file_hash, document.stored_path)
+        mapped = apply_mapping(rows, template.mapping, checksum=checksum)
+    extracted_rows, warnings, confidence = mapped
+
+    task = task_registry.create("extraction", review_id=review.id)
+    task_registry.start(task, message=f"Extracting {document.filename}")
 
     extraction = Extraction(
         review_id=review.id,
@@ -519,44 +794,59 @@ async def extract_document(
         warning_count=len(warnings),
         error_count=0,
         confidence_score=confidence,
-        extraction_tool="pandas/csv",
-        extraction_metadata={"template": template.name},
+        extraction_tool=extraction_tool,
+        extraction_metadata={
+            "template": template.name,
+            "task_id": task.id,
+            **({"encoding": asdict(encoding)} if encoding else {}),
+        },
         warnings=warnings,
-        checksum=compute_extraction_checksum(extracted_rows),
+        checksum=checksum.hexdigest(),
     )
     db.add(extraction)
     await db.flush()
 
-    records_to_add: list[ExtractedRecord] = []
-    for i, record in enumerate(extracted_rows):
-        records_to_add.append(
-            ExtractedRecord(
-                extraction_id=extraction.id,
-                record_index=i + 1,
-                record_type="user_access",
-                identifier=record.get("identifier"),
-                display_name=record.get("display_name"),
-                email=record.get("email"),
-                status=record.get("status"),
-                last_activity=parse_iso_datetime(record.get("last_activity")),
-                department=record.get("department"),
-                manager=record.get("manager"),
-                account_type=record.get("account_type") or "human",
-                roles=record.get("roles") or [],
-                extended_attributes=record.get("extended_attributes") or {},
-                data=record.get("data") or {},
-                validation_status=record.get("validation_status") or "valid",
-                validation_messages=record.get("validation_messages") or [],
-            )
+    record_rows = (
+        {
+            "extraction_id": extraction.id,
+            "record_index": i + 1,
+            "record_type": "user_access",
+            "identifier": record.get("identifier"),
+            "display_name": record.get("display_name"),
+            "email": record.get("email"),
+            "status": record.get("status"),
+            "last_activity": parse_iso_datetime(record.get("last_activity")),
+            "department": record.get("department"),
+            "manager": record.get("manager"),
+            "account_type": record.get("account_type") or "human",
+            "roles": record.get("roles") or [],
+            "extended_attributes": record.get("extended_attributes") or {},
+            "data": record.get("data") or {},
+            "validation_status": record.get("validation_status") or "valid",
+            "validation_messages": record.get("validation_messages") or [],
+            "content_hash": record.get("content_hash"),
+        }
+        for i, record in enumerate(extracted_rows)
+    )
+    try:
+        await bulk_insert_rows(
+            db,
+            ExtractedRecord.__table__,
+            record_rows,
+            on_progress=lambda done: task_registry.report(
+                task, done, len(extracted_rows), message=f"Stored {done} of {len(extracted_rows)} records"
+            ),
         )
-    db.add_all(records_to_add)
+    except Exception as exc:
+        task_registry.fail(task, str(exc))
+        raise
 
     if review.status in {"created", "documents_uploaded"}:
         review.status = "extracted"
 
     await record_audit_event(
         db,
-        actor_id=current_user.id,
+        actor_id=actor_id,
         actor_type="USER",
         action="execute",
         entity_type="extraction",
@@ -568,11 +858,36 @@ async def extract_document(
             "warning_count": extraction.warning_count,
             "confidence": float(extraction.confidence_score or 0),
         },
-        request_id=get_request_id(request),
+        request_id=request_id,
     )
 
     await db.commit()
+    task_registry.complete(task, result={"extraction_id": str(extraction.id), "record_count": extraction.record_count})
     await db.refresh(extraction)
+    return extraction
+
+
+@router.post("/{review_id}/documents/{document_id}/extract", response_model=ExtractionOut)
+async def extract_document(
+    review_id: UUID,
+    document_id: UUID,
+    request: Request,
+    current_user: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> ExtractionOut:
+    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
+    review = review_result.scalar_one_or_none()
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+
+    doc_result = await db.execute(
+        select(Document).where(Document.id == document_id, Document.review_id == review_id, Document.is_active.is_(True))
+    )
+    document = doc_result.scalar_one_or_none()
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    extraction = await _extract_document(db, review, document, current_user.id, get_request_id(request))
     return ExtractionOut.model_validate(extraction)
 
 
@@ -622,6 +937,10 @@ async def confirm_extraction(
     extraction.confirmed_by = current_user.id
     extraction.confirmed_at = datetime.now(UTC)
 
+    previous_review_id = await db.scalar(select(Review.previous_review_id).where(Review.id == review_id))
+    if previous_review_id:
+        extraction.period_delta = await compute_extraction_delta(db, extraction, previous_review_id)
+
     await record_audit_event(
         db,
         actor_id=current_user.id,
@@ -635,9 +954,72 @@ async def confirm_extraction(
     )
 
     await db.commit()
+    background_jobs.submit(snapshot_extraction_job(extraction.id))
     return MessageResponse(message="Extraction confirmed")
 
 
+async def _active_extraction(db: AsyncSession, review_id: UUID, document_id: UUID) -> Extraction:
+    extraction_result = await db.execute(
+        select(Extraction)
+        .where(
+            Extraction.review_id == review_id,
+            Extraction.document_id == document_id,
+            Extraction.is_active.is_(True),
+        )
+        .order_by(Extraction.created_at.desc())
+    )
+    extraction = extraction_result.scalars().first()
+    if not extraction:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Extraction not found")
+    return extraction
+
+
+@router.get("/{review_id}/documents/{document_id}/delta")
+async def get_extraction_delta(
+    review_id: UUID,
+    document_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    extraction = await _active_extraction(db, review_id, document_id)
+    if extraction.period_delta is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delta not computed")
+    return {"extraction_id": str(extraction.id), **extraction.period_delta}
+
+
+@router.post("/{review_id}/documents/{document_id}/delta")
+async def compute_delta(
+    review_id: UUID,
+    document_id: UUID,
+    request: Request,
+    current_user: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    review_result = await db.execute(select(Review).where(Review.id == review_id, Review.is_active.is_(True)))
+    review = review_result.scalar_one_or_none()
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    if not review.previous_review_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Review has no previous review")
+
+    extraction = await _active_extraction(db, review_id, document_id)
+    extraction.period_delta = await compute_extraction_delta(db, extraction, review.previous_review_id)
+
+    await record_audit_event(
+        db,
+        actor_id=current_user.id,
+        actor_type="USER",
+        action="execute",
+        entity_type="extraction_delta",
+        entity_id=extraction.id,
+        before_state=None,
+        after_state={"previous_review_id": str(review.previous_review_id), **extraction.period_delta["counts"]},
+        request_id=get_request_id(request),
+    )
+    await db.commit()
+    return {"extraction_id": str(extraction.id), **extraction.period_delta}
+
+
 @router.post("/{review_id}/reference-datasets/{dataset_id}", response_model=MessageResponse)
 async def attach_reference_dataset(
     review_id: UUID,
@@ -681,7 +1063,11 @@ async def attach_reference_dataset(
         entity_type="reference_dataset",
         entity_id=dataset.id,
         before_state=None,
-        after_state={"review_id": str(review_id), "dataset_id": str(dataset_id)},
+        after_state={
+            "review_id": str(review_id),
+            "dataset_id": str(dataset_id),
+            "version_number": dataset.version_number,
+        },
         request_id=get_request_id(request),
     )
     await db.commit()
@@ -826,25 +1212,28 @@ async def bulk_disposition(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more findings not found")
 
     now = datetime.now(UTC)
+    request_id = get_request_id(request)
+    events: list[AuditEvent] = []
     for finding in findings:
         finding.disposition = payload.disposition
         finding.disposition_note = payload.justification
         finding.disposition_by = current_user.id
         finding.disposition_at = now
-
-        await record_audit_event(
-            db,
-            actor_id=current_user.id,
-            actor_type="USER",
-            action="update",
-            entity_type="finding",
-            entity_id=finding.id,
-            before_state=None,
-            after_state={"disposition": payload.disposition, "bulk": True},
-            request_id=get_request_id(request),
-            metadata={"bulk_count": len(findings)},
+        events.append(
+            AuditEvent(
+                actor_id=current_user.id,
+                actor_type="USER",
+                action="update",
+                entity_type="finding",
+                entity_id=finding.id,
+                before_state=None,
+                after_state={"disposition": payload.disposition, "bulk": True},
+                request_id=request_id,
+                metadata={"bulk_count": len(findings)},
+            )
         )
 
+    await record_audit_events_batch(db, events)
     await db.commit()
     return BulkDispositionResponse(updated=len(findings))
 
@@ -929,7 +1318,11 @@ async def review_progress(
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
 
+    tasks = task_registry.list_for_review(review.id)
+
     async def event_stream():
+        for task in tasks:
+            yield f"event: task_progress\ndata: {json.dumps(task.to_dict())}\n\n"
         payload = {
             "event": "review_status",
             "review_id": str(review.id),
@@ -953,26 +1346,27 @@ async def finding_records(
     if not finding:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Finding not found")
 
-    record_ids = [UUID(rid) for rid in finding.affected_record_ids]
-    if not record_ids:
+    if not finding.affected_record_ids:
         return {"items": []}
 
-    records_result = await db.execute(select(ExtractedRecord).where(ExtractedRecord.id.in_(record_ids)))
-    records = list(records_result.scalars().all())
+    extractions_result = await db.execute(
+        select(Extraction).where(Extraction.review_id == review_id, Extraction.is_active.is_(True))
+    )
+    records = await load_payloads_by_id(db, list(extractions_result.scalars().all()), finding.affected_record_ids)
 
     return {
         "items": [
             {
-                "id": str(record.id),
-                "identifier": record.identifier,
-                "display_name": record.display_name,
-                "email": record.email,
-                "status": record.status,
-                "last_activity": record.last_activity.isoformat() if record.last_activity else None,
-                "roles": record.roles,
-                "department": record.department,
-                "data": record.data,
-                "extended_attributes": record.extended_attributes,
+                "id": record["id"],
+                "identifier": record["identifier"],
+                "display_name": record["display_name"],
+                "email": record["email"],
+                "status": record["status"],
+                "last_activity": record["last_activity"].isoformat() if record["last_activity"] else None,
+                "roles": record["roles"],
+                "department": record["department"],
+                "data": record["data"],
+                "extended_attributes": record["extended_attributes"],
             }
             for record in records
         ]
@@ -1008,6 +1402,8 @@ async def list_reference_datasets(
                 "data_type": dataset.data_type,
                 "source_system": dataset.source_system,
                 "record_count": dataset.record_count,
+                "version_number": dataset.version_number,
+                "previous_version_id": str(dataset.previous_version_id) if dataset.previous_version_id else None,
                 "uploaded_at": dataset.uploaded_at.isoformat(),
                 "freshness_threshold_days": dataset.freshness_threshold_days,
                 "freshness_status": freshness,
@@ -1022,6 +1418,7 @@ async def upload_reference_dataset(
     data_type: str = Form(...),
     source_system: str = Form("manual"),
     freshness_threshold_days: int = Form(30),
+    previous_version_id: UUID | None = Form(None),
     file: UploadFile = File(...),
     request: Request = None,
     current_user: User = Depends(require_roles("admin", "analyst")),
@@ -1031,44 +1428,69 @@ async def upload_reference_dataset(
     if ext not in ALLOWED_UPLOAD_EXTENSIONS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="FILE_FORMAT_UNSUPPORTED")
 
-    content = await file.read()
-    file_hash = compute_sha256(content)
-
-    storage_dir = Path(get_settings().file_storage_path) / "reference"
-    storage_dir.mkdir(parents=True, exist_ok=True)
-    stored_name = f"{uuid.uuid4()}{ext}"
-    stored_path = storage_dir / stored_name
-    stored_path.write_bytes(content)
-
-    rows = load_rows_from_bytes(file.filename, content)
+    previous = await lock_previous_version(db, name, data_type, previous_version_id)
+    if previous_version_id and not previous:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Previous version not found")
 
+    settings = get_settings()
+    try:
+        staged = await stage_upload(file, staging_dir(), settings.max_file_size_mb * 1024 * 1024)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="FILE_TOO_LARGE") from exc
+
+    file_hash = staged.file_hash
+    blob = await store_blob(db, staged)
+
+    rows = await asyncio.to_thread(load_rows_cached, file.filename, file_hash, blob.storage_path)
+
+    previous_state = None
+    compact = False
+    if previous:
+        previous_state = await previous_version_state(db, previous)
+        compact = await delta_chain_length(db, previous) >= settings.reference_max_delta_chain
+        if previous.lineage_id is None:
+            previous.lineage_id = previous.id
+    plan = await asyncio.to_thread(plan_version, rows, previous_state, compact)
+    await label_removed_rows(db, plan)
+
+    dataset_id = uuid4()
     dataset = ReferenceDataset(
+        id=dataset_id,
         name=name,
         data_type=data_type,
         source_system=source_system,
         freshness_threshold_days=freshness_threshold_days,
-        file_path=str(stored_path),
+        file_path=blob.storage_path,
         file_hash=file_hash,
-        record_count=len(rows),
+        record_count=len(plan.live_ids),
+        lineage_id=previous.lineage_id if previous else dataset_id,
+        previous_version_id=previous.id if previous else None,
+        version_number=await next_version_number(db, previous) if previous else 1,
+        storage_mode=plan.storage_mode,
+        delta_summary=plan.counts,
         uploaded_by=current_user.id,
     )
     db.add(dataset)
-    await db.flush()
-
-    records: list[ReferenceRecord] = []
-    for idx, row in enumerate(rows):
-        records.append(
-            ReferenceRecord(
-                dataset_id=dataset.id,
-                record_index=idx + 1,
-                identifier=row.get("employee_id") or row.get("identifier") or row.get("userid"),
-                display_name=row.get("name") or row.get("display_name") or row.get("username"),
-                email=(row.get("email") or "").lower() if row.get("email") else None,
-                employment_status=(row.get("status") or row.get("employment_status") or "").lower() or None,
-                department=row.get("department"),
-            )
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Another version of this dataset was uploaded concurrently"
+        ) from exc
+
+    task = task_registry.create("reference_upload")
+    task_registry.start(task, message=f"Loading {file.filename}")
+    try:
+        await bulk_insert_rows(
+            db,
+            ReferenceRecord.__table__,
+            ({**row, "dataset_id": dataset.id} for row in plan.rows),
+            on_progress=lambda done: task_registry.report(task, done, len(plan.rows)),
         )
-    db.add_all(records)
+    except Exception as exc:
+        task_registry.fail(task, str(exc))
+        raise
 
     await record_audit_event(
         db,
@@ -1078,39 +1500,52 @@ async def upload_reference_dataset(
         entity_type="reference_dataset",
         entity_id=dataset.id,
         before_state=None,
-        after_state={"name": name, "record_count": len(rows)},
+        after_state={
+            "name": name,
+            "record_count": dataset.record_count,
+            "version_number": dataset.version_number,
+            "previous_version_id": str(dataset.previous_version_id) if dataset.previous_version_id else None,
+            "storage_mode": dataset.storage_mode,
+            "delta": plan.counts,
+        },
         request_id=get_request_id(request),
     )
     await db.commit()
+    await write_version_index(dataset.id, plan.live_ids)
+    task_registry.complete(task, result={"dataset_id": str(dataset.id), "record_count": dataset.record_count})
 
     return {
         "id": str(dataset.id),
         "name": dataset.name,
         "record_count": dataset.record_count,
         "file_hash": dataset.file_hash,
+        "version_number": dataset.version_number,
+        "previous_version_id": str(dataset.previous_version_id) if dataset.previous_version_id else None,
+        "storage_mode": dataset.storage_mode,
+        "stored_rows": len(plan.rows),
+        "delta": plan.counts,
+        "task_id": task.id,
     }
 
 
-@reference_router.get("/{dataset_id}")
-async def get_reference_dataset(
-    dataset_id: UUID,
-    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> dict[str, Any]:
+async def _get_active_dataset(db: AsyncSession, dataset_id: UUID) -> ReferenceDataset:
     dataset_result = await db.execute(
         select(ReferenceDataset).where(ReferenceDataset.id == dataset_id, ReferenceDataset.is_active.is_(True))
     )
     dataset = dataset_result.scalar_one_or_none()
     if not dataset:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dataset not found")
+    return dataset
 
-    records_result = await db.execute(
-        select(ReferenceRecord)
-        .where(ReferenceRecord.dataset_id == dataset.id)
-        .order_by(ReferenceRecord.record_index.asc())
-        .limit(5)
-    )
-    sample = list(records_result.scalars().all())
+
+@reference_router.get("/{dataset_id}")
+async def get_reference_dataset(
+    dataset_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    dataset = await _get_active_dataset(db, dataset_id)
+    sample = await load_reference_records(db, dataset, limit=5)
 
     return {
         "id": str(dataset.id),
@@ -1120,6 +1555,10 @@ async def get_reference_dataset(
         "record_count": dataset.record_count,
         "uploaded_at": dataset.uploaded_at.isoformat(),
         "file_hash": dataset.file_hash,
+        "version_number": dataset.version_number,
+        "previous_version_id": str(dataset.previous_version_id) if dataset.previous_version_id else None,
+        "storage_mode": dataset.storage_mode,
+        "delta": dataset.delta_summary,
         "sample_records": [
             {
                 "identifier": rec.identifier,
@@ -1133,6 +1572,35 @@ async def get_reference_dataset(
     }
 
 
+@reference_router.get("/{dataset_id}/versions")
+async def list_reference_dataset_versions(
+    dataset_id: UUID,
+    _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[dict[str, Any]]:
+    dataset = await _get_active_dataset(db, dataset_id)
+    lineage_id = dataset.lineage_id or dataset.id
+    result = await db.execute(
+        select(ReferenceDataset)
+        .where((ReferenceDataset.lineage_id == lineage_id) | (ReferenceDataset.id == lineage_id))
+        .order_by(ReferenceDataset.version_number.asc())
+    )
+    return [
+        {
+            "id": str(version.id),
+            "version_number": version.version_number,
+            "previous_version_id": str(version.previous_version_id) if version.previous_version_id else None,
+            "storage_mode": version.storage_mode,
+            "record_count": version.record_count,
+            "delta": version.delta_summary,
+            "file_hash": version.file_hash,
+            "uploaded_at": version.uploaded_at.isoformat(),
+            "is_active": version.is_active,
+        }
+        for version in result.scalars().all()
+    ]
+
+
 @reference_router.get("/{dataset_id}/records")
 async def get_reference_dataset_records(
     dataset_id: UUID,
@@ -1140,13 +1608,8 @@ async def get_reference_dataset_records(
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = 200,
 ) -> dict[str, Any]:
-    result = await db.execute(
-        select(ReferenceRecord)
-        .where(ReferenceRecord.dataset_id == dataset_id)
-        .order_by(ReferenceRecord.record_index.asc())
-        .limit(min(limit, 200))
-    )
-    rows = list(result.scalars().all())
+    dataset = await _get_active_dataset(db, dataset_id)
+    rows = await load_reference_records(db, dataset, limit=min(limit, 200))
     return {
         "items": [
             {
@@ -1178,6 +1641,7 @@ async def deactivate_reference_dataset(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dataset not found")
 
     dataset.is_active = False
+    await release_blob(db, dataset.file_hash)
 
     await record_audit_event(
         db,
@@ -1191,4 +1655,6 @@ async def deactivate_reference_dataset(
         request_id=get_request_id(request),
     )
     await db.commit()
+    await collect_unreferenced_blobs(db)
+    await db.commit()
     return MessageResponse(message="Reference dataset deactivated")
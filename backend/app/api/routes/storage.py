@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.services.storage import (
+    StorageError,
+    StorageObjectNotFound,
+    content_disposition,
+    decode_download_token,
+    get_storage_backend,
+)
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    start_text, end_text = match.groups()
+    if not start_text:
+        length = int(end_text)
+        if length == 0 or size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    if start > end:
+        return None
+    return start, end
+
+
+@router.get("/download")
+async def download(token: str, request: Request) -> StreamingResponse:
+    try:
+        payload = decode_download_token(token)
+    except StorageError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+
+    backend = get_storage_backend()
+    key = payload["key"]
+    try:
+        size = await backend.size(key)
+    except StorageObjectNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found") from exc
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition(payload.get("filename") or "download"),
+    }
+    range_header = request.headers.get("range")
+    if range_header:
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Invalid range",
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            backend.iter_bytes(key, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(backend.iter_bytes(key), media_type="application/octet-stream", headers=headers)
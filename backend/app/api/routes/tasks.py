@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.deps import require_roles
 from app.models import User
+from app.services.task_service import task_registry
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -16,13 +16,7 @@ async def get_task(
     task_id: str,
     _: Annotated[User, Depends(require_roles("admin", "analyst", "reviewer", "auditor", "examiner"))],
 ) -> dict:
-    return {
-        "id": task_id,
-        "type": "analysis",
-        "status": "completed",
-        "progress": 100,
-        "started_at": datetime.now(UTC).isoformat(),
-        "completed_at": datetime.now(UTC).isoformat(),
-        "error_message": None,
-        "review_id": None,
-    }
+    task = task_registry.get(task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return task.to_dict()
@@ -25,11 +25,39 @@ class Settings(BaseSettings):
     session_idle_timeout_minutes: int = 30
     max_concurrent_sessions: int = 3
 
+    storage_backend: Literal["local", "s3"] = "local"
     file_storage_path: str = "backend/uploads"
+    s3_bucket: str | None = None
+    s3_prefix: str = ""
+    s3_endpoint_url: str | None = None
+    s3_region: str | None = None
+    s3_access_key_id: str | None = None
+    s3_secret_access_key: str | None = None
+    download_url_ttl_seconds: int = 300
     max_file_size_mb: int = 50
+    batch_upload_max_files: int = 50
+    batch_upload_concurrency: int = 4
+    parse_cache_max_mb: int = 512
+    blob_gc_grace_seconds: int = 3600
 
     default_extraction_confidence: float = 0.95
 
+    bulk_insert_batch_size: int = 5000
+    bulk_insert_use_copy: bool = True
+    extraction_workers: int = 0
+    parallel_extraction_min_mb: int = 64
+    delta_detail_limit: int = 10000
+    reference_max_delta_chain: int = 20
+    audit_verify_chunk_size: int = 5000
+    audit_checkpoint_key: str | None = None
+    audit_verify_workers: int = 0
+    audit_verify_parallel_min_entries: int = 50000
+    audit_hot_retention_days: int = 730
+    audit_queue_max_size: int = 10000
+    audit_queue_batch_size: int = 500
+    audit_queue_shutdown_timeout_seconds: float = 10.0
+    audit_read_access_roles: list[str] = Field(default_factory=lambda: ["examiner"])
+
     sentry_dsn: str | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
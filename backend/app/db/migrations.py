@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+# 0001_initial builds the schema with metadata.create_all, so a database
+# created from scratch already has everything later revisions add. These
+# helpers make each incremental step a no-op when its target already exists.
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def has_table(table: str) -> bool:
+    return _inspector().has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    return any(item["name"] == column for item in _inspector().get_columns(table))
+
+
+def has_index(table: str, index: str) -> bool:
+    return any(item["name"] == index for item in _inspector().get_indexes(table))
+
+
+def has_unique_constraint(table: str, name: str) -> bool:
+    constraints = _inspector().get_unique_constraints(table)
+    return any(item["name"] == name for item in constraints) or has_index(table, name)
+
+
+def has_foreign_key(table: str, columns: list[str]) -> bool:
+    # Matched on columns: tables built by create_all carry unnamed keys.
+    return any(item["constrained_columns"] == columns for item in _inspector().get_foreign_keys(table))
+
+
+def is_sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def create_table(table: str, *columns: Any, **kwargs: Any) -> None:
+    if not has_table(table):
+        op.create_table(table, *columns, **kwargs)
+
+
+def drop_table(table: str) -> None:
+    if has_table(table):
+        op.drop_table(table)
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    if not has_column(table, column.name):
+        op.add_column(table, column)
+
+
+def drop_column(table: str, column: str) -> None:
+    if has_column(table, column):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column)
+
+
+def create_index(name: str, table: str, columns: list[str], **kwargs: Any) -> None:
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
+
+
+def drop_index(name: str, table: str) -> None:
+    if has_index(table, name):
+        op.drop_index(name, table_name=table)
+
+
+def create_unique_constraint(name: str, table: str, columns: list[str]) -> None:
+    if not has_unique_constraint(table, name):
+        with op.batch_alter_table(table) as batch:
+            batch.create_unique_constraint(name, columns)
+
+
+def drop_constraint(name: str, table: str) -> None:
+    if has_unique_constraint(table, name):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(name, type_="unique")
+
+
+def create_foreign_key(name: str, table: str, referent: str, columns: list[str], remote: list[str], **kwargs: Any) -> None:
+    # Batch mode, so SQLite gets the key too by rebuilding the table.
+    if not has_foreign_key(table, columns):
+        with op.batch_alter_table(table) as batch:
+            batch.create_foreign_key(name, referent, columns, remote, **kwargs)
+
+
+def drop_foreign_key(name: str, table: str) -> None:
+    if any(item["name"] == name for item in _inspector().get_foreign_keys(table)):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(name, type_="foreignkey")
@@ -18,12 +18,17 @@ from app.api.routes.frameworks import router as frameworks_router
 from app.api.routes.reports import review_report_router, router as reports_router
 from app.api.routes.reviews import reference_router, router as reviews_router
 from app.api.routes.settings import router as settings_router
+from app.api.routes.storage import router as storage_router
 from app.api.routes.tasks import router as tasks_router
 from app.core.config import get_settings
 from app.core.logging import setup_logging
 from app.core.middleware import RequestContextMiddleware
 from app.db.base import Base
 from app.db.session import AsyncSessionLocal, engine
+from app.services.audit_service import shutdown_verification_executor
+from app.services.audit_writer import audit_writer
+from app.services.parallel_extraction import shutdown_extraction_executor
+from app.services.task_service import background_jobs
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -51,9 +56,18 @@ async def on_startup() -> None:
     if settings.app_env == "development":
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+    audit_writer.start()
     logger.info("Application startup complete")
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await background_jobs.drain()
+    await audit_writer.stop()
+    shutdown_verification_executor()
+    shutdown_extraction_executor()
+
+
 @app.middleware("http")
 async def add_rate_headers(request: Request, call_next):
     response = await call_next(request)
@@ -134,6 +148,7 @@ app.include_router(audit_router, prefix=settings.api_prefix)
 app.include_router(settings_router, prefix=settings.api_prefix)
 app.include_router(ai_router, prefix=settings.api_prefix)
 app.include_router(tasks_router, prefix=settings.api_prefix)
+app.include_router(storage_router, prefix=settings.api_prefix)
 app.include_router(reports_router, prefix=settings.api_prefix)
 app.include_router(review_report_router, prefix=settings.api_prefix)
 
@@ -4,7 +4,13 @@ from app.models.entities import (
     AIInvocation,
     AIUsageLog,
     Application,
+    AuditArchiveSegment,
+    AuditChainHead,
     AuditLog,
+    AuditMerkleNode,
+    AuditMerkleRoot,
+    AuditVerificationCheckpoint,
+    AuditVerificationRun,
     Base,
     Document,
     DocumentTemplate,
@@ -19,6 +25,7 @@ from app.models.entities import (
     Review,
     ReviewComment,
     ReviewReferenceDataset,
+    StoredBlob,
     User,
 )
 
@@ -32,6 +39,7 @@ __all__ = [
     "DocumentTemplate",
     "Review",
     "ReviewComment",
+    "StoredBlob",
     "Document",
     "Extraction",
     "ExtractedRecord",
@@ -40,6 +48,12 @@ __all__ = [
     "ReviewReferenceDataset",
     "Finding",
     "AuditLog",
+    "AuditChainHead",
+    "AuditVerificationRun",
+    "AuditVerificationCheckpoint",
+    "AuditMerkleNode",
+    "AuditMerkleRoot",
+    "AuditArchiveSegment",
     "AIInvocation",
     "AIUsageLog",
 ]
@@ -11,7 +11,9 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -134,6 +136,7 @@ class DocumentTemplate(Base, TimestampMixin, SoftDeleteMixin):
     mapping: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     validation: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list)
     confidence_threshold: Mapped[Decimal] = mapped_column(Numeric(5, 4), default=Decimal("0.9500"))
+    is_shared: Mapped[bool] = mapped_column(Boolean, default=False)
     version: Mapped[int] = mapped_column(Integer, default=1)
     created_by: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
@@ -178,6 +181,17 @@ class ReviewComment(Base, TimestampMixin, SoftDeleteMixin):
     body: Mapped[str] = mapped_column(Text)
 
 
+class StoredBlob(Base):
+    __tablename__ = "stored_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer)
+    storage_path: Mapped[str] = mapped_column(String(500))
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+    released_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -212,6 +226,7 @@ class Extraction(Base):
     extraction_metadata: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     warnings: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list)
     checksum: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    period_delta: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     confirmed_by: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     confirmed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -240,11 +255,15 @@ class ExtractedRecord(Base):
     data: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     validation_status: Mapped[str] = mapped_column(String(20), default="valid")
     validation_messages: Mapped[list[str]] = mapped_column(JSON, default=list)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class ReferenceDataset(Base):
     __tablename__ = "reference_datasets"
+    __table_args__ = (
+        UniqueConstraint("lineage_id", "version_number", name="uq_reference_datasets_lineage_version"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255), index=True)
@@ -256,6 +275,11 @@ class ReferenceDataset(Base):
     file_hash: Mapped[str] = mapped_column(String(64))
     record_count: Mapped[int] = mapped_column(Integer)
     template_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("document_templates.id", ondelete="SET NULL"), nullable=True)
+    lineage_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True, index=True)
+    previous_version_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("reference_datasets.id", ondelete="RESTRICT"), nullable=True)
+    version_number: Mapped[int] = mapped_column(Integer, default=1)
+    storage_mode: Mapped[str] = mapped_column(String(10), default="full")
+    delta_summary: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     uploaded_by: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -274,6 +298,9 @@ class ReferenceRecord(Base):
     department: Mapped[str | None] = mapped_column(String(255), nullable=True)
     termination_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     extended_attributes: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    record_key: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    change_type: Mapped[str] = mapped_column(String(20), default="full")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -321,15 +348,22 @@ class Finding(Base, TimestampMixin):
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_timeline", "timestamp", "id"),
+        Index("ix_audit_log_actor_timeline", "actor_id", "timestamp", "id"),
+        Index("ix_audit_log_request_timeline", "request_id", "timestamp", "id"),
+        Index("ix_audit_log_action_timeline", "action", "timestamp", "id"),
+        Index("ix_audit_log_entity_timeline", "entity_type", "entity_id", "timestamp", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
-    actor_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    actor_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     actor_type: Mapped[str] = mapped_column(String(20), default="USER")
     session_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    request_id: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
-    action: Mapped[str] = mapped_column(String(50), index=True)
-    entity_type: Mapped[str] = mapped_column(String(50), index=True)
+    request_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    action: Mapped[str] = mapped_column(String(50))
+    entity_type: Mapped[str] = mapped_column(String(50))
     entity_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True, index=True)
     before_state: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     after_state: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
@@ -344,6 +378,92 @@ class AuditLog(Base):
     ai_duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
 
+class AuditChainHead(Base):
+    __tablename__ = "audit_chain_head"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    last_entry_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    entry_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    merkle_size: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    merkle_peaks: Mapped[list[Any]] = mapped_column(JSON, default=list)
+    merkle_period: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AuditMerkleNode(Base):
+    __tablename__ = "audit_merkle_nodes"
+
+    level: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    node_index: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    entry_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    hash: Mapped[str] = mapped_column(String(64))
+
+
+class AuditMerkleRoot(Base):
+    __tablename__ = "audit_merkle_roots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    period: Mapped[str] = mapped_column(String(20), index=True)
+    tree_size: Mapped[int] = mapped_column(Integer)
+    root_hash: Mapped[str] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class AuditArchiveSegment(Base):
+    __tablename__ = "audit_archive_segments"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    period: Mapped[str] = mapped_column(String(20), index=True)
+    first_entry_id: Mapped[int] = mapped_column(Integer, unique=True)
+    last_entry_id: Mapped[int] = mapped_column(Integer, unique=True)
+    entry_count: Mapped[int] = mapped_column(Integer)
+    first_previous_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_hash: Mapped[str] = mapped_column(String(64))
+    first_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    storage_key: Mapped[str] = mapped_column(String(255))
+    file_sha256: Mapped[str] = mapped_column(String(64))
+    size_bytes: Mapped[int] = mapped_column(Integer)
+    # Bloom filter over the actor, entity and request ids in the segment;
+    # only loaded when a filtered query asks for it.
+    key_filter: Mapped[bytes | None] = mapped_column(LargeBinary, deferred=True, deferred_raiseload=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class AuditVerificationRun(Base):
+    __tablename__ = "audit_verification_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    status: Mapped[str] = mapped_column(String(20), default="pending", index=True)
+    requested_by: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    full: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    start_after_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    total_entries: Mapped[int] = mapped_column(Integer, default=0)
+    checked_entries: Mapped[int] = mapped_column(Integer, default=0)
+    valid: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    first_invalid_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class AuditVerificationCheckpoint(Base):
+    __tablename__ = "audit_verification_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    last_entry_id: Mapped[int] = mapped_column(Integer, index=True)
+    last_hash: Mapped[str] = mapped_column(String(64))
+    entry_count: Mapped[int] = mapped_column(Integer)
+    verified_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    run_id: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid, ForeignKey("audit_verification_runs.id", ondelete="SET NULL"), nullable=True
+    )
+    signature: Mapped[str] = mapped_column(String(64))
+
+
 class AIInvocation(Base):
     __tablename__ = "ai_invocations"
 
@@ -75,6 +75,7 @@ class DocumentTemplateCreate(BaseModel):
     mapping: dict[str, Any] = Field(default_factory=dict)
     validation: list[dict[str, Any]] = Field(default_factory=list)
     confidence_threshold: float = 0.95
+    is_shared: bool = False
 
 
 class DocumentTemplateOut(BaseModel):
@@ -89,6 +90,7 @@ class DocumentTemplateOut(BaseModel):
     mapping: dict[str, Any]
     validation: list[dict[str, Any]]
     confidence_threshold: float
+    is_shared: bool
     version: int
     created_at: datetime
     updated_at: datetime
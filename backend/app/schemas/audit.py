@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.common import PaginatedResponse
+
 
 class AuditEntryOut(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -22,8 +24,75 @@ class AuditEntryOut(BaseModel):
     metadata: dict = Field(validation_alias="audit_metadata")
 
 
+class AuditEntryPage(PaginatedResponse):
+    items: list[AuditEntryOut]
+
+
 class AuditVerificationResponse(BaseModel):
     valid: bool
     checked_entries: int
     first_invalid_id: int | None = None
     message: str
+    start_after_id: int | None = None
+    last_entry_id: int | None = None
+
+
+class AuditVerificationRunOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: str
+    requested_by: UUID | None
+    full: bool
+    start_after_id: int | None
+    total_entries: int
+    checked_entries: int
+    valid: bool | None
+    first_invalid_id: int | None
+    message: str | None
+    error_message: str | None
+    created_at: datetime
+    started_at: datetime | None
+    completed_at: datetime | None
+
+
+class MerkleRootOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    period: str | None = None
+    tree_size: int
+    root_hash: str | None
+    created_at: datetime | None = None
+
+
+class InclusionProofOut(BaseModel):
+    entry_id: int
+    leaf_index: int
+    tree_size: int
+    leaf_hash: str
+    root_hash: str
+    proof: list[str]
+
+
+class ConsistencyProofOut(BaseModel):
+    first_size: int
+    second_size: int
+    first_root: str
+    second_root: str
+    proof: list[str]
+
+
+class AuditArchiveSegmentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    period: str
+    first_entry_id: int
+    last_entry_id: int
+    entry_count: int
+    first_previous_hash: str | None
+    last_hash: str
+    first_timestamp: datetime
+    last_timestamp: datetime
+    file_sha256: str
+    size_bytes: int
+    created_at: datetime
@@ -15,6 +15,7 @@ class ReviewCreate(BaseModel):
     period_end: date | None = None
     due_date: date | None = None
     assigned_to: UUID | None = None
+    previous_review_id: UUID | None = None
 
 
 class ReviewUpdate(BaseModel):
@@ -22,6 +23,7 @@ class ReviewUpdate(BaseModel):
     due_date: date | None = None
     assigned_to: UUID | None = None
     reviewer_notes: str | None = None
+    previous_review_id: UUID | None = None
 
 
 class ReviewStatusUpdate(BaseModel):
@@ -40,6 +42,7 @@ class ReviewOut(BaseModel):
     period_end: date | None
     due_date: date | None
     status: str
+    previous_review_id: UUID | None
     analysis_checksum: str | None
     created_by: UUID | None
     assigned_to: UUID | None
@@ -87,6 +90,22 @@ class ExtractionOut(BaseModel):
     created_at: datetime
 
 
+class PreviewColumn(BaseModel):
+    name: str
+    type: str
+
+
+class ExtractionPreviewOut(BaseModel):
+    document_id: UUID
+    template_id: UUID | None
+    row_count: int
+    columns: list[PreviewColumn]
+    rows: list[dict[str, Any]]
+    records: list[dict[str, Any]]
+    warnings: list[dict[str, Any]]
+    confidence: float | None
+
+
 class AnalyzeResponse(BaseModel):
     review_id: UUID
     findings_created: int
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+from app.services.audit_retention import archive_audit_log, hot_cutoff
+
+
+async def main(before: datetime | None) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        segments = await archive_audit_log(session, before=before)
+    for segment in segments:
+        print(f"Archived {segment.period}: entries {segment.first_entry_id}-{segment.last_entry_id} -> {segment.storage_key}")
+    print(f"{len(segments)} period(s) archived.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move closed audit periods out of the hot table into archive segments.")
+    parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        help=f"Archive whole months ending on or before this date. Defaults to the hot-retention cutoff ({hot_cutoff().date()}).",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.before))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.services.audit_service import record_audit_event, verify_audit_hash_chain
+
+
+async def run(database_url: str, writers: int, events: int, events_per_commit: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def writer(index: int) -> None:
+        for start in range(0, events, events_per_commit):
+            async with session_maker() as session:
+                for step in range(start, min(start + events_per_commit, events)):
+                    await record_audit_event(
+                        session,
+                        actor_id=None,
+                        actor_type="SYSTEM",
+                        action="benchmark",
+                        entity_type="audit_benchmark",
+                        entity_id=uuid.uuid4(),
+                        before_state=None,
+                        after_state={"writer": index, "step": step},
+                        request_id=f"bench-{index}-{step}",
+                    )
+                await session.commit()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(index) for index in range(writers)))
+    elapsed = time.perf_counter() - started
+
+    total = writers * events
+    print(f"Appended {total} events with {writers} writers in {elapsed:.2f}s ({total / elapsed:.0f} events/s)")
+
+    async with session_maker() as session:
+        result = await verify_audit_hash_chain(session)
+    print(f"Chain verification: {result.message} ({result.checked_entries} entries)")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure audit append throughput under concurrent writers.")
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file.")
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--events", type=int, default=200, help="Events per writer.")
+    parser.add_argument("--events-per-commit", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'audit-benchmark.db'}"
+        asyncio.run(run(database_url, args.writers, args.events, args.events_per_commit))
+
+
+if __name__ == "__main__":
+    main()
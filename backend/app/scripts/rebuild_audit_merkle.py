@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import delete, select
+
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+from app.models import AuditLog, AuditMerkleNode, AuditMerkleRoot
+from app.services.audit_archive import archive_segments, stream_segment
+from app.services.audit_merkle import append_leaves
+from app.services.audit_service import acquire_chain_head
+
+BATCH_SIZE = 5000
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        # Holding the chain head blocks concurrent appends while the index is
+        # rebuilt from the full log in chain order.
+        pending = await acquire_chain_head(session)
+        await session.execute(delete(AuditMerkleNode))
+        await session.execute(delete(AuditMerkleRoot))
+
+        size, peaks = 0, []
+        for segment in await archive_segments(session):
+            async for records in stream_segment(segment):
+                for offset in range(0, len(records), BATCH_SIZE):
+                    leaves = [(record["id"], record["content_hash"]) for record in records[offset : offset + BATCH_SIZE]]
+                    size, peaks, nodes = append_leaves(size, peaks, leaves)
+                    await session.execute(AuditMerkleNode.__table__.insert(), nodes)
+
+        result = await session.stream(
+            select(AuditLog.id, AuditLog.content_hash).order_by(AuditLog.id.asc()).execution_options(yield_per=BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            size, peaks, nodes = append_leaves(size, peaks, [tuple(row) for row in rows])
+            await session.execute(AuditMerkleNode.__table__.insert(), nodes)
+
+        pending.head.merkle_size = size
+        pending.head.merkle_peaks = peaks
+        pending.head.merkle_period = None
+        pending.dirty = True
+        await session.commit()
+        print(f"Merkle index rebuilt over {size} audit entries.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,13 +11,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import (
     Extraction,
-    ExtractedRecord,
     Finding,
     Framework,
+    ReferenceDataset,
     ReferenceRecord,
     Review,
     ReviewReferenceDataset,
 )
+from app.services.extraction_snapshot import load_record_payloads
+from app.services.reference_versions import load_reference_records
 
 
 def _resolve_field(record: dict[str, Any], field_path: str) -> Any:
@@ -133,32 +135,10 @@ def _render_explainability(template: str | None, check_name: str, record_count:
 
 
 async def run_review_analysis(db: AsyncSession, review: Review, framework: Framework) -> tuple[int, str]:
-    rows_result = await db.execute(
-        select(ExtractedRecord)
-        .join(Extraction, ExtractedRecord.extraction_id == Extraction.id)
-        .where(Extraction.review_id == review.id, Extraction.is_active.is_(True))
-        .order_by(ExtractedRecord.record_index.asc())
+    extractions_result = await db.execute(
+        select(Extraction).where(Extraction.review_id == review.id, Extraction.is_active.is_(True))
     )
-    records = list(rows_result.scalars().all())
-
-    record_payloads: list[dict[str, Any]] = []
-    for rec in records:
-        record_payloads.append(
-            {
-                "id": str(rec.id),
-                "identifier": rec.identifier,
-                "display_name": rec.display_name,
-                "email": rec.email,
-                "status": rec.status,
-                "last_activity": rec.last_activity,
-                "department": rec.department,
-                "manager": rec.manager,
-                "account_type": rec.account_type,
-                "roles": rec.roles or [],
-                "extended_attributes": rec.extended_attributes or {},
-                "data": rec.data or {},
-            }
-        )
+    record_payloads = await load_record_payloads(db, list(extractions_result.scalars().all()))
 
     ref_dataset_ids_result = await db.execute(
         select(ReviewReferenceDataset.reference_dataset_id).where(ReviewReferenceDataset.review_id == review.id)
@@ -167,8 +147,9 @@ async def run_review_analysis(db: AsyncSession, review: Review, framework: Frame
 
     reference_records: list[ReferenceRecord] = []
     if ref_dataset_ids:
-        rr = await db.execute(select(ReferenceRecord).where(ReferenceRecord.dataset_id.in_(ref_dataset_ids)))
-        reference_records = list(rr.scalars().all())
+        datasets = await db.execute(select(ReferenceDataset).where(ReferenceDataset.id.in_(ref_dataset_ids)))
+        for dataset in datasets.scalars().all():
+            reference_records.extend(await load_reference_records(db, dataset))
 
     await db.execute(delete(Finding).where(Finding.review_id == review.id))
 
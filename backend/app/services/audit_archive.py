@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app.core.config import get_settings
+from app.models import AuditArchiveSegment, AuditLog
+from app.services.storage import StorageObjectNotFound, get_storage_backend
+
+# Segment files are gzip NDJSON holding every audit_log column, so archived
+# entries can be rebuilt as AuditLog objects and re-hashed exactly as if they
+# were still in the live table.
+ARCHIVE_FIELDS = (
+    "id",
+    "timestamp",
+    "actor_id",
+    "actor_type",
+    "session_id",
+    "request_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "before_state",
+    "after_state",
+    "audit_metadata",
+    "content_hash",
+    "previous_hash",
+    "ai_model",
+    "ai_input_hash",
+    "ai_output_hash",
+    "ai_confidence",
+    "ai_duration_ms",
+)
+ARCHIVE_COLUMNS = tuple(getattr(AuditLog, name) for name in ARCHIVE_FIELDS)
+# Same order as audit_service.VERIFY_COLUMNS.
+VERIFY_FIELDS = (
+    "id",
+    "actor_id",
+    "actor_type",
+    "action",
+    "entity_type",
+    "entity_id",
+    "before_state",
+    "after_state",
+    "audit_metadata",
+    "request_id",
+    "previous_hash",
+    "content_hash",
+)
+SEGMENT_PREFIX = "audit-archive"
+KEY_FILTER_BITS_PER_KEY = 10
+KEY_FILTER_HASHES = 7
+
+
+class ArchiveIntegrityError(Exception):
+    pass
+
+
+def archive_staging_dir() -> Path:
+    return Path(get_settings().file_storage_path) / SEGMENT_PREFIX / ".staging"
+
+
+def segment_storage_key(period: str, first_entry_id: int, last_entry_id: int) -> str:
+    return f"{SEGMENT_PREFIX}/audit-{period}-{first_entry_id:012d}-{last_entry_id:012d}.ndjson.gz"
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def encode_record(row: Sequence[Any]) -> bytes:
+    return orjson.dumps(dict(zip(ARCHIVE_FIELDS, row)), default=str) + b"\n"
+
+
+def decode_record(line: bytes) -> dict[str, Any]:
+    record = orjson.loads(line)
+    record["timestamp"] = as_utc(datetime.fromisoformat(record["timestamp"]))
+    for name in ("actor_id", "entity_id"):
+        if record[name] is not None:
+            record[name] = UUID(record[name])
+    if record["ai_confidence"] is not None:
+        record["ai_confidence"] = Decimal(record["ai_confidence"])
+    return record
+
+
+def verify_row(record: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(record[name] for name in VERIFY_FIELDS)
+
+
+def archived_entry(record: dict[str, Any]) -> AuditLog:
+    return AuditLog(**record)
+
+
+def record_filter_keys(record: dict[str, Any]) -> list[str]:
+    keys = [f"request:{record['request_id']}"] if record["request_id"] else []
+    for name in ("actor_id", "entity_id"):
+        if record[name] is not None:
+            keys.append(f"{name[:-3]}:{record[name]}")
+    return keys
+
+
+def new_key_filter(expected_keys: int) -> bytearray:
+    return bytearray(max(8, -(-expected_keys * KEY_FILTER_BITS_PER_KEY // 8)))
+
+
+def _key_filter_bits(key_filter: bytes, key: str) -> Iterator[int]:
+    digest = hashlib.sha256(key.encode()).digest()
+    first, step = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:16], "big") | 1
+    size = len(key_filter) * 8
+    for index in range(KEY_FILTER_HASHES):
+        yield (first + index * step) % size
+
+
+def add_filter_key(key_filter: bytearray, key: str) -> None:
+    for bit in _key_filter_bits(key_filter, key):
+        key_filter[bit >> 3] |= 1 << (bit & 7)
+
+
+def may_contain_keys(key_filter: bytes, keys: Sequence[str]) -> bool:
+    return all(key_filter[bit >> 3] & (1 << (bit & 7)) for key in keys for bit in _key_filter_bits(key_filter, key))
+
+
+def _decode_lines(storage_key: str, lines: list[bytes]) -> list[dict[str, Any]]:
+    try:
+        return [decode_record(line) for line in lines if line]
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+        raise ArchiveIntegrityError(f"Archived audit segment {storage_key} failed its checksum") from exc
+
+
+def iter_segment(storage_key: str, file_sha256: str) -> Iterator[list[dict[str, Any]]]:
+    # Segments are decompressed a storage chunk at a time. The checksum covers
+    # the whole file, so it can only be compared once the stream is drained:
+    # callers must treat a segment as unverified until iteration completes.
+    try:
+        stream = get_storage_backend().open_stream(storage_key)
+    except StorageObjectNotFound as exc:
+        raise ArchiveIntegrityError(f"Archived audit segment {storage_key} is missing") from exc
+    digest = hashlib.sha256()
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    tail = b""
+    try:
+        for chunk in stream:
+            digest.update(chunk)
+            try:
+                lines = (tail + decompressor.decompress(chunk)).split(b"\n")
+            except zlib.error as exc:
+                raise ArchiveIntegrityError(f"Archived audit segment {storage_key} failed its checksum") from exc
+            tail = lines.pop()
+            if lines:
+                yield _decode_lines(storage_key, lines)
+        tail += decompressor.flush()
+    finally:
+        stream.close()
+    if digest.hexdigest() != file_sha256 or not decompressor.eof:
+        raise ArchiveIntegrityError(f"Archived audit segment {storage_key} failed its checksum")
+    if tail:
+        yield _decode_lines(storage_key, [tail])
+
+
+async def stream_segment(segment: AuditArchiveSegment) -> AsyncIterator[list[dict[str, Any]]]:
+    batches = iter_segment(segment.storage_key, segment.file_sha256)
+    try:
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            yield batch
+    finally:
+        await asyncio.to_thread(batches.close)
+
+
+async def archive_segments(
+    db: AsyncSession,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    newest_first: bool = False,
+    keys: Sequence[str] = (),
+) -> list[AuditArchiveSegment]:
+    # With filter keys, segments whose key filter rules out any of them are
+    # dropped before a file is touched. Segments without a filter always stay.
+    query = select(AuditArchiveSegment)
+    if keys:
+        query = query.options(undefer(AuditArchiveSegment.key_filter))
+    if start:
+        query = query.where(AuditArchiveSegment.last_timestamp >= start)
+    if end:
+        query = query.where(AuditArchiveSegment.first_timestamp < end)
+    order = AuditArchiveSegment.first_entry_id
+    query = query.order_by(order.desc() if newest_first else order.asc())
+    segments = list((await db.execute(query)).scalars().all())
+    if not keys:
+        return segments
+    return [
+        segment
+        for segment in segments
+        if segment.key_filter is None or may_contain_keys(segment.key_filter, keys)
+    ]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models import AuditLog
+from app.services.audit_archive import archive_segments, archived_entry, stream_segment
+from app.services.audit_query import AuditFilters
+
+EXPORT_FORMATS = {"csv": "text/csv", "json": "application/json", "ndjson": "application/x-ndjson"}
+EXPORT_BATCH_SIZE = 2000
+CSV_HEADER = ["id", "timestamp", "actor_id", "action", "entity_type", "entity_id", "content_hash", "previous_hash"]
+EXPORT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.timestamp,
+    AuditLog.actor_id,
+    AuditLog.action,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.content_hash,
+    AuditLog.previous_hash,
+    AuditLog.audit_metadata,
+)
+
+
+def _export_record(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "timestamp": row.timestamp.isoformat(),
+        "actor_id": str(row.actor_id) if row.actor_id else None,
+        "action": row.action,
+        "entity_type": row.entity_type,
+        "entity_id": str(row.entity_id) if row.entity_id else None,
+        "content_hash": row.content_hash,
+        "previous_hash": row.previous_hash,
+        "metadata": row.audit_metadata,
+    }
+
+
+class ExportEncoder:
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self.started = False
+
+    def _csv(self, rows: Sequence[Any]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self.started:
+            writer.writerow(CSV_HEADER)
+        for row in rows:
+            writer.writerow(
+                [
+                    row.id,
+                    row.timestamp.isoformat(),
+                    str(row.actor_id) if row.actor_id else "",
+                    row.action,
+                    row.entity_type,
+                    str(row.entity_id) if row.entity_id else "",
+                    row.content_hash,
+                    row.previous_hash or "",
+                ]
+            )
+        return buffer.getvalue().encode("utf-8")
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        if self.fmt == "csv":
+            chunk = self._csv(rows)
+        elif self.fmt == "ndjson":
+            chunk = b"".join(orjson.dumps(_export_record(row)) + b"\n" for row in rows)
+        else:
+            body = b",".join(orjson.dumps(_export_record(row)) for row in rows)
+            chunk = (b"," if self.started and body else b"" if self.started else b"[") + body
+        self.started = self.started or bool(rows) or self.fmt == "json"
+        return chunk
+
+    def finish(self) -> bytes:
+        if self.fmt == "csv":
+            return b"" if self.started else self._csv([])
+        if self.fmt == "json":
+            return b"]" if self.started else b"[]"
+        return b""
+
+
+async def _archived_batches(db: AsyncSession, filters: AuditFilters) -> AsyncIterator[list[AuditLog]]:
+    segments = await archive_segments(db, start=filters.start, end=filters.end, keys=filters.archive_keys())
+    for segment in segments:
+        async for records in stream_segment(segment):
+            matching = [archived_entry(record) for record in records if filters.matches(record)]
+            for offset in range(0, len(matching), EXPORT_BATCH_SIZE):
+                yield matching[offset : offset + EXPORT_BATCH_SIZE]
+
+
+async def iter_audit_export(
+    fmt: str,
+    filters: AuditFilters,
+    *,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    # The response outlives the request-scoped session, so the generator owns
+    # its own session and streams rows through a server-side cursor. Archived
+    # segments hold the oldest ids and are emitted first to keep id order.
+    encoder = ExportEncoder(fmt)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def pack(rows: Sequence[Any]) -> bytes:
+        chunk = encoder.encode(rows)
+        return compressor.compress(chunk) if compressor is not None else chunk
+
+    async with AsyncSessionLocal() as db:
+        async for rows in _archived_batches(db, filters):
+            chunk = pack(rows)
+            if chunk:
+                yield chunk
+
+        result = await db.stream(
+            select(*EXPORT_COLUMNS)
+            .where(*filters.conditions())
+            .order_by(AuditLog.id.asc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        try:
+            async for rows in result.partitions():
+                chunk = pack(rows)
+                if chunk:
+                    yield chunk
+        finally:
+            await result.close()
+
+    tail = encoder.finish()
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AuditChainHead, AuditMerkleNode
+
+# Hashing follows RFC 6962: leaves and interior nodes are domain-separated so
+# a leaf can never be passed off as a node. Leaves are audit entries in chain
+# order and the leaf data is the entry's content hash.
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+NodeGetter = Callable[[int, int], bytes]
+
+
+class MerkleProofError(Exception):
+    pass
+
+
+def leaf_hash(content_hash: str) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(content_hash)).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _split(size: int) -> int:
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def append_leaves(
+    size: int,
+    peaks: list[list[Any]],
+    leaves: Sequence[tuple[int, str]],
+) -> tuple[int, list[list[Any]], list[dict[str, Any]]]:
+    # Peaks are the complete subtrees covering the tree, highest level first,
+    # as [level, hex hash]. Every completed node is returned for storage, so
+    # each leaf costs at most two node rows amortised.
+    peaks = [list(peak) for peak in peaks]
+    nodes: list[dict[str, Any]] = []
+    for entry_id, content_hash in leaves:
+        level, index, digest = 0, size, leaf_hash(content_hash)
+        nodes.append({"level": 0, "node_index": index, "entry_id": entry_id, "hash": digest.hex()})
+        while index & 1:
+            _, left = peaks.pop()
+            digest = node_hash(bytes.fromhex(left), digest)
+            level, index = level + 1, index >> 1
+            nodes.append({"level": level, "node_index": index, "entry_id": None, "hash": digest.hex()})
+        peaks.append([level, digest.hex()])
+        size += 1
+    return size, peaks, nodes
+
+
+def root_from_peaks(peaks: list[list[Any]]) -> str | None:
+    if not peaks:
+        return None
+    root = bytes.fromhex(peaks[-1][1])
+    for _, peak in reversed(peaks[:-1]):
+        root = node_hash(bytes.fromhex(peak), root)
+    return root.hex()
+
+
+def _subtree(start: int, end: int, get: NodeGetter) -> bytes:
+    size = end - start
+    if size & (size - 1) == 0 and start % size == 0:
+        level = size.bit_length() - 1
+        return get(level, start >> level)
+    k = _split(size)
+    return node_hash(_subtree(start, start + k, get), _subtree(start + k, end, get))
+
+
+def _path(index: int, start: int, end: int, get: NodeGetter) -> list[bytes]:
+    if end - start == 1:
+        return []
+    k = _split(end - start)
+    if index < start + k:
+        return [*_path(index, start, start + k, get), _subtree(start + k, end, get)]
+    return [*_path(index, start + k, end, get), _subtree(start, start + k, get)]
+
+
+def _subproof(first: int, start: int, end: int, complete: bool, get: NodeGetter) -> list[bytes]:
+    size = end - start
+    if first == size:
+        return [] if complete else [_subtree(start, end, get)]
+    k = _split(size)
+    if first <= k:
+        return [*_subproof(first, start, start + k, complete, get), _subtree(start + k, end, get)]
+    return [*_subproof(first - k, start + k, end, False, get), _subtree(start, start + k, get)]
+
+
+def verify_inclusion(leaf: bytes, index: int, size: int, proof: Sequence[bytes], root: bytes) -> bool:
+    if index >= size:
+        return False
+    fn, sn, result = index, size - 1, leaf
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            result = node_hash(sibling, result)
+            while not fn & 1 and fn != 0:
+                fn, sn = fn >> 1, sn >> 1
+        else:
+            result = node_hash(result, sibling)
+        fn, sn = fn >> 1, sn >> 1
+    return sn == 0 and result == root
+
+
+def verify_consistency(first: int, second: int, proof: Sequence[bytes], first_root: bytes, second_root: bytes) -> bool:
+    if first == second:
+        return not proof and first_root == second_root
+    if first == 0 or first > second or not proof:
+        return False
+    path = list(proof)
+    if first & (first - 1) == 0:
+        path.insert(0, first_root)
+    fn, sn = first - 1, second - 1
+    while fn & 1:
+        fn, sn = fn >> 1, sn >> 1
+    fr = fc = path[0]
+    for node in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(node, fr)
+            fc = node_hash(node, fc)
+            while not fn & 1 and fn != 0:
+                fn, sn = fn >> 1, sn >> 1
+        else:
+            fc = node_hash(fc, node)
+        fn, sn = fn >> 1, sn >> 1
+    return sn == 0 and fr == first_root and fc == second_root
+
+
+async def _resolve(db: AsyncSession, build: Callable[[NodeGetter], Any]) -> Any:
+    # Proofs touch O(log n) stored nodes; a dry run collects their keys so
+    # they can be fetched in a single query before the real computation.
+    wanted: set[tuple[int, int]] = set()
+
+    def collect(level: int, index: int) -> bytes:
+        wanted.add((level, index))
+        return b"\x00" * 32
+
+    build(collect)
+    nodes: dict[tuple[int, int], bytes] = {}
+    if wanted:
+        result = await db.execute(
+            select(AuditMerkleNode.level, AuditMerkleNode.node_index, AuditMerkleNode.hash).where(
+                tuple_(AuditMerkleNode.level, AuditMerkleNode.node_index).in_(list(wanted))
+            )
+        )
+        nodes = {(level, index): bytes.fromhex(digest) for level, index, digest in result.all()}
+    missing = wanted - nodes.keys()
+    if missing:
+        raise MerkleProofError(f"Merkle nodes missing from the index: {sorted(missing)[:5]}")
+    return build(lambda level, index: nodes[(level, index)])
+
+
+async def current_tree_size(db: AsyncSession) -> int:
+    return int(await db.scalar(select(AuditChainHead.merkle_size)) or 0)
+
+
+async def tree_root(db: AsyncSession, size: int) -> bytes:
+    return await _resolve(db, lambda get: _subtree(0, size, get))
+
+
+async def inclusion_proof(db: AsyncSession, entry_id: int, size: int) -> dict[str, Any]:
+    leaf = (
+        await db.execute(
+            select(AuditMerkleNode.node_index, AuditMerkleNode.hash).where(
+                AuditMerkleNode.level == 0, AuditMerkleNode.entry_id == entry_id
+            )
+        )
+    ).first()
+    if leaf is None:
+        raise MerkleProofError("Entry is not in the Merkle index")
+    index, digest = leaf
+    if index >= size:
+        raise MerkleProofError("Entry was appended after the requested tree size")
+
+    path, root = await _resolve(db, lambda get: (_path(index, 0, size, get), _subtree(0, size, get)))
+    return {
+        "entry_id": entry_id,
+        "leaf_index": index,
+        "tree_size": size,
+        "leaf_hash": digest,
+        "root_hash": root.hex(),
+        "proof": [node.hex() for node in path],
+    }
+
+
+async def consistency_proof(db: AsyncSession, first: int, second: int) -> dict[str, Any]:
+    if not 0 < first <= second:
+        raise MerkleProofError("Tree sizes must satisfy 0 < first <= second")
+
+    path, first_root, second_root = await _resolve(
+        db,
+        lambda get: (
+            _subproof(first, 0, second, True, get) if first < second else [],
+            _subtree(0, first, get),
+            _subtree(0, second, get),
+        ),
+    )
+    return {
+        "first_size": first,
+        "second_size": second,
+        "first_root": first_root.hex(),
+        "second_root": second_root.hex(),
+        "proof": [node.hex() for node in path],
+    }
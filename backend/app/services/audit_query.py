@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AuditLog
+from app.services.audit_archive import archive_segments, archived_entry, as_utc, record_filter_keys, stream_segment
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class AuditFilters:
+    actor_id: UUID | None = None
+    request_id: str | None = None
+    entity_type: str | None = None
+    entity_id: UUID | None = None
+    action: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+
+    def conditions(self) -> list[ColumnElement[bool]]:
+        # Each equality filter leads one of the (..., timestamp, id) indexes on
+        # audit_log, so any single filter plus a time range stays an index scan.
+        conditions: list[ColumnElement[bool]] = []
+        if self.actor_id:
+            conditions.append(AuditLog.actor_id == self.actor_id)
+        if self.request_id:
+            conditions.append(AuditLog.request_id == self.request_id)
+        if self.entity_type:
+            conditions.append(AuditLog.entity_type == self.entity_type)
+        if self.entity_id:
+            conditions.append(AuditLog.entity_id == self.entity_id)
+        if self.action:
+            conditions.append(AuditLog.action == self.action)
+        if self.start:
+            conditions.append(AuditLog.timestamp >= self.start)
+        if self.end:
+            conditions.append(AuditLog.timestamp < self.end)
+        return conditions
+
+    def archive_keys(self) -> list[str]:
+        # Keys looked up in each archive segment's key filter.
+        return record_filter_keys(
+            {"actor_id": self.actor_id, "entity_id": self.entity_id, "request_id": self.request_id}
+        )
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        # The same filters applied to an archived record.
+        return (
+            (not self.actor_id or record["actor_id"] == self.actor_id)
+            and (not self.request_id or record["request_id"] == self.request_id)
+            and (not self.entity_type or record["entity_type"] == self.entity_type)
+            and (not self.entity_id or record["entity_id"] == self.entity_id)
+            and (not self.action or record["action"] == self.action)
+            and (not self.start or record["timestamp"] >= as_utc(self.start))
+            and (not self.end or record["timestamp"] < as_utc(self.end))
+        )
+
+
+def audit_filters(
+    actor_id: UUID | None = None,
+    request_id: str | None = None,
+    entity_type: str | None = None,
+    entity_id: UUID | None = None,
+    action: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> AuditFilters:
+    return AuditFilters(actor_id, request_id, entity_type, entity_id, action, start, end)
+
+
+def encode_cursor(timestamp: datetime, entry_id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, entry_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+async def _archived_entries(
+    db: AsyncSession,
+    filters: AuditFilters,
+    before: tuple[datetime, int] | None,
+    wanted: int,
+) -> list[AuditLog]:
+    # Archived periods are older than anything still live, so they are only
+    # read once the live table is exhausted, newest segment first.
+    segments = await archive_segments(
+        db, start=filters.start, end=filters.end, newest_first=True, keys=filters.archive_keys()
+    )
+    if before is not None:
+        before = (as_utc(before[0]), before[1])
+        segments = [segment for segment in segments if as_utc(segment.first_timestamp) <= before[0]]
+
+    # Segments are streamed rather than loaded, keeping only the newest
+    # `wanted` matches seen so far in a min-heap on (timestamp, id).
+    newest: list[tuple[datetime, int, dict[str, Any]]] = []
+    for segment in segments:
+        async for records in stream_segment(segment):
+            for record in records:
+                key = (record["timestamp"], record["id"])
+                if not filters.matches(record) or (before is not None and key >= before):
+                    continue
+                if len(newest) < wanted:
+                    heapq.heappush(newest, (*key, record))
+                elif key > newest[0][:2]:
+                    heapq.heapreplace(newest, (*key, record))
+        if len(newest) >= wanted:
+            break
+    return [archived_entry(record) for *_, record in sorted(newest, reverse=True)]
+
+
+async def page_audit_entries(
+    db: AsyncSession,
+    filters: AuditFilters,
+    *,
+    cursor: str | None = None,
+    limit: int = 200,
+) -> tuple[list[AuditLog], str | None]:
+    # Newest first on (timestamp, id); the cursor is the last row served, so
+    # a page costs one index seek regardless of how deep the caller has paged.
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    before = decode_cursor(cursor) if cursor else None
+    query = select(AuditLog).where(*filters.conditions())
+    if before is not None:
+        query = query.where(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(*before))
+    query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1)
+
+    entries = list((await db.execute(query)).scalars().all())
+    if len(entries) <= limit:
+        entries.extend(await _archived_entries(db, filters, before, limit + 1 - len(entries)))
+    if len(entries) <= limit:
+        return entries, None
+    entries = entries[:limit]
+    return entries, encode_cursor(entries[-1].timestamp, entries[-1].id)
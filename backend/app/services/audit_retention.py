@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import zlib
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import AuditArchiveSegment, AuditLog
+from app.services.audit_archive import (
+    ARCHIVE_COLUMNS,
+    ARCHIVE_FIELDS,
+    ArchiveIntegrityError,
+    add_filter_key,
+    archive_staging_dir,
+    as_utc,
+    encode_record,
+    new_key_filter,
+    record_filter_keys,
+    segment_storage_key,
+    verify_row,
+)
+from app.services.audit_service import latest_verification_checkpoint, verify_segment
+from app.services.storage import get_storage_backend
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def period_start(value: datetime) -> datetime:
+    value = as_utc(value)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_period(start: datetime) -> datetime:
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def hot_cutoff(now: datetime | None = None) -> datetime:
+    days = get_settings().audit_hot_retention_days
+    return period_start((now or datetime.now(UTC)) - timedelta(days=days))
+
+
+class _SegmentFile:
+    # Built in a local staging file, then handed to the storage backend.
+    def __init__(self) -> None:
+        root = archive_staging_dir()
+        root.mkdir(parents=True, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=root, suffix=".part")
+        self.handle = os.fdopen(fd, "wb")
+        self.compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        chunk = self.compressor.compress(data)
+        self.handle.write(chunk)
+        self.digest.update(chunk)
+        self.size += len(chunk)
+
+    def finish(self) -> None:
+        tail = self.compressor.flush()
+        self.handle.write(tail)
+        self.digest.update(tail)
+        self.size += len(tail)
+        self.handle.close()
+
+    def discard(self) -> None:
+        self.handle.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def _archive_range(
+    db: AsyncSession,
+    period: str,
+    first_id: int,
+    last_id: int,
+    previous: AuditArchiveSegment | None,
+) -> AuditArchiveSegment:
+    # Entries are re-verified while they are written: a segment only leaves
+    # the live table if it is intact and continues the previous segment.
+    expected_hash = previous.last_hash if previous is not None else None
+    count = 0
+    first_timestamp = last_timestamp = None
+    key_filter = new_key_filter(3 * (last_id - first_id + 1))
+    output = await asyncio.to_thread(_SegmentFile)
+    result = await db.stream(
+        select(*ARCHIVE_COLUMNS)
+        .where(AuditLog.id.between(first_id, last_id))
+        .order_by(AuditLog.id.asc())
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+    try:
+        async for rows in result.partitions():
+            records = [dict(zip(ARCHIVE_FIELDS, row)) for row in rows]
+            check = verify_segment([verify_row(record) for record in records])
+            if check.invalid_id is not None or check.first_previous_hash != expected_hash:
+                raise ArchiveIntegrityError(
+                    check.invalid_message or f"Previous hash mismatch at entry {check.first_id}"
+                )
+            expected_hash = check.last_hash
+            count += check.count
+            timestamps = [record["timestamp"] for record in records]
+            first_timestamp = min(timestamps if first_timestamp is None else [first_timestamp, *timestamps])
+            last_timestamp = max(timestamps if last_timestamp is None else [last_timestamp, *timestamps])
+            for record in records:
+                for key in record_filter_keys(record):
+                    add_filter_key(key_filter, key)
+            await asyncio.to_thread(output.write, b"".join(encode_record(row) for row in rows))
+        storage_key = segment_storage_key(period, first_id, last_id)
+        await asyncio.to_thread(output.finish)
+        await get_storage_backend().put_file(storage_key, Path(output.path))
+    except BaseException:
+        await asyncio.to_thread(output.discard)
+        raise
+    finally:
+        await result.close()
+
+    segment = AuditArchiveSegment(
+        period=period,
+        first_entry_id=first_id,
+        last_entry_id=last_id,
+        entry_count=count,
+        first_previous_hash=previous.last_hash if previous is not None else None,
+        last_hash=expected_hash,
+        first_timestamp=first_timestamp,
+        last_timestamp=last_timestamp,
+        storage_key=storage_key,
+        file_sha256=output.digest.hexdigest(),
+        size_bytes=output.size,
+        key_filter=bytes(key_filter),
+    )
+    db.add(segment)
+    for start in range(first_id, last_id + 1, ARCHIVE_BATCH_SIZE):
+        await db.execute(
+            delete(AuditLog).where(AuditLog.id.between(start, min(start + ARCHIVE_BATCH_SIZE - 1, last_id)))
+        )
+    return segment
+
+
+async def archive_audit_log(db: AsyncSession, *, before: datetime | None = None) -> list[AuditArchiveSegment]:
+    # Whole calendar months older than the hot window are moved out one at a
+    # time. Only entries strictly before the latest verification checkpoint
+    # are eligible, which keeps the chain head and the checkpoint anchor live.
+    cutoff = as_utc(before) if before is not None else hot_cutoff()
+    checkpoint = await latest_verification_checkpoint(db)
+    if checkpoint is None:
+        logger.info("No verified audit checkpoint; nothing is archived")
+        return []
+
+    archived: list[AuditArchiveSegment] = []
+    while True:
+        first = (
+            await db.execute(select(AuditLog.id, AuditLog.timestamp).order_by(AuditLog.id.asc()).limit(1))
+        ).first()
+        if first is None or first.id >= checkpoint.last_entry_id:
+            break
+        start = period_start(first.timestamp)
+        end = next_period(start)
+        if end > cutoff:
+            break
+        last_id = await db.scalar(
+            select(func.max(AuditLog.id)).where(AuditLog.timestamp < end, AuditLog.id < checkpoint.last_entry_id)
+        )
+        if last_id is None:
+            break
+
+        previous = await db.scalar(
+            select(AuditArchiveSegment).order_by(AuditArchiveSegment.last_entry_id.desc()).limit(1)
+        )
+        segment = await _archive_range(db, start.strftime("%Y-%m"), first.id, last_id, previous)
+        await db.commit()
+        logger.info(
+            "Archived audit period",
+            extra={"period": segment.period, "entries": segment.entry_count, "storage_key": segment.storage_key},
+        )
+        archived.append(segment)
+    return archived
@@ -1,17 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import hmac
 import json
-from dataclasses import dataclass
+import logging
+import multiprocessing
+import os
+import threading
+import weakref
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Engine, Select, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, SessionTransaction
 
-from app.models import AuditLog
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import (
+    AuditArchiveSegment,
+    AuditChainHead,
+    AuditLog,
+    AuditMerkleNode,
+    AuditMerkleRoot,
+    AuditVerificationCheckpoint,
+    AuditVerificationRun,
+)
+from app.services.audit_archive import ArchiveIntegrityError, archive_segments, iter_segment, verify_row
+from app.services.audit_merkle import append_leaves, root_from_peaks
 from app.utils.serialization import to_jsonable
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AuditVerificationResult:
@@ -19,14 +47,242 @@ class AuditVerificationResult:
     checked_entries: int
     first_invalid_id: int | None
     message: str
+    start_after_id: int | None = None
+    last_entry_id: int | None = None
+    last_hash: str | None = None
+    entry_count: int = 0
+
+
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), check_circular=False)
 
 
 def _canonical_hash_payload(payload: dict[str, Any]) -> str:
-    normalized = to_jsonable(payload)
-    raw = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    raw = _CANONICAL_ENCODER.encode(to_jsonable(payload))
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
+CHAIN_HEAD_ID = 1
+
+
+@dataclass
+class ChainHead:
+    last_entry_id: int | None
+    last_hash: str | None
+    entry_count: int
+    merkle_size: int = 0
+    merkle_peaks: list[list[Any]] = field(default_factory=list)
+    merkle_period: str | None = None
+
+    def copy(self) -> ChainHead:
+        return replace(self, merkle_peaks=[list(peak) for peak in self.merkle_peaks])
+
+
+class _LocalChainState:
+    # Process-local serialisation for databases without row locks (SQLite).
+    # The cached head is only trusted while the lock is held and is dropped
+    # whenever a transaction that advanced it rolls back.
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.head: ChainHead | None = None
+
+
+@dataclass
+class _PendingChain:
+    head: ChainHead
+    local: _LocalChainState | None
+    dirty: bool = False
+    nodes: list[dict[str, Any]] = field(default_factory=list)
+    roots: list[dict[str, Any]] = field(default_factory=list)
+    committed: bool = False
+
+
+_local_states: weakref.WeakKeyDictionary[Engine, _LocalChainState] = weakref.WeakKeyDictionary()
+
+
+def _local_state(bind: Engine) -> _LocalChainState:
+    state = _local_states.get(bind)
+    if state is None:
+        state = _local_states[bind] = _LocalChainState()
+    return state
+
+
+async def _read_chain_head(db: AsyncSession, *, for_update: bool) -> ChainHead:
+    query = select(AuditChainHead).where(AuditChainHead.id == CHAIN_HEAD_ID)
+    if for_update:
+        query = query.with_for_update()
+    row = (await db.execute(query)).scalar_one_or_none()
+    if row is not None:
+        return ChainHead(
+            row.last_entry_id,
+            row.last_hash,
+            row.entry_count,
+            row.merkle_size,
+            row.merkle_peaks or [],
+            row.merkle_period,
+        )
+
+    # First append against this database: seed the head from the existing log.
+    # Entries that predate the head are not in the Merkle index until
+    # app.scripts.rebuild_audit_merkle is run.
+    tail = (await db.execute(select(AuditLog.id, AuditLog.content_hash).order_by(AuditLog.id.desc()).limit(1))).first()
+    count = await db.scalar(select(func.count()).select_from(AuditLog)) or 0
+    head = ChainHead(tail[0] if tail else None, tail[1] if tail else None, count)
+    try:
+        async with db.begin_nested():
+            db.add(
+                AuditChainHead(
+                    id=CHAIN_HEAD_ID,
+                    last_entry_id=head.last_entry_id,
+                    last_hash=head.last_hash,
+                    entry_count=head.entry_count,
+                )
+            )
+    except IntegrityError:
+        return await _read_chain_head(db, for_update=for_update)
+    return head
+
+
+async def acquire_chain_head(db: AsyncSession) -> _PendingChain:
+    pending: _PendingChain | None = db.sync_session.info.get("audit_chain")
+    if pending is not None:
+        return pending
+
+    # The chain is released when the top-level transaction ends, so one must
+    # exist before the lock is taken.
+    if not db.in_transaction():
+        await db.begin()
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        pending = _PendingChain(await _read_chain_head(db, for_update=True), None)
+    else:
+        local = _local_state(bind)
+        await local.lock.acquire()
+        try:
+            head = local.head or await _read_chain_head(db, for_update=False)
+        except BaseException:
+            local.lock.release()
+            raise
+        pending = _PendingChain(head.copy(), local)
+    db.sync_session.info["audit_chain"] = pending
+    return pending
+
+
+def advance_chain_head(pending: _PendingChain, entries: Sequence[tuple[int, str]]) -> None:
+    if not entries:
+        return
+    head = pending.head
+    period = datetime.now(UTC).date().isoformat()
+    if head.merkle_period != period:
+        # The first append of a new period seals the previous period's root.
+        if head.merkle_period is not None and head.merkle_size:
+            pending.roots.append(
+                {
+                    "period": head.merkle_period,
+                    "tree_size": head.merkle_size,
+                    "root_hash": root_from_peaks(head.merkle_peaks),
+                }
+            )
+        head.merkle_period = period
+
+    head.merkle_size, head.merkle_peaks, nodes = append_leaves(head.merkle_size, head.merkle_peaks, entries)
+    pending.nodes.extend(nodes)
+    head.last_entry_id, head.last_hash = entries[-1]
+    head.entry_count += len(entries)
+    pending.dirty = True
+
+
+@event.listens_for(Session, "before_commit")
+def _write_chain_head(session: Session) -> None:
+    pending: _PendingChain | None = session.info.get("audit_chain")
+    if pending is None or not pending.dirty:
+        return
+    if pending.nodes:
+        session.execute(insert(AuditMerkleNode), pending.nodes)
+    if pending.roots:
+        session.execute(insert(AuditMerkleRoot), pending.roots)
+    session.execute(
+        update(AuditChainHead)
+        .where(AuditChainHead.id == CHAIN_HEAD_ID)
+        .values(
+            last_entry_id=pending.head.last_entry_id,
+            last_hash=pending.head.last_hash,
+            entry_count=pending.head.entry_count,
+            merkle_size=pending.head.merkle_size,
+            merkle_peaks=pending.head.merkle_peaks,
+            merkle_period=pending.head.merkle_period,
+        )
+    )
+    pending.nodes = []
+    pending.roots = []
+    pending.dirty = False
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_chain_after_commit(session: Session) -> None:
+    pending: _PendingChain | None = session.info.get("audit_chain")
+    if pending is not None and pending.local is not None:
+        pending.local.head = pending.head
+        pending.committed = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_chain(session: Session, transaction: SessionTransaction) -> None:
+    # Fires on commit, rollback and on close() of a session left mid
+    # transaction (e.g. a route that raised after recording an event), so the
+    # local lock can never outlive the transaction that took it.
+    if transaction.parent is not None:
+        return
+    pending: _PendingChain | None = session.info.pop("audit_chain", None)
+    if pending is not None and pending.local is not None:
+        if not pending.committed:
+            pending.local.head = None
+        pending.local.lock.release()
+
+
+@dataclass
+class AuditEvent:
+    actor_id: UUID | None
+    actor_type: str
+    action: str
+    entity_type: str
+    entity_id: UUID | None
+    before_state: dict[str, Any] | None
+    after_state: dict[str, Any] | None
+    request_id: str | None
+    metadata: dict[str, Any] | None = None
+
+
+def _chain_event(event: AuditEvent, previous_hash: str | None) -> dict[str, Any]:
+    payload = {
+        "actor_id": str(event.actor_id) if event.actor_id else None,
+        "actor_type": event.actor_type,
+        "action": event.action,
+        "entity_type": event.entity_type,
+        "entity_id": str(event.entity_id) if event.entity_id else None,
+        "before_state": event.before_state,
+        "after_state": event.after_state,
+        "metadata": event.metadata or {},
+        "request_id": event.request_id,
+        "previous_hash": previous_hash,
+    }
+    # Timestamps are assigned at append time, under the chain lock, so they
+    # follow chain order and compare exactly in keyset cursors on every backend.
+    return {
+        "timestamp": datetime.now(UTC),
+        "actor_id": event.actor_id,
+        "actor_type": event.actor_type,
+        "action": event.action,
+        "entity_type": event.entity_type,
+        "entity_id": event.entity_id,
+        "before_state": event.before_state,
+        "after_state": event.after_state,
+        "audit_metadata": event.metadata or {},
+        "request_id": event.request_id,
+        "previous_hash": previous_hash,
+        "content_hash": _canonical_hash_payload(payload),
+    }
+
+
 async def record_audit_event(
     db: AsyncSession,
     *,
@@ -40,10 +296,66 @@ async def record_audit_event(
     request_id: str | None,
     metadata: dict[str, Any] | None = None,
 ) -> AuditLog:
-    latest = await db.execute(select(AuditLog).order_by(AuditLog.id.desc()).limit(1))
-    previous = latest.scalar_one_or_none()
-    previous_hash = previous.content_hash if previous else None
+    pending = await acquire_chain_head(db)
+    event = AuditEvent(
+        actor_id=actor_id,
+        actor_type=actor_type,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        before_state=before_state,
+        after_state=after_state,
+        request_id=request_id,
+        metadata=metadata,
+    )
+    entry = AuditLog(**_chain_event(event, pending.head.last_hash))
+    db.add(entry)
+    await db.flush()
+    advance_chain_head(pending, [(entry.id, entry.content_hash)])
+    return entry
+
+
+async def record_audit_events_batch(db: AsyncSession, events: Sequence[AuditEvent]) -> list[int]:
+    if not events:
+        return []
+    pending = await acquire_chain_head(db)
+    rows: list[dict[str, Any]] = []
+    previous_hash = pending.head.last_hash
+    for event in events:
+        row = _chain_event(event, previous_hash)
+        rows.append(row)
+        previous_hash = row["content_hash"]
+
+    # Pending ORM changes are flushed first so the batch lands after any
+    # single events already recorded in this transaction.
+    await db.flush()
+    result = await db.execute(insert(AuditLog).returning(AuditLog.id, sort_by_parameter_order=True), rows)
+    entry_ids = list(result.scalars().all())
+    advance_chain_head(pending, [(entry_id, row["content_hash"]) for entry_id, row in zip(entry_ids, rows)])
+    return entry_ids
+
+
+VERIFY_COLUMNS = (
+    AuditLog.id,
+    AuditLog.actor_id,
+    AuditLog.actor_type,
+    AuditLog.action,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.before_state,
+    AuditLog.after_state,
+    AuditLog.audit_metadata,
+    AuditLog.request_id,
+    AuditLog.previous_hash,
+    AuditLog.content_hash,
+)
+
 
+def _stored_entry_hash(row: Sequence[Any], previous_hash: str | None) -> str:
+    # Values read back from the database are already JSON-native, so the
+    # to_jsonable walk done at write time is skipped; the encoded bytes are
+    # identical to _canonical_hash_payload for the same entry.
+    _, actor_id, actor_type, action, entity_type, entity_id, before_state, after_state, metadata, request_id, *_ = row
     payload = {
         "actor_id": str(actor_id) if actor_id else None,
         "actor_type": actor_type,
@@ -52,69 +364,320 @@ async def record_audit_event(
         "entity_id": str(entity_id) if entity_id else None,
         "before_state": before_state,
         "after_state": after_state,
-        "metadata": metadata or {},
+        "metadata": metadata,
         "request_id": request_id,
         "previous_hash": previous_hash,
     }
-    content_hash = _canonical_hash_payload(payload)
+    return hashlib.sha256(_CANONICAL_ENCODER.encode(payload).encode("utf-8")).hexdigest()
 
-    entry = AuditLog(
-        actor_id=actor_id,
-        actor_type=actor_type,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        before_state=before_state,
-        after_state=after_state,
-        audit_metadata=metadata or {},
-        request_id=request_id,
-        previous_hash=previous_hash,
-        content_hash=content_hash,
+
+@dataclass
+class SegmentResult:
+    count: int
+    first_id: int
+    first_previous_hash: str | None
+    last_id: int
+    last_hash: str
+    invalid_offset: int | None = None
+    invalid_id: int | None = None
+    invalid_message: str | None = None
+
+
+def verify_segment(rows: list[tuple[Any, ...]]) -> SegmentResult:
+    # Checks everything inside one contiguous id range; the link from the
+    # previous segment is checked by the caller once segments come back in order.
+    segment = SegmentResult(len(rows), rows[0][0], rows[0][10], rows[-1][0], rows[-1][11])
+    for offset, row in enumerate(rows):
+        entry_id, previous_hash, content_hash = row[0], row[10], row[11]
+        if offset and previous_hash != rows[offset - 1][11]:
+            segment.invalid_message = f"Previous hash mismatch at entry {entry_id}"
+        elif content_hash != _stored_entry_hash(row, previous_hash):
+            segment.invalid_message = f"Content hash mismatch at entry {entry_id}"
+        else:
+            continue
+        segment.invalid_offset, segment.invalid_id = offset, entry_id
+        break
+    return segment
+
+
+def _join_segments(head: SegmentResult, tail: SegmentResult) -> SegmentResult:
+    joined = SegmentResult(head.count + tail.count, head.first_id, head.first_previous_hash, tail.last_id, tail.last_hash)
+    if tail.first_previous_hash != head.last_hash:
+        joined.invalid_offset, joined.invalid_id = head.count, tail.first_id
+        joined.invalid_message = f"Previous hash mismatch at entry {tail.first_id}"
+    elif tail.invalid_offset is not None:
+        joined.invalid_offset, joined.invalid_id = head.count + tail.invalid_offset, tail.invalid_id
+        joined.invalid_message = tail.invalid_message
+    return joined
+
+
+def _range_query(first_id: int, last_id: int) -> Select[Any]:
+    return select(*VERIFY_COLUMNS).where(AuditLog.id.between(first_id, last_id)).order_by(AuditLog.id.asc())
+
+
+_range_worker = threading.local()
+
+
+def _range_runner(database_url: str) -> tuple[asyncio.Runner, AsyncEngine]:
+    # Each worker thread keeps one event loop and one engine for all of its
+    # ranges, so connections are reused; engines are never shared across loops.
+    if getattr(_range_worker, "database_url", None) != database_url:
+        _range_worker.runner = asyncio.Runner()
+        _range_worker.engine = create_async_engine(database_url, pool_size=1)
+        _range_worker.database_url = database_url
+    return _range_worker.runner, _range_worker.engine
+
+
+def verify_id_range(database_url: str, first_id: int, last_id: int) -> SegmentResult | None:
+    # Pool worker: reads its id range over its own connection. Ids are not
+    # contiguous, so a range may come back short or empty.
+    runner, engine = _range_runner(database_url)
+
+    async def fetch() -> list[tuple[Any, ...]]:
+        async with engine.connect() as conn:
+            return [tuple(row) for row in await conn.execute(_range_query(first_id, last_id))]
+
+    rows = runner.run(fetch())
+    return verify_segment(rows) if rows else None
+
+
+def verify_archived_segment(storage_key: str, file_sha256: str) -> SegmentResult | None:
+    # Pool worker: streams one archived segment from storage. Raises
+    # ArchiveIntegrityError when the file is missing or fails its checksum.
+    result: SegmentResult | None = None
+    for records in iter_segment(storage_key, file_sha256):
+        if not records:
+            continue
+        batch = verify_segment([verify_row(record) for record in records])
+        result = batch if result is None else _join_segments(result, batch)
+        if result.invalid_offset is not None:
+            break
+    return result
+
+
+def verification_workers() -> int:
+    configured = get_settings().audit_verify_workers
+    return configured if configured > 0 else os.cpu_count() or 1
+
+
+@lru_cache
+def get_verification_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=verification_workers(), mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_verification_executor() -> None:
+    # Only a pool that was actually started needs its workers reaped.
+    if get_verification_executor.cache_info().currsize:
+        get_verification_executor().shutdown(cancel_futures=True)
+        get_verification_executor.cache_clear()
+
+
+def _checkpoint_signature(last_entry_id: int, last_hash: str, entry_count: int, verified_at: datetime) -> str:
+    settings = get_settings()
+    if verified_at.tzinfo is None:
+        verified_at = verified_at.replace(tzinfo=UTC)
+    message = f"{last_entry_id}:{last_hash}:{entry_count}:{verified_at.astimezone(UTC).isoformat()}"
+    key = (settings.audit_checkpoint_key or settings.secret_key).encode("utf-8")
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+async def latest_verification_checkpoint(db: AsyncSession) -> AuditVerificationCheckpoint | None:
+    result = await db.execute(
+        select(AuditVerificationCheckpoint).order_by(AuditVerificationCheckpoint.last_entry_id.desc()).limit(10)
     )
-    db.add(entry)
+    for checkpoint in result.scalars().all():
+        expected = _checkpoint_signature(
+            checkpoint.last_entry_id, checkpoint.last_hash, checkpoint.entry_count, checkpoint.verified_at
+        )
+        if not hmac.compare_digest(expected, checkpoint.signature):
+            logger.warning("Ignoring audit checkpoint with a bad signature", extra={"checkpoint_id": checkpoint.id})
+            continue
+        anchor = await db.scalar(select(AuditLog.content_hash).where(AuditLog.id == checkpoint.last_entry_id))
+        if anchor != checkpoint.last_hash:
+            logger.warning("Audit checkpoint anchor no longer matches", extra={"checkpoint_id": checkpoint.id})
+            return None
+        return checkpoint
+    return None
+
+
+async def record_verification_checkpoint(
+    db: AsyncSession,
+    result: AuditVerificationResult,
+    run_id: UUID | None = None,
+) -> AuditVerificationCheckpoint | None:
+    if not result.valid or result.last_entry_id is None or result.checked_entries == 0:
+        return None
+    verified_at = datetime.now(UTC)
+    checkpoint = AuditVerificationCheckpoint(
+        last_entry_id=result.last_entry_id,
+        last_hash=result.last_hash,
+        entry_count=result.entry_count,
+        verified_at=verified_at,
+        run_id=run_id,
+        signature=_checkpoint_signature(result.last_entry_id, result.last_hash, result.entry_count, verified_at),
+    )
+    db.add(checkpoint)
     await db.flush()
-    return entry
+    return checkpoint
 
 
-async def verify_audit_hash_chain(db: AsyncSession) -> AuditVerificationResult:
-    result = await db.execute(select(AuditLog).order_by(AuditLog.id.asc()))
-    entries = list(result.scalars().all())
+async def verify_audit_hash_chain(
+    db: AsyncSession,
+    *,
+    full: bool = False,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    executor: Executor | None = None,
+) -> AuditVerificationResult:
+    settings = get_settings()
+    checkpoint = None if full else await latest_verification_checkpoint(db)
 
+    bounds_query = select(func.min(AuditLog.id), func.max(AuditLog.id))
+    count_query = select(func.count()).select_from(AuditLog)
+    start_after_id: int | None = None
     previous_hash: str | None = None
-    for entry in entries:
-        payload = {
-            "actor_id": str(entry.actor_id) if entry.actor_id else None,
-            "actor_type": entry.actor_type,
-            "action": entry.action,
-            "entity_type": entry.entity_type,
-            "entity_id": str(entry.entity_id) if entry.entity_id else None,
-            "before_state": entry.before_state,
-            "after_state": entry.after_state,
-            "metadata": entry.audit_metadata,
-            "request_id": entry.request_id,
-            "previous_hash": previous_hash,
-        }
-        expected_hash = _canonical_hash_payload(payload)
-
-        if entry.previous_hash != previous_hash:
-            return AuditVerificationResult(
-                valid=False,
-                checked_entries=len(entries),
-                first_invalid_id=entry.id,
-                message=f"Previous hash mismatch at entry {entry.id}",
-            )
-        if entry.content_hash != expected_hash:
-            return AuditVerificationResult(
-                valid=False,
-                checked_entries=len(entries),
-                first_invalid_id=entry.id,
-                message=f"Content hash mismatch at entry {entry.id}",
-            )
-        previous_hash = entry.content_hash
+    entry_count = 0
+    if checkpoint is not None:
+        start_after_id = checkpoint.last_entry_id
+        previous_hash = checkpoint.last_hash
+        entry_count = checkpoint.entry_count
+        bounds_query = bounds_query.where(AuditLog.id > start_after_id)
+        count_query = count_query.where(AuditLog.id > start_after_id)
+
+    # Archived periods precede the live table in chain order; a checkpoint
+    # always lies past them, so they are only re-read on a from-scratch run.
+    segments = [] if checkpoint is not None else await archive_segments(db)
+    total = int(await db.scalar(count_query) or 0) + sum(segment.entry_count for segment in segments)
+    if executor is None and total >= settings.audit_verify_parallel_min_entries and verification_workers() > 1:
+        executor = get_verification_executor()
+    max_in_flight = (verification_workers() if executor is not None else 0) * 2
+
+    checked = 0
+    last_entry_id = start_after_id
+    in_flight: deque[tuple[asyncio.Future[SegmentResult | None], AuditArchiveSegment | None]] = deque()
+
+    def outcome(invalid_id: int | None, message: str, offset: int) -> AuditVerificationResult:
+        return AuditVerificationResult(
+            valid=False,
+            checked_entries=checked + offset,
+            first_invalid_id=invalid_id,
+            message=message,
+            start_after_id=start_after_id,
+            last_entry_id=last_entry_id,
+            last_hash=previous_hash,
+            entry_count=entry_count + checked + max(offset - 1, 0),
+        )
+
+    async def link(
+        future: asyncio.Future[SegmentResult | None], archived: AuditArchiveSegment | None
+    ) -> AuditVerificationResult | None:
+        # Results are linked strictly in id order, so the first failure
+        # reported is the earliest broken entry, exactly as a serial pass.
+        # Only boundary hashes cross back from the workers.
+        nonlocal checked, last_entry_id, previous_hash
+        try:
+            segment = await future
+        except ArchiveIntegrityError as exc:
+            # A file that fails its checksum reports the segment as a whole,
+            # from the state before it.
+            return outcome(archived.first_entry_id, str(exc), 0)
+        if segment is not None and segment.first_previous_hash != previous_hash:
+            return outcome(segment.first_id, f"Previous hash mismatch at entry {segment.first_id}", 1)
+        if segment is not None and segment.invalid_offset is not None:
+            return outcome(segment.invalid_id, segment.invalid_message or "", segment.invalid_offset + 1)
+        if archived is not None:
+            boundary = (segment.first_id, segment.last_id, segment.count, segment.last_hash) if segment else None
+            if boundary != (archived.first_entry_id, archived.last_entry_id, archived.entry_count, archived.last_hash):
+                message = f"Archived audit segment {archived.storage_key} does not match its boundary hashes"
+                return outcome(archived.first_entry_id, message, 0)
+        if segment is None:
+            return None
+        checked += segment.count
+        last_entry_id, previous_hash = segment.last_id, segment.last_hash
+        if on_progress is not None:
+            await on_progress(checked, max(total, checked))
+        return None
+
+    async def verify_inline(first_id: int, last_id: int) -> SegmentResult | None:
+        rows = [tuple(row) for row in await db.execute(_range_query(first_id, last_id))]
+        return verify_segment(rows) if rows else None
+
+    # Workers are handed id ranges and segment keys rather than rows: each one
+    # fetches and decodes its own share. Without a pool the same ranges are
+    # read on this session, one at a time.
+    database_url = db.get_bind().url.render_as_string(hide_password=False)
+    jobs: list[tuple[Callable[..., Any], tuple[Any, ...], AuditArchiveSegment | None]] = [
+        (verify_archived_segment, (archived.storage_key, archived.file_sha256), archived) for archived in segments
+    ]
+    chunk = settings.audit_verify_chunk_size
+    first_id, last_id = (await db.execute(bounds_query)).one()
+    if first_id is not None:
+        jobs += [
+            (verify_id_range, (database_url, low, min(low + chunk - 1, last_id)), None)
+            for low in range(first_id, last_id + 1, chunk)
+        ]
+
+    try:
+        for job, args, archived in jobs:
+            if executor is not None:
+                future = asyncio.wrap_future(executor.submit(job, *args))
+            elif archived is not None:
+                future = asyncio.ensure_future(asyncio.to_thread(job, *args))
+            else:
+                future = asyncio.ensure_future(verify_inline(*args[1:]))
+            in_flight.append((future, archived))
+            while len(in_flight) > max_in_flight:
+                failure = await link(*in_flight.popleft())
+                if failure is not None:
+                    return failure
+        while in_flight:
+            failure = await link(*in_flight.popleft())
+            if failure is not None:
+                return failure
+    finally:
+        for future, _ in in_flight:
+            future.cancel()
 
     return AuditVerificationResult(
         valid=True,
-        checked_entries=len(entries),
+        checked_entries=checked,
         first_invalid_id=None,
-        message="Hash chain verified",
+        message="Hash chain verified" if start_after_id is None else f"Hash chain verified after entry {start_after_id}",
+        start_after_id=start_after_id,
+        last_entry_id=last_entry_id,
+        last_hash=previous_hash,
+        entry_count=entry_count + checked,
     )
+
+
+async def verify_audit_chain_job(run_id: UUID) -> None:
+    async with AsyncSessionLocal() as progress_db:
+        run = await progress_db.get(AuditVerificationRun, run_id)
+        if run is None:
+            return
+        run.status = "processing"
+        run.started_at = datetime.now(UTC)
+        await progress_db.commit()
+
+        async def report(checked: int, total: int) -> None:
+            run.checked_entries = checked
+            run.total_entries = total
+            await progress_db.commit()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                outcome = await verify_audit_hash_chain(db, full=run.full, on_progress=report)
+        except Exception as exc:
+            logger.exception("Audit verification failed", extra={"run_id": str(run_id)})
+            run.status = "failed"
+            run.error_message = str(exc)
+        else:
+            run.status = "completed"
+            run.valid = outcome.valid
+            run.checked_entries = outcome.checked_entries
+            run.total_entries = max(run.total_entries, outcome.checked_entries)
+            run.first_invalid_id = outcome.first_invalid_id
+            run.start_after_id = outcome.start_after_id
+            run.message = outcome.message
+            await record_verification_checkpoint(progress_db, outcome, run_id=run.id)
+        run.completed_at = datetime.now(UTC)
+        await progress_db.commit()
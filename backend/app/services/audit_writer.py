@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import User
+from app.services.audit_service import AuditEvent, record_audit_events_batch
+from app.utils.serialization import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+class AuditWriter:
+    # Write-behind path for high-volume events such as examiner reads. A single
+    # drain task takes events in arrival order and appends them to the chain
+    # in batches; when the queue is full producers wait instead of dropping.
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_size: int,
+        batch_size: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_size = max(1, max_size)
+        self._batch_size = max(1, batch_size)
+        self._queue: asyncio.Queue[AuditEvent] | None = None
+        self._drainer: asyncio.Task[None] | None = None
+        self._in_flight: list[AuditEvent] = []
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self._drainer is not None and not self._drainer.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._max_size)
+        self._drainer = asyncio.create_task(self._drain())
+
+    async def enqueue(self, event: AuditEvent) -> None:
+        self.start()
+        assert self._queue is not None
+        await self._queue.put(event)
+
+    async def flush(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float | None = None) -> None:
+        # The flush gets a deadline because a failing database keeps the batch
+        # retrying forever. Whatever is still queued is logged in full so it
+        # can be replayed; a batch cut off mid-commit may appear twice.
+        if timeout is None:
+            timeout = get_settings().audit_queue_shutdown_timeout_seconds
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except TimeoutError:
+            pass
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+
+        unwritten = list(self._in_flight)
+        while self._queue is not None and not self._queue.empty():
+            unwritten.append(self._queue.get_nowait())
+        if unwritten:
+            logger.error("Audit write-behind stopped with %d unwritten events", len(unwritten))
+            for event in unwritten:
+                logger.error(
+                    "Unwritten audit event %s",
+                    json.dumps(to_jsonable(asdict(event))),
+                    extra={"request_id": event.request_id},
+                )
+        self._queue, self._drainer, self._in_flight = None, None, []
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._in_flight = batch
+            await self._write(batch)
+            self._in_flight = []
+            for _ in batch:
+                queue.task_done()
+
+    async def _write(self, batch: list[AuditEvent]) -> None:
+        # A failed batch is retried as a unit so order is kept; meanwhile the
+        # queue fills and producers are held back rather than losing events.
+        delay = RETRY_BASE_DELAY
+        while True:
+            try:
+                async with self._session_factory() as session:
+                    await record_audit_events_batch(session, batch)
+                    await session.commit()
+                return
+            except Exception:
+                logger.exception("Audit write-behind batch failed", extra={"events": len(batch)})
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+
+
+def _entity_from_route(request: Request) -> tuple[str, UUID | None]:
+    # The last UUID path parameter names the entity being read, typed by the
+    # collection segment in front of it: /reviews/{review_id} -> review.
+    route = request.scope.get("route")
+    template = getattr(route, "path", request.url.path).removeprefix(get_settings().api_prefix)
+    parts = [part for part in template.split("/") if part]
+    entity_type, entity_id = _singular(parts[0]) if parts else "api", None
+    segment = None
+    for part in parts:
+        if part.startswith("{") and part.endswith("}"):
+            try:
+                value = UUID(str(request.path_params.get(part[1:-1].split(":")[0])))
+            except ValueError:
+                continue
+            if segment:
+                entity_type, entity_id = segment, value
+        else:
+            segment = _singular(part)
+    return entity_type[:50], entity_id
+
+
+def _singular(segment: str) -> str:
+    # Route segments are plural collections; audit entity types are singular.
+    if segment.endswith("ies"):
+        return segment[:-3] + "y"
+    return segment[:-1] if segment.endswith("s") else segment
+
+
+def read_access_event(request: Request, user: User) -> AuditEvent:
+    route = request.scope.get("route")
+    entity_type, entity_id = _entity_from_route(request)
+    return AuditEvent(
+        actor_id=user.id,
+        actor_type="USER",
+        action="read",
+        entity_type=entity_type,
+        entity_id=entity_id,
+        before_state=None,
+        after_state=None,
+        request_id=getattr(request.state, "request_id", None),
+        metadata={
+            "method": request.method,
+            "route": getattr(route, "path", None),
+            "path": request.url.path,
+            "query": dict(request.query_params),
+        },
+    )
+
+
+def should_record_read(request: Request, user: User) -> bool:
+    return request.method == "GET" and user.role in get_settings().audit_read_access_roles
+
+
+audit_writer = AuditWriter(
+    AsyncSessionLocal,
+    get_settings().audit_queue_max_size,
+    get_settings().audit_queue_batch_size,
+)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import StoredBlob
+from app.services.storage import get_storage_backend
+from app.services.upload_service import StagedUpload, discard_upload
+
+
+def staging_dir() -> Path:
+    return Path(get_settings().file_storage_path) / "blobs" / ".staging"
+
+
+def blob_key(file_hash: str) -> str:
+    return f"blobs/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}"
+
+
+async def _place_blob(staged: StagedUpload) -> str:
+    key = blob_key(staged.file_hash)
+    await get_storage_backend().put_file(key, staged.path)
+    return key
+
+
+def _locked_blob(file_hash: str) -> Select[tuple[StoredBlob]]:
+    return select(StoredBlob).where(StoredBlob.sha256 == file_hash).with_for_update()
+
+
+async def store_blob(db: AsyncSession, staged: StagedUpload) -> StoredBlob:
+    # The row is written and locked before any file is placed, so the
+    # collector (which takes the same lock) never deletes an object a pending
+    # upload is about to reference. Committing is left to the caller.
+    blob = (await db.execute(_locked_blob(staged.file_hash))).scalar_one_or_none()
+    if blob is None:
+        try:
+            async with db.begin_nested():
+                blob = StoredBlob(
+                    sha256=staged.file_hash, size=staged.size, storage_path=blob_key(staged.file_hash), ref_count=0
+                )
+                db.add(blob)
+        except IntegrityError:
+            blob = (await db.execute(_locked_blob(staged.file_hash))).scalar_one()
+
+    if await get_storage_backend().exists(blob.storage_path):
+        await discard_upload(staged)
+    else:
+        blob.storage_path = await _place_blob(staged)
+    blob.ref_count += 1
+    blob.released_at = None
+    return blob
+
+
+async def release_blob(db: AsyncSession, file_hash: str) -> None:
+    blob = (await db.execute(_locked_blob(file_hash))).scalar_one_or_none()
+    if blob is not None and blob.ref_count > 0:
+        blob.ref_count -= 1
+        if blob.ref_count == 0:
+            blob.released_at = datetime.now(UTC)
+
+
+async def collect_unreferenced_blobs(db: AsyncSession, *, grace: timedelta | None = None) -> int:
+    # Released blobs stay as tombstones for a grace period so an upload of the
+    # same content that raced the release can still claim them. Rows are
+    # deleted under their lock before the files go; if the caller's commit
+    # then fails, store_blob re-places the file for the surviving row.
+    if grace is None:
+        grace = timedelta(seconds=get_settings().blob_gc_grace_seconds)
+    result = await db.execute(
+        select(StoredBlob)
+        .where(StoredBlob.ref_count <= 0, StoredBlob.released_at < datetime.now(UTC) - grace)
+        .with_for_update(skip_locked=True)
+    )
+    blobs = list(result.scalars().all())
+    for blob in blobs:
+        await db.delete(blob)
+    await db.flush()
+
+    backend = get_storage_backend()
+    for blob in blobs:
+        await backend.delete(blob.storage_path)
+    return len(blobs)
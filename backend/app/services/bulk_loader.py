@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import JSON, Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.utils.serialization import to_jsonable
+
+ProgressCallback = Callable[[int], None]
+
+
+def _batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _python_defaults(table: Table, provided: set[str]) -> dict[str, Any]:
+    defaults: dict[str, Any] = {}
+    for column in table.columns:
+        if column.name in provided or column.default is None:
+            continue
+        if not (column.default.is_scalar or column.default.is_callable):
+            continue
+        defaults[column.name] = column.default
+    return defaults
+
+
+def _copy_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, JSON):
+        return json.dumps(to_jsonable(value))
+    return value
+
+
+async def _copy_batch(db: AsyncSession, table: Table, batch: list[dict[str, Any]]) -> None:
+    provided = set().union(*(row.keys() for row in batch))
+    defaults = _python_defaults(table, provided)
+    column_names = sorted(provided) + sorted(defaults)
+    columns = [table.c[name] for name in column_names]
+
+    records = []
+    for row in batch:
+        record = []
+        for column in columns:
+            if column.name in defaults:
+                default = defaults[column.name]
+                value = default.arg(None) if default.is_callable else default.arg
+            else:
+                value = row.get(column.name)
+            record.append(_copy_value(column, value))
+        records.append(tuple(record))
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=records,
+        columns=column_names,
+        schema_name=table.schema,
+    )
+
+
+async def bulk_insert_rows(
+    db: AsyncSession,
+    table: Table,
+    rows: Iterable[dict[str, Any]],
+    *,
+    batch_size: int | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> int:
+    settings = get_settings()
+    size = batch_size or settings.bulk_insert_batch_size
+    use_copy = settings.bulk_insert_use_copy and db.get_bind().dialect.driver == "asyncpg"
+
+    inserted = 0
+    for batch in _batched(rows, size):
+        if use_copy:
+            await _copy_batch(db, table, batch)
+        else:
+            await db.execute(insert(table), batch)
+        inserted += len(batch)
+        if on_progress:
+            on_progress(inserted)
+    return inserted
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import Document, Extraction, ExtractedRecord
+
+DeltaRow = tuple[uuid.UUID, str | None, str | None, str | None]
+
+
+def delta_key(identifier: str | None, email: str | None) -> str | None:
+    for raw in (identifier, email):
+        if raw and str(raw).strip():
+            return str(raw).strip().lower()
+    return None
+
+
+def _delta_entry(row: DeltaRow, key: str) -> dict[str, Any]:
+    record_id, identifier, email, _ = row
+    return {"key": key, "record_id": str(record_id), "identifier": identifier, "email": email}
+
+
+def diff_records(current: Iterable[DeltaRow], previous: Iterable[DeltaRow], detail_limit: int) -> dict[str, Any]:
+    counts = {"added": 0, "removed": 0, "changed": 0, "unchanged": 0, "unkeyed": 0, "duplicate": 0}
+    details: dict[str, list[dict[str, Any]]] = {"added": [], "removed": [], "changed": []}
+
+    def note(kind: str, entry: dict[str, Any]) -> None:
+        counts[kind] += 1
+        if len(details[kind]) < detail_limit:
+            details[kind].append(entry)
+
+    previous_by_key: dict[str, DeltaRow] = {}
+    for row in previous:
+        key = delta_key(row[1], row[2])
+        if key is not None:
+            previous_by_key.setdefault(key, row)
+
+    seen: set[str] = set()
+    for row in current:
+        key = delta_key(row[1], row[2])
+        if key is None:
+            counts["unkeyed"] += 1
+            continue
+        if key in seen:
+            counts["duplicate"] += 1
+            continue
+        seen.add(key)
+
+        match = previous_by_key.pop(key, None)
+        if match is None:
+            note("added", _delta_entry(row, key))
+        elif row[3] and match[3] and row[3] != match[3]:
+            note("changed", {**_delta_entry(row, key), "previous_record_id": str(match[0])})
+        else:
+            counts["unchanged"] += 1
+
+    for key, row in previous_by_key.items():
+        note("removed", _delta_entry(row, key))
+
+    truncated = any(counts[kind] > len(entries) for kind, entries in details.items())
+    return {"counts": counts, **details, "truncated": truncated}
+
+
+async def _load_delta_rows(db: AsyncSession, extraction_ids: list[uuid.UUID]) -> list[DeltaRow]:
+    if not extraction_ids:
+        return []
+    result = await db.execute(
+        select(ExtractedRecord.id, ExtractedRecord.identifier, ExtractedRecord.email, ExtractedRecord.content_hash)
+        .where(ExtractedRecord.extraction_id.in_(extraction_ids))
+        .order_by(ExtractedRecord.extraction_id, ExtractedRecord.record_index)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def compute_extraction_delta(
+    db: AsyncSession,
+    extraction: Extraction,
+    previous_review_id: uuid.UUID,
+) -> dict[str, Any]:
+    document_role = await db.scalar(select(Document.document_role).where(Document.id == extraction.document_id))
+    previous_result = await db.execute(
+        select(Extraction.id)
+        .join(Document, Extraction.document_id == Document.id)
+        .where(
+            Extraction.review_id == previous_review_id,
+            Extraction.is_active.is_(True),
+            Document.document_role == document_role,
+        )
+    )
+    previous_ids = [row[0] for row in previous_result.all()]
+
+    delta = diff_records(
+        await _load_delta_rows(db, [extraction.id]),
+        await _load_delta_rows(db, previous_ids),
+        get_settings().delta_detail_limit,
+    )
+    return {
+        "previous_review_id": str(previous_review_id),
+        "previous_extraction_ids": [str(item) for item in previous_ids],
+        "document_role": document_role,
+        "computed_at": datetime.now(UTC).isoformat(),
+        **delta,
+    }
@@ -1,18 +1,61 @@
 from __future__ import annotations
 
+import codecs
 import csv
 import hashlib
 import io
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pandas as pd
 from dateutil import parser as date_parser
+from openpyxl import load_workbook
+
+from app.utils.serialization import to_jsonable
 
 
 ALLOWED_EXTENSIONS = {".csv", ".xlsx", ".xls", ".json", ".xml", ".pdf"}
+BOOLEAN_VALUES = {"true", "false", "yes", "no", "y", "n"}
+
+ENCODING_SAMPLE_SIZE = 64 * 1024
+ENCODING_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+ASCII_COMPATIBLE_ENCODINGS = {"utf-8", "utf-8-sig", "cp1252", "latin-1"}
+CP1252_UNDEFINED_BYTES = (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+
+DATE_SAMPLE_SIZE = 200
+DATE_FAILURE_ROW_LIMIT = 20
+ISO_DATE_FORMAT = "iso"
+CANDIDATE_DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%y",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d.%m.%Y",
+    "%d-%b-%Y",
+    "%d-%b-%y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%Y%m%d",
+)
 
 
 class ExtractionError(Exception):
@@ -33,27 +76,303 @@ def normalize_key(value: str) -> str:
     return value.strip().lower().replace(" ", "_")
 
 
-def load_rows_from_bytes(filename: str, content: bytes) -> list[dict[str, Any]]:
+@dataclass(frozen=True)
+class DetectedEncoding:
+    encoding: str
+    confidence: float
+    bom: bool = False
+
+    @property
+    def byte_splittable(self) -> bool:
+        # Encodings where b"\n" and b'"' can only ever mean those characters,
+        # so byte offsets found by scanning are safe record boundaries.
+        return self.encoding in ASCII_COMPATIBLE_ENCODINGS
+
+
+def _cp1252_fallback(error: UnicodeError) -> tuple[str, int]:
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    return error.object[error.start : error.end].decode("cp1252", errors="replace"), error.end
+
+
+codecs.register_error("cp1252-fallback", _cp1252_fallback)
+
+
+def _utf16_without_bom(sample: bytes) -> DetectedEncoding | None:
+    window = sample[: ENCODING_SAMPLE_SIZE // 16 * 2]
+    pairs = len(window) // 2
+    if pairs < 2:
+        return None
+    even_zeros = window[0::2].count(0) / pairs
+    odd_zeros = window[1::2].count(0) / pairs
+    if odd_zeros >= 0.3 and even_zeros < 0.05:
+        return DetectedEncoding("utf-16-le", round(odd_zeros, 2))
+    if even_zeros >= 0.3 and odd_zeros < 0.05:
+        return DetectedEncoding("utf-16-be", round(even_zeros, 2))
+    return None
+
+
+def detect_encoding(sample: bytes) -> DetectedEncoding:
+    for bom, encoding in ENCODING_BOMS:
+        if sample.startswith(bom):
+            return DetectedEncoding(encoding, 1.0, bom=True)
+
+    utf16 = _utf16_without_bom(sample)
+    if utf16 is not None:
+        return utf16
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        pass
+    else:
+        # Pure ASCII samples are also valid cp1252; bytes after the sample that
+        # are not UTF-8 fall back to cp1252 while decoding.
+        return DetectedEncoding("utf-8", 1.0 if sample.isascii() else 0.99)
+
+    undefined = sum(sample.count(byte) for byte in CP1252_UNDEFINED_BYTES)
+    if undefined:
+        return DetectedEncoding("latin-1", 0.5)
+    return DetectedEncoding("cp1252", 0.8)
+
+
+def _read_sample(chunks: Iterator[bytes]) -> tuple[bytes, list[bytes]]:
+    head: list[bytes] = []
+    size = 0
+    while size < ENCODING_SAMPLE_SIZE:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        head.append(chunk)
+        size += len(chunk)
+    return b"".join(head)[:ENCODING_SAMPLE_SIZE], head
+
+
+def sniff_encoding(chunks: Iterable[bytes]) -> DetectedEncoding:
+    sample, _ = _read_sample(iter(chunks))
+    return detect_encoding(sample)
+
+
+def _iter_text_lines(chunks: Iterable[bytes], encoding: str | None = None) -> Iterator[str]:
+    chunks = iter(chunks)
+    head: list[bytes] = []
+    if encoding is None:
+        sample, head = _read_sample(chunks)
+        encoding = detect_encoding(sample).encoding
+
+    errors = "cp1252-fallback" if encoding in {"utf-8", "utf-8-sig"} else "replace"
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ""
+    for chunk in chain(head, chunks):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _spool_chunks(chunks: Iterable[bytes]) -> tempfile.SpooledTemporaryFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    for chunk in chunks:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def _check_extension(filename: str) -> str:
     ext = Path(filename).suffix.lower()
     if ext not in ALLOWED_EXTENSIONS:
         raise ExtractionError("FILE_FORMAT_UNSUPPORTED")
+    return ext
+
+
+def iter_csv_rows(
+    chunks: Iterable[bytes],
+    fieldnames: list[str] | None = None,
+    encoding: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    reader = csv.DictReader(_iter_text_lines(chunks, encoding), fieldnames=fieldnames)
+    for row in reader:
+        yield {normalize_key(k): sanitize_csv_formula(v) for k, v in row.items()}
+
+
+def iter_rows_from_stream(
+    filename: str,
+    chunks: Iterable[bytes],
+    limit: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    ext = _check_extension(filename)
 
     if ext == ".csv":
-        text = content.decode("utf-8", errors="ignore")
-        reader = csv.DictReader(io.StringIO(text))
-        return [{normalize_key(k): sanitize_csv_formula(v) for k, v in row.items()} for row in reader]
+        yield from islice(iter_csv_rows(chunks), limit)
+        return
 
     if ext in {".xlsx", ".xls"}:
-        df = pd.read_excel(io.BytesIO(content)).fillna("")
-        rows = df.to_dict(orient="records")
-        normalized: list[dict[str, Any]] = []
-        for row in rows:
-            normalized.append({normalize_key(str(k)): sanitize_csv_formula(v) for k, v in row.items()})
-        return normalized
+        with _spool_chunks(chunks) as spooled:
+            df = pd.read_excel(spooled, nrows=limit).fillna("")
+        for row in df.to_dict(orient="records"):
+            yield {normalize_key(str(k)): sanitize_csv_formula(to_jsonable(v)) for k, v in row.items()}
+        return
+
+    raise ExtractionError("Unsupported parser for file type in this phase")
+
+
+def load_rows_from_stream(filename: str, chunks: Iterable[bytes]) -> list[dict[str, Any]]:
+    return list(iter_rows_from_stream(filename, chunks))
+
+
+def load_rows_from_bytes(filename: str, content: bytes) -> list[dict[str, Any]]:
+    return load_rows_from_stream(filename, [content])
+
+
+def read_header(filename: str, chunks: Iterable[bytes]) -> list[str]:
+    ext = _check_extension(filename)
+
+    if ext == ".csv":
+        header = next(csv.reader(_iter_text_lines(chunks)), [])
+        return [normalize_key(column) for column in header]
+
+    if ext == ".xlsx":
+        with _spool_chunks(chunks) as spooled:
+            workbook = load_workbook(spooled, read_only=True)
+            try:
+                first_row = next(workbook.active.iter_rows(max_row=1, values_only=True), ())
+            finally:
+                workbook.close()
+        return [normalize_key(str(column)) for column in first_row if column is not None]
+
+    if ext == ".xls":
+        with _spool_chunks(chunks) as spooled:
+            return [normalize_key(str(column)) for column in pd.read_excel(spooled, nrows=0).columns]
 
     raise ExtractionError("Unsupported parser for file type in this phase")
 
 
+@dataclass
+class DateColumnResult:
+    values: list[Any]
+    format: str | None
+    failed_rows: list[int] = field(default_factory=list)
+
+
+def _parse_with_format(text: str, fmt: str) -> datetime:
+    if fmt == ISO_DATE_FORMAT:
+        return datetime.fromisoformat(text)
+    return datetime.strptime(text, fmt)
+
+
+def _parse_date_fallback(text: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        return date_parser.parse(text)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def infer_date_format(values: list[Any]) -> str | None:
+    sample = [str(v).strip() for v in values[:DATE_SAMPLE_SIZE] if v not in (None, "") and not isinstance(v, datetime)]
+    if not sample:
+        return None
+
+    best: tuple[str | None, int] = (None, 0)
+    for fmt in (ISO_DATE_FORMAT, *CANDIDATE_DATE_FORMATS):
+        parsed = 0
+        for text in sample:
+            try:
+                _parse_with_format(text, fmt)
+            except ValueError:
+                continue
+            parsed += 1
+        if parsed == len(sample):
+            return fmt
+        if parsed > best[1]:
+            best = (fmt, parsed)
+    return best[0]
+
+
+def parse_date_column(values: list[Any], fmt: str | None = None) -> DateColumnResult:
+    if fmt is None:
+        fmt = infer_date_format(values)
+    return _parse_date_values(values, fmt)
+
+
+def _parse_date_values(values: list[Any], fmt: str | None) -> DateColumnResult:
+    parsed_values: list[Any] = []
+    failed_rows: list[int] = []
+    memo: dict[str, str | None] = {}
+    for index, value in enumerate(values):
+        if value in (None, ""):
+            parsed_values.append(value)
+            continue
+        if isinstance(value, datetime):
+            parsed_values.append(value.isoformat())
+            continue
+
+        text = str(value).strip()
+        if text in memo:
+            result = memo[text]
+        else:
+            parsed: datetime | None = None
+            if fmt is not None:
+                try:
+                    parsed = _parse_with_format(text, fmt)
+                except ValueError:
+                    parsed = None
+            if parsed is None:
+                parsed = _parse_date_fallback(text)
+            result = parsed.isoformat() if parsed is not None else None
+            memo[text] = result
+
+        if result is None:
+            failed_rows.append(index + 1)
+        parsed_values.append(result)
+
+    return DateColumnResult(values=parsed_values, format=fmt, failed_rows=failed_rows)
+
+
+def infer_column_type(values: list[Any]) -> str:
+    present = [value for value in values if value not in (None, "")]
+    if not present:
+        return "empty"
+    if all(isinstance(value, bool) for value in present):
+        return "boolean"
+
+    texts = [str(value).strip() for value in present]
+    if all(text.lower() in BOOLEAN_VALUES for text in texts):
+        return "boolean"
+    if all(isinstance(value, int) or text.lstrip("+-").isdigit() for value, text in zip(present, texts)):
+        return "integer"
+    try:
+        for text in texts:
+            float(text.replace(",", ""))
+        return "number"
+    except ValueError:
+        pass
+    if all(isinstance(value, datetime) for value in present):
+        return "date"
+    fmt = infer_date_format(present)
+    if fmt is not None:
+        try:
+            for text in texts:
+                _parse_with_format(text, fmt)
+            return "date"
+        except ValueError:
+            pass
+    return "string"
+
+
+def infer_column_types(rows: list[dict[str, Any]]) -> dict[str, str]:
+    columns: dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return {column: infer_column_type([row.get(column) for row in rows]) for column in columns}
+
+
 def _apply_transform(value: Any, config: dict[str, Any]) -> Any:
     transform = config.get("transform")
     if value is None or value == "":
@@ -78,11 +397,10 @@ def _apply_transform(value: Any, config: dict[str, Any]) -> Any:
         return [item.strip() for item in str(value).split(separator) if item.strip()]
 
     if transform == "parse_date":
-        try:
-            parsed = date_parser.parse(str(value))
-            return parsed.isoformat()
-        except (ValueError, TypeError, OverflowError):
-            return None
+        if isinstance(value, datetime):
+            return value.isoformat()
+        parsed = _parse_date_fallback(str(value).strip())
+        return parsed.isoformat() if parsed is not None else None
 
     if transform == "parse_number":
         cleaned = str(value).replace(",", "").replace("$", "")
@@ -96,16 +414,97 @@ def _apply_transform(value: Any, config: dict[str, Any]) -> Any:
     return value
 
 
-def apply_mapping(
+def _canonical_default(value: Any) -> Any:
+    converted = to_jsonable(value)
+    return str(value) if converted is value else converted
+
+
+def canonical_record_bytes(record: dict[str, Any]) -> bytes:
+    return orjson.dumps(
+        record,
+        default=_canonical_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def record_content_hash(record: dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_record_bytes(record)).hexdigest()
+
+
+class ExtractionChecksum:
+    def __init__(self) -> None:
+        self._digest = hashlib.sha256()
+        self.count = 0
+
+    def add(self, record: dict[str, Any]) -> str:
+        content_hash = record_content_hash(record)
+        self.add_digest(bytes.fromhex(content_hash))
+        return content_hash
+
+    def add_digest(self, record_digest: bytes) -> None:
+        self._digest.update(record_digest)
+        self.count += 1
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    target: str
+    source: str | None
+    config: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class MappingPlan:
+    rules: tuple[FieldRule, ...]
+    date_fields: tuple[tuple[str, str], ...]
+
+
+@dataclass
+class MappedChunk:
+    records: list[dict[str, Any]]
+    row_warnings: list[dict[str, Any]]
+    date_failures: dict[str, list[int]]
+    valid_count: int
+
+
+def compile_mapping(mapping: dict[str, Any]) -> MappingPlan:
+    rules: list[FieldRule] = []
+    date_fields: list[tuple[str, str]] = []
+    for target_field, config in mapping.items():
+        if not isinstance(config, dict):
+            continue
+        source = normalize_key(config["source"]) if config.get("source") else None
+        rules.append(FieldRule(target=target_field, source=source, config=config))
+        if config.get("transform") == "parse_date" and source:
+            date_fields.append((target_field, source))
+    return MappingPlan(rules=tuple(rules), date_fields=tuple(date_fields))
+
+
+def infer_date_formats(rows: list[dict[str, Any]], plan: MappingPlan) -> dict[str, str | None]:
+    sample = rows[:DATE_SAMPLE_SIZE]
+    return {target: infer_date_format([row.get(source) for row in sample]) for target, source in plan.date_fields}
+
+
+def map_rows(
     rows: list[dict[str, Any]],
-    mapping: dict[str, Any],
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], float]:
-    extracted: list[dict[str, Any]] = []
-    warnings: list[dict[str, Any]] = []
+    plan: MappingPlan,
+    date_formats: dict[str, str | None],
+    with_hashes: bool = False,
+) -> MappedChunk:
+    records: list[dict[str, Any]] = []
+    row_warnings: list[dict[str, Any]] = []
 
     required_fields = {"identifier", "status"}
     valid_count = 0
 
+    date_columns = {
+        target: _parse_date_values([row.get(source) for row in rows], date_formats.get(target))
+        for target, source in plan.date_fields
+    }
+
     for index, row in enumerate(rows):
         normalized: dict[str, Any] = {
             "identifier": None,
@@ -123,29 +522,28 @@ def apply_mapping(
             "validation_messages": [],
         }
 
-        for target_field, config in mapping.items():
-            if not isinstance(config, dict):
-                continue
-
-            source = normalize_key(config.get("source", "")) if config.get("source") else None
-            value = row.get(source) if source else config.get("default")
-            transformed = _apply_transform(value, config)
+        for rule in plan.rules:
+            value = row.get(rule.source) if rule.source else rule.config.get("default")
+            if rule.target in date_columns and value not in (None, ""):
+                transformed = date_columns[rule.target].values[index]
+            else:
+                transformed = _apply_transform(value, rule.config)
 
-            if target_field.startswith("extended_attributes."):
-                extended_field = target_field.split(".", 1)[1]
+            if rule.target.startswith("extended_attributes."):
+                extended_field = rule.target.split(".", 1)[1]
                 normalized["extended_attributes"][extended_field] = transformed
                 continue
 
-            if target_field in normalized:
-                normalized[target_field] = transformed
+            if rule.target in normalized:
+                normalized[rule.target] = transformed
             else:
-                normalized["data"][target_field] = transformed
+                normalized["data"][rule.target] = transformed
 
         missing_required = [field for field in required_fields if not normalized.get(field)]
         if missing_required:
             normalized["validation_status"] = "warning"
             normalized["validation_messages"].append(f"Missing required fields: {', '.join(missing_required)}")
-            warnings.append(
+            row_warnings.append(
                 {
                     "row": index + 1,
                     "type": "missing_required",
@@ -155,18 +553,78 @@ def apply_mapping(
         else:
             valid_count += 1
 
-        extracted.append(normalized)
+        if with_hashes:
+            normalized["content_hash"] = record_content_hash(normalized)
+        records.append(normalized)
+
+    return MappedChunk(
+        records=records,
+        row_warnings=row_warnings,
+        date_failures={target: column.failed_rows for target, column in date_columns.items()},
+        valid_count=valid_count,
+    )
+
 
-    if not rows:
+def merge_mapped_chunks(
+    chunks: Iterable[MappedChunk],
+    plan: MappingPlan,
+    date_formats: dict[str, str | None],
+    checksum: ExtractionChecksum | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], float]:
+    extracted: list[dict[str, Any]] = []
+    warnings: list[dict[str, Any]] = []
+    date_failures: dict[str, list[int]] = {target: [] for target, _ in plan.date_fields}
+    valid_count = 0
+
+    for chunk in chunks:
+        offset = len(extracted)
+        if checksum is not None:
+            for record in chunk.records:
+                checksum.add_digest(bytes.fromhex(record["content_hash"]))
+        extracted.extend(chunk.records)
+        for warning in chunk.row_warnings:
+            warnings.append({**warning, "row": warning["row"] + offset})
+        for target, failed_rows in chunk.date_failures.items():
+            date_failures[target].extend(row + offset for row in failed_rows)
+        valid_count += chunk.valid_count
+
+    for target, source in plan.date_fields:
+        failed_rows = date_failures[target]
+        if failed_rows:
+            warnings.append(
+                {
+                    "type": "date_parse_failed",
+                    "field": target,
+                    "source": source,
+                    "format": date_formats.get(target),
+                    "count": len(failed_rows),
+                    "rows": failed_rows[:DATE_FAILURE_ROW_LIMIT],
+                }
+            )
+
+    if not extracted:
         return extracted, [{"type": "empty_file"}], 0.0
 
-    confidence = Decimal(valid_count / len(rows))
+    confidence = Decimal(valid_count / len(extracted))
     return extracted, warnings, float(round(confidence, 4))
 
 
-def compute_extraction_checksum(records: list[dict[str, Any]]) -> str:
-    payload = str(records).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+def apply_mapping(
+    rows: list[dict[str, Any]],
+    mapping: dict[str, Any],
+    checksum: ExtractionChecksum | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], float]:
+    plan = compile_mapping(mapping)
+    date_formats = infer_date_formats(rows, plan)
+    chunk = map_rows(rows, plan, date_formats, with_hashes=checksum is not None)
+    return merge_mapped_chunks([chunk], plan, date_formats, checksum=checksum)
+
+
+def compute_extraction_checksum(records: Iterable[dict[str, Any]]) -> str:
+    checksum = ExtractionChecksum()
+    for record in records:
+        checksum.add({key: value for key, value in record.items() if key != "content_hash"})
+    return checksum.hexdigest()
 
 
 def parse_iso_datetime(value: Any) -> datetime | None:
@@ -174,7 +632,4 @@ def parse_iso_datetime(value: Any) -> datetime | None:
         return None
     if isinstance(value, datetime):
         return value
-    try:
-        return date_parser.parse(str(value))
-    except (ValueError, TypeError):
-        return None
+    return _parse_date_fallback(str(value).strip())
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import Extraction, ExtractedRecord
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+NULL_CODE = -1
+NULL_TIMESTAMP = np.iinfo(np.int64).min
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+STRING_COLUMNS = (
+    "identifier",
+    "display_name",
+    "email",
+    "status",
+    "department",
+    "manager",
+    "account_type",
+    "validation_status",
+)
+JSON_COLUMNS = ("extended_attributes", "data", "validation_messages")
+PAYLOAD_STRING_COLUMNS = STRING_COLUMNS[:-1]
+PAYLOAD_JSON_COLUMNS = JSON_COLUMNS[:-1]
+SNAPSHOT_FIELDS = (
+    ExtractedRecord.id,
+    ExtractedRecord.record_index,
+    ExtractedRecord.last_activity,
+    ExtractedRecord.content_hash,
+    ExtractedRecord.roles,
+    *(getattr(ExtractedRecord, column) for column in (*STRING_COLUMNS, *JSON_COLUMNS)),
+)
+
+
+def snapshot_root() -> Path:
+    return Path(get_settings().file_storage_path) / "snapshots"
+
+
+def snapshot_path(extraction_id: uuid.UUID) -> Path:
+    return snapshot_root() / str(extraction_id)
+
+
+class _Dictionary:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _to_micros(value: datetime | None) -> int:
+    if value is None:
+        return NULL_TIMESTAMP
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def write_snapshot(path: Path, extraction_id: uuid.UUID, checksum: str | None, rows: list[Any]) -> Path:
+    count = len(rows)
+    ids = np.zeros((count, 16), dtype=np.uint8)
+    hashes = np.zeros((count, 32), dtype=np.uint8)
+    record_index = np.empty(count, dtype=np.int64)
+    last_activity = np.empty(count, dtype=np.int64)
+    strings = {column: (_Dictionary(), np.empty(count, dtype=np.int32)) for column in STRING_COLUMNS}
+    documents = {column: (_Dictionary(), np.empty(count, dtype=np.int32)) for column in JSON_COLUMNS}
+    role_dictionary = _Dictionary()
+    role_offsets = np.zeros(count + 1, dtype=np.int64)
+    role_codes: list[int] = []
+
+    for position, row in enumerate(rows):
+        mapping = row._mapping
+        ids[position] = np.frombuffer(mapping["id"].bytes, dtype=np.uint8)
+        if mapping["content_hash"]:
+            hashes[position] = np.frombuffer(bytes.fromhex(mapping["content_hash"]), dtype=np.uint8)
+        record_index[position] = mapping["record_index"]
+        last_activity[position] = _to_micros(mapping["last_activity"])
+        for column, (dictionary, codes) in strings.items():
+            codes[position] = dictionary.encode(mapping[column])
+        for column, (dictionary, codes) in documents.items():
+            value = mapping[column]
+            encoded = orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode() if value is not None else None
+            codes[position] = dictionary.encode(encoded)
+        role_codes.extend(role_dictionary.encode(str(role)) for role in mapping["roles"] or [])
+        role_offsets[position + 1] = len(role_codes)
+
+    root = path.parent
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=root, prefix=".tmp-"))
+    try:
+        arrays: dict[str, np.ndarray] = {
+            "id": ids,
+            "content_hash": hashes,
+            "record_index": record_index,
+            "last_activity": last_activity,
+            "role_offsets": role_offsets,
+            "role_codes": np.asarray(role_codes, dtype=np.int32),
+        }
+        dictionaries: dict[str, list[str]] = {"roles": role_dictionary.values}
+        for column, (dictionary, codes) in (*strings.items(), *documents.items()):
+            arrays[column] = codes
+            dictionaries[column] = dictionary.values
+
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array, allow_pickle=False)
+        (staging / "dictionaries.json").write_bytes(orjson.dumps(dictionaries))
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "extraction_id": str(extraction_id),
+            "checksum": checksum,
+            "record_count": count,
+        }
+        (staging / "manifest.json").write_bytes(orjson.dumps(manifest))
+
+        try:
+            os.replace(staging, path)
+        except OSError:
+            if not (path / "manifest.json").exists():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return path
+
+
+class ExtractionSnapshot:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.manifest = orjson.loads((path / "manifest.json").read_bytes())
+        self._dictionaries: dict[str, list[str]] = orjson.loads((path / "dictionaries.json").read_bytes())
+        self._arrays: dict[str, np.ndarray] = {}
+        # JSON values are decoded once per distinct value and shared between
+        # records, so payloads built from a snapshot must be treated as read-only.
+        self._decoded: dict[str, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return int(self.manifest["record_count"])
+
+    def column(self, name: str) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            array = self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+        return array
+
+    def _document(self, column: str, code: int) -> Any:
+        if code == NULL_CODE:
+            return None
+        decoded = self._decoded.get(column)
+        if decoded is None:
+            decoded = self._decoded[column] = [orjson.loads(value) for value in self._dictionaries[column]]
+        return decoded[code]
+
+    def positions_of(self, record_ids: Iterable[str]) -> list[int]:
+        wanted = np.array([uuid.UUID(str(record_id)).bytes for record_id in record_ids], dtype="S16")
+        if not len(wanted):
+            return []
+        stored = np.ascontiguousarray(self.column("id")).view("S16").ravel()
+        return np.flatnonzero(np.isin(stored, wanted)).tolist()
+
+    def iter_payloads(self, positions: Iterable[int] | None = None) -> Iterator[tuple[int, dict[str, Any]]]:
+        ids = self.column("id")
+        record_index = self.column("record_index")
+        last_activity = self.column("last_activity")
+        role_offsets = self.column("role_offsets")
+        role_codes = self.column("role_codes")
+        roles = self._dictionaries["roles"]
+        strings = {column: (self.column(column), self._dictionaries[column]) for column in PAYLOAD_STRING_COLUMNS}
+        documents = {column: self.column(column) for column in PAYLOAD_JSON_COLUMNS}
+
+        for position in positions if positions is not None else range(len(self)):
+            payload: dict[str, Any] = {"id": str(uuid.UUID(bytes=ids[position].tobytes()))}
+            for column, (codes, values) in strings.items():
+                code = int(codes[position])
+                payload[column] = values[code] if code != NULL_CODE else None
+            micros = int(last_activity[position])
+            payload["last_activity"] = EPOCH + timedelta(microseconds=micros) if micros != NULL_TIMESTAMP else None
+            start, end = int(role_offsets[position]), int(role_offsets[position + 1])
+            payload["roles"] = [roles[code] for code in role_codes[start:end].tolist()]
+            for column, codes in documents.items():
+                payload[column] = self._document(column, int(codes[position])) or {}
+            yield int(record_index[position]), payload
+
+
+def open_snapshot(extraction: Extraction) -> ExtractionSnapshot | None:
+    path = snapshot_path(extraction.id)
+    try:
+        snapshot = ExtractionSnapshot(path)
+    except (OSError, ValueError):
+        return None
+    manifest = snapshot.manifest
+    if (
+        manifest.get("version") != SNAPSHOT_VERSION
+        or manifest.get("checksum") != extraction.checksum
+        or manifest.get("record_count") != extraction.record_count
+    ):
+        return None
+    return snapshot
+
+
+async def build_snapshot(db: AsyncSession, extraction: Extraction) -> Path:
+    result = await db.execute(
+        select(*SNAPSHOT_FIELDS)
+        .where(ExtractedRecord.extraction_id == extraction.id)
+        .order_by(ExtractedRecord.record_index.asc())
+    )
+    rows = result.all()
+    return await asyncio.to_thread(write_snapshot, snapshot_path(extraction.id), extraction.id, extraction.checksum, rows)
+
+
+def _record_payload(record: ExtractedRecord) -> dict[str, Any]:
+    return {
+        "id": str(record.id),
+        "identifier": record.identifier,
+        "display_name": record.display_name,
+        "email": record.email,
+        "status": record.status,
+        "last_activity": record.last_activity,
+        "department": record.department,
+        "manager": record.manager,
+        "account_type": record.account_type,
+        "roles": record.roles or [],
+        "extended_attributes": record.extended_attributes or {},
+        "data": record.data or {},
+    }
+
+
+async def load_record_payloads(db: AsyncSession, extractions: list[Extraction]) -> list[dict[str, Any]]:
+    sources: list[Iterable[tuple[int, dict[str, Any]]]] = []
+    fallback_ids: list[uuid.UUID] = []
+    for extraction in extractions:
+        snapshot = open_snapshot(extraction)
+        if snapshot is not None:
+            sources.append(snapshot.iter_payloads())
+        else:
+            fallback_ids.append(extraction.id)
+
+    if fallback_ids:
+        rows_result = await db.execute(
+            select(ExtractedRecord)
+            .where(ExtractedRecord.extraction_id.in_(fallback_ids))
+            .order_by(ExtractedRecord.record_index.asc())
+        )
+        sources.append((record.record_index, _record_payload(record)) for record in rows_result.scalars().all())
+
+    return [payload for _, payload in heapq.merge(*sources, key=lambda item: item[0])]
+
+
+async def load_payloads_by_id(
+    db: AsyncSession,
+    extractions: list[Extraction],
+    record_ids: list[str],
+) -> list[dict[str, Any]]:
+    payloads: list[dict[str, Any]] = []
+    remaining = set(record_ids)
+    for extraction in extractions:
+        snapshot = open_snapshot(extraction)
+        if snapshot is None or not remaining:
+            continue
+        for _, payload in snapshot.iter_payloads(snapshot.positions_of(remaining)):
+            payloads.append(payload)
+            remaining.discard(payload["id"])
+
+    if remaining:
+        rows_result = await db.execute(
+            select(ExtractedRecord).where(ExtractedRecord.id.in_([uuid.UUID(record_id) for record_id in remaining]))
+        )
+        payloads.extend(_record_payload(record) for record in rows_result.scalars().all())
+    return payloads
+
+
+async def snapshot_extraction_job(extraction_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as db:
+        extraction = await db.get(Extraction, extraction_id)
+        if extraction is None or open_snapshot(extraction) is not None:
+            return
+        path = await build_snapshot(db, extraction)
+        logger.info("Extraction snapshot written", extra={"extraction_id": str(extraction_id), "path": str(path)})
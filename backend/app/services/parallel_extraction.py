@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import csv
+import multiprocessing
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+from app.services.extraction_service import (
+    DATE_SAMPLE_SIZE,
+    DetectedEncoding,
+    ExtractionChecksum,
+    MappedChunk,
+    MappingPlan,
+    _iter_text_lines,
+    compile_mapping,
+    infer_date_formats,
+    iter_csv_rows,
+    map_rows,
+    merge_mapped_chunks,
+    sniff_encoding,
+)
+
+SCAN_BLOCK_SIZE = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+RANGES_PER_WORKER = 4
+# A quote with an ordinary character on both sides is neither an opening,
+# closing nor escaped ("") quote, so quote parity no longer tracks records.
+STRAY_QUOTE = re.compile(rb'[^,\r\n"]"[^,\r\n"]')
+
+
+class AmbiguousCsvSplitError(ValueError):
+    pass
+
+
+def extraction_workers() -> int:
+    configured = get_settings().extraction_workers
+    return configured if configured > 0 else os.cpu_count() or 1
+
+
+@lru_cache
+def get_extraction_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=extraction_workers(), mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_extraction_executor() -> None:
+    if get_extraction_executor.cache_info().currsize:
+        get_extraction_executor().shutdown(cancel_futures=True)
+        get_extraction_executor.cache_clear()
+
+
+def should_extract_in_parallel(
+    filename: str,
+    file_size: int | None,
+    local_path: Path | None,
+    encoding: DetectedEncoding | None = None,
+) -> bool:
+    if local_path is None or Path(filename).suffix.lower() != ".csv":
+        return False
+    if encoding is not None and not encoding.byte_splittable:
+        return False
+    min_bytes = get_settings().parallel_extraction_min_mb * 1024 * 1024
+    return (file_size or 0) >= min_bytes and extraction_workers() > 1
+
+
+def find_record_boundaries(path: Path, targets: list[int]) -> list[int]:
+    # A newline ends a CSV record only when an even number of quote characters
+    # precede it; escaped quotes ("") come in pairs and never flip the parity.
+    # A stray quote inside an unquoted field breaks that, so it aborts the split.
+    pending = sorted(targets)
+    boundaries: list[int] = []
+    quotes = 0
+    offset = 0
+    with path.open("rb") as handle:
+        while pending and (block := handle.read(SCAN_BLOCK_SIZE)):
+            if stray := STRAY_QUOTE.search(block):
+                raise AmbiguousCsvSplitError(f"Stray quote at byte {offset + stray.start() + 1}")
+            cursor = 0
+            prefix_quotes = quotes
+            search_from = 0
+            while pending and pending[0] < offset + len(block):
+                newline = block.find(b"\n", max(pending[0] - offset, search_from))
+                if newline == -1:
+                    break
+                prefix_quotes += block.count(b'"', cursor, newline)
+                cursor = newline
+                search_from = newline + 1
+                if prefix_quotes % 2 == 0:
+                    boundary = offset + newline + 1
+                    boundaries.append(boundary)
+                    while pending and pending[0] < boundary:
+                        pending.pop(0)
+            quotes = prefix_quotes + block.count(b'"', cursor)
+            offset += len(block)
+    return boundaries
+
+
+def split_csv_ranges(path: Path, parts: int) -> tuple[int, list[tuple[int, int]]]:
+    size = path.stat().st_size
+    targets = [0, *(size * index // parts for index in range(1, parts))]
+    boundaries = find_record_boundaries(path, targets)
+    if not boundaries:
+        return size, []
+
+    header_end = boundaries[0]
+    edges = [header_end, *(boundary for boundary in boundaries[1:] if header_end < boundary < size), size]
+    ranges = [(start, end) for start, end in zip(edges, edges[1:]) if start < end]
+    return header_end, ranges
+
+
+def _check_range_starts(
+    path: Path, ranges: list[tuple[int, int]], width: int, encoding: str
+) -> None:
+    # Quote parity can still be fooled by a stray quote closing an unquoted
+    # field, which lands a boundary inside a record; the first record of each
+    # range then parses to the wrong number of fields.
+    for start, end in ranges:
+        first = next(csv.reader(_iter_text_lines(_read_range(path, start, end), encoding)), None)
+        if first is None or len(first) != width:
+            raise AmbiguousCsvSplitError(f"Range at byte {start} does not start on a record")
+
+
+def _read_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = handle.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _map_csv_range(
+    path: Path,
+    start: int,
+    end: int,
+    fieldnames: list[str],
+    plan: MappingPlan,
+    date_formats: dict[str, str | None],
+    encoding: str,
+) -> MappedChunk:
+    rows = list(iter_csv_rows(_read_range(path, start, end), fieldnames=fieldnames, encoding=encoding))
+    return map_rows(rows, plan, date_formats, with_hashes=True)
+
+
+def extract_csv_parallel(
+    path: Path,
+    mapping: dict[str, Any],
+    *,
+    checksum: ExtractionChecksum | None = None,
+    executor: Executor | None = None,
+    parts: int | None = None,
+    encoding: str | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], float]:
+    executor = executor or get_extraction_executor()
+    plan = compile_mapping(mapping)
+    # Ranges start mid-file, so they cannot sniff on their own; every range
+    # decodes with the encoding detected from the head of the file.
+    encoding = encoding or sniff_encoding(_read_range(path, 0, path.stat().st_size)).encoding
+
+    header_end, ranges = split_csv_ranges(path, parts or extraction_workers() * RANGES_PER_WORKER)
+    fieldnames = next(csv.reader(_iter_text_lines(_read_range(path, 0, header_end), encoding)), [])
+    _check_range_starts(path, ranges, len(fieldnames), encoding)
+
+    # Date formats are inferred from the head of the file exactly as the serial
+    # path does, so every range parses dates with the same format.
+    sample = list(islice(iter_csv_rows(_read_range(path, 0, path.stat().st_size), encoding=encoding), DATE_SAMPLE_SIZE))
+    date_formats = infer_date_formats(sample, plan)
+
+    futures = [
+        executor.submit(_map_csv_range, path, start, end, fieldnames, plan, date_formats, encoding)
+        for start, end in ranges
+    ]
+    return merge_mapped_chunks((future.result() for future in futures), plan, date_formats, checksum=checksum)
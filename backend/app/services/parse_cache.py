@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from app.core.config import get_settings
+from app.services.extraction_service import (
+    DetectedEncoding,
+    iter_rows_from_stream,
+    load_rows_from_stream,
+    read_header,
+    sniff_encoding,
+)
+from app.services.storage import get_storage_backend
+
+PARSER_VERSION = 2
+
+
+def parse_cache_key(file_hash: str, filename: str) -> str:
+    options = f"{file_hash}:{Path(filename).suffix.lower()}:v{PARSER_VERSION}"
+    return hashlib.sha256(options.encode("utf-8")).hexdigest()
+
+
+def _encode_rows(rows: list[dict[str, Any]]) -> bytes:
+    columns = list(rows[0].keys()) if rows else []
+    lines = [orjson.dumps(columns)]
+    for row in rows:
+        if list(row.keys()) == columns:
+            lines.append(orjson.dumps(list(row.values())))
+        else:
+            lines.append(orjson.dumps(row))
+    return b"\n".join(lines)
+
+
+def _decode_rows(lines: Iterator[bytes], limit: int | None = None) -> list[dict[str, Any]]:
+    columns = orjson.loads(next(lines))
+    rows: list[dict[str, Any]] = []
+    for line in islice(lines, limit):
+        values = orjson.loads(line)
+        rows.append(dict(zip(columns, values)) if isinstance(values, list) else values)
+    return rows
+
+
+class ParsedDocumentCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.rows.gz"
+
+    def get(self, key: str, limit: int | None = None) -> list[dict[str, Any]] | None:
+        # Rows are one JSON line each, so a preview only decompresses and
+        # decodes as far as its first `limit` rows.
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as handle:
+                rows = _decode_rows(iter(handle), limit)
+        except (OSError, EOFError, StopIteration, orjson.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return rows
+
+    def put(self, key: str, rows: list[dict[str, Any]]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = gzip.compress(_encode_rows(rows), compresslevel=1)
+        if len(payload) > self.max_bytes:
+            return
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.root.glob("*.rows.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+@lru_cache
+def get_parse_cache() -> ParsedDocumentCache:
+    settings = get_settings()
+    return ParsedDocumentCache(
+        Path(settings.file_storage_path) / "parse-cache",
+        settings.parse_cache_max_mb * 1024 * 1024,
+    )
+
+
+def read_stored_header(filename: str, storage_key: str) -> list[str]:
+    stream = get_storage_backend().open_stream(storage_key)
+    try:
+        return read_header(filename, stream)
+    finally:
+        stream.close()
+
+
+def read_stored_encoding(filename: str, storage_key: str) -> DetectedEncoding | None:
+    if Path(filename).suffix.lower() != ".csv":
+        return None
+    stream = get_storage_backend().open_stream(storage_key)
+    try:
+        return sniff_encoding(stream)
+    finally:
+        stream.close()
+
+
+def read_stored_rows(filename: str, file_hash: str, storage_key: str, limit: int) -> list[dict[str, Any]]:
+    rows = get_parse_cache().get(parse_cache_key(file_hash, filename), limit=limit)
+    if rows is not None:
+        return rows
+
+    stream = get_storage_backend().open_stream(storage_key)
+    try:
+        return list(iter_rows_from_stream(filename, stream, limit=limit))
+    finally:
+        stream.close()
+
+
+def load_rows_cached(filename: str, file_hash: str, storage_key: str) -> list[dict[str, Any]]:
+    cache = get_parse_cache()
+    key = parse_cache_key(file_hash, filename)
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+
+    stream = get_storage_backend().open_stream(storage_key)
+    try:
+        rows = load_rows_from_stream(filename, stream)
+    finally:
+        stream.close()
+    cache.put(key, rows)
+    return rows
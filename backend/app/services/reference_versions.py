@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models import ReferenceDataset, ReferenceRecord
+from app.services.delta_service import delta_key
+from app.services.extraction_service import record_content_hash
+
+HASHED_FIELDS = ("identifier", "display_name", "email", "employment_status", "department")
+INDEX_FETCH_BATCH_SIZE = 5000
+
+
+def reference_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "identifier": row.get("employee_id") or row.get("identifier") or row.get("userid"),
+        "display_name": row.get("name") or row.get("display_name") or row.get("username"),
+        "email": (row.get("email") or "").lower() if row.get("email") else None,
+        "employment_status": (row.get("status") or row.get("employment_status") or "").lower() or None,
+        "department": row.get("department"),
+    }
+
+
+def reference_content_hash(values: dict[str, Any]) -> str:
+    return record_content_hash({name: values.get(name) for name in HASHED_FIELDS})
+
+
+def index_root() -> Path:
+    return Path(get_settings().file_storage_path) / "reference-index"
+
+
+def _index_path(dataset_id: uuid.UUID) -> Path:
+    return index_root() / f"{dataset_id}.npy"
+
+
+def _write_index(dataset_id: uuid.UUID, record_ids: list[uuid.UUID]) -> None:
+    ids = np.frombuffer(b"".join(record_id.bytes for record_id in record_ids), dtype=np.uint8).reshape(-1, 16)
+    root = index_root()
+    root.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=root, suffix=".part")
+    with os.fdopen(fd, "wb") as handle:
+        np.save(handle, ids, allow_pickle=False)
+    os.replace(name, _index_path(dataset_id))
+
+
+def _read_index(dataset: ReferenceDataset) -> list[uuid.UUID] | None:
+    try:
+        ids = np.load(_index_path(dataset.id), mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if ids.shape != (dataset.record_count, 16):
+        return None
+    return [uuid.UUID(bytes=row.tobytes()) for row in ids]
+
+
+async def version_chain(db: AsyncSession, dataset: ReferenceDataset) -> list[ReferenceDataset]:
+    if dataset.lineage_id is None:
+        return [dataset]
+    result = await db.execute(
+        select(ReferenceDataset).where(
+            (ReferenceDataset.lineage_id == dataset.lineage_id) | (ReferenceDataset.id == dataset.lineage_id)
+        )
+    )
+    by_id = {item.id: item for item in result.scalars().all()}
+    chain = [dataset]
+    while chain[-1].storage_mode == "delta" and chain[-1].previous_version_id in by_id:
+        chain.append(by_id[chain[-1].previous_version_id])
+    chain.reverse()
+    return chain
+
+
+def _replay(chain: list[ReferenceDataset], records: Iterable[ReferenceRecord]) -> OrderedDict[str, ReferenceRecord]:
+    # Slots are keyed by the normalised identifier/email; records without a
+    # usable key (or repeating one) get a private slot and never carry over.
+    by_dataset: dict[uuid.UUID, list[ReferenceRecord]] = {item.id: [] for item in chain}
+    for record in records:
+        by_dataset[record.dataset_id].append(record)
+
+    live: OrderedDict[str, ReferenceRecord] = OrderedDict()
+    for version in chain:
+        version_records = sorted(by_dataset[version.id], key=lambda item: item.record_index)
+        if version.storage_mode != "delta":
+            live = OrderedDict()
+            for record in version_records:
+                key = record.record_key or delta_key(record.identifier, record.email)
+                live[key if key is not None and key not in live else f"#{record.id}"] = record
+            continue
+
+        live = OrderedDict((key, record) for key, record in live.items() if not key.startswith("#"))
+        for record in version_records:
+            if record.change_type == "removed":
+                live.pop(record.record_key, None)
+            else:
+                live[record.record_key or f"#{record.id}"] = record
+    return live
+
+
+async def _chain_records(db: AsyncSession, chain: list[ReferenceDataset]) -> list[ReferenceRecord]:
+    result = await db.execute(
+        select(ReferenceRecord).where(ReferenceRecord.dataset_id.in_([item.id for item in chain]))
+    )
+    return list(result.scalars().all())
+
+
+async def materialize_version(db: AsyncSession, dataset: ReferenceDataset) -> OrderedDict[str, ReferenceRecord]:
+    chain = await version_chain(db, dataset)
+    return _replay(chain, await _chain_records(db, chain))
+
+
+def _stored_hash(record: ReferenceRecord) -> str:
+    return record.content_hash or reference_content_hash({name: getattr(record, name) for name in HASHED_FIELDS})
+
+
+class PriorRecord(NamedTuple):
+    id: uuid.UUID
+    record_key: str | None
+    content_hash: str
+
+
+async def previous_version_state(db: AsyncSession, dataset: ReferenceDataset) -> OrderedDict[str, PriorRecord]:
+    # Planning a new version only needs each live row's key and hash. The
+    # index file names the live rows, so just those columns are fetched; a
+    # missing or stale index, or rows stored before hashes were, fall back to
+    # replaying the chain.
+    record_ids = await asyncio.to_thread(_read_index, dataset)
+    if record_ids is not None:
+        by_id: dict[uuid.UUID, PriorRecord] = {}
+        for offset in range(0, len(record_ids), INDEX_FETCH_BATCH_SIZE):
+            result = await db.execute(
+                select(ReferenceRecord.id, ReferenceRecord.record_key, ReferenceRecord.content_hash).where(
+                    ReferenceRecord.id.in_(record_ids[offset : offset + INDEX_FETCH_BATCH_SIZE])
+                )
+            )
+            by_id.update((row.id, PriorRecord(*row)) for row in result)
+        if len(by_id) == len(record_ids) and all(prior.content_hash for prior in by_id.values()):
+            state: OrderedDict[str, PriorRecord] = OrderedDict()
+            for record_id in record_ids:
+                prior = by_id[record_id]
+                key = prior.record_key
+                state[key if key is not None and key not in state else f"#{prior.id}"] = prior
+            return state
+
+    live = await materialize_version(db, dataset)
+    return OrderedDict(
+        (key, PriorRecord(record.id, record.record_key, _stored_hash(record))) for key, record in live.items()
+    )
+
+
+async def load_reference_records(
+    db: AsyncSession, dataset: ReferenceDataset, limit: int | None = None
+) -> list[ReferenceRecord]:
+    # With an index file only the rows it lists are fetched, in batches small
+    # enough for any driver's bind-parameter limit. A missing or stale index
+    # falls back to replaying the chain, which also rewrites the index.
+    record_ids = await asyncio.to_thread(_read_index, dataset)
+    if record_ids is not None:
+        wanted = record_ids[:limit]
+        by_id: dict[uuid.UUID, ReferenceRecord] = {}
+        for offset in range(0, len(wanted), INDEX_FETCH_BATCH_SIZE):
+            result = await db.execute(
+                select(ReferenceRecord).where(ReferenceRecord.id.in_(wanted[offset : offset + INDEX_FETCH_BATCH_SIZE]))
+            )
+            by_id.update((record.id, record) for record in result.scalars().all())
+        if len(by_id) == len(wanted):
+            return [by_id[record_id] for record_id in wanted]
+
+    chain = await version_chain(db, dataset)
+    records = list(_replay(chain, await _chain_records(db, chain)).values())
+    await asyncio.to_thread(_write_index, dataset.id, [record.id for record in records])
+    return records[:limit]
+
+
+@dataclass
+class VersionPlan:
+    storage_mode: str
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    live_ids: list[uuid.UUID] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    removed: dict[uuid.UUID, dict[str, Any]] = field(default_factory=dict)
+
+
+def plan_version(
+    source_rows: Iterable[dict[str, Any]],
+    previous: OrderedDict[str, PriorRecord] | None,
+    full: bool = False,
+) -> VersionPlan:
+    full = full or previous is None
+    plan = VersionPlan(storage_mode="full" if full else "delta")
+    counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    carried = {key: record for key, record in (previous or {}).items() if not key.startswith("#")}
+    live: OrderedDict[str, uuid.UUID] = OrderedDict()
+    if not full:
+        live = OrderedDict((key, record.id) for key, record in carried.items())
+
+    def emit(values: dict[str, Any], key: str | None, change_type: str, content_hash: str | None) -> uuid.UUID:
+        record_id = uuid.uuid4()
+        plan.rows.append(
+            {
+                **values,
+                "id": record_id,
+                "record_index": len(plan.rows) + 1,
+                "record_key": key,
+                "content_hash": content_hash,
+                "change_type": "full" if full else change_type,
+            }
+        )
+        return record_id
+
+    seen: set[str] = set()
+    for source in source_rows:
+        values = reference_row(source)
+        key = delta_key(values["identifier"], values["email"])
+        content_hash = reference_content_hash(values)
+        if key is None or key in seen:
+            record_id = emit(values, None, "added", content_hash)
+            live[f"#{record_id}"] = record_id
+            counts["added"] += 1
+            continue
+        seen.add(key)
+
+        prior = carried.get(key)
+        if prior is None:
+            change_type = "added"
+        elif prior.content_hash != content_hash:
+            change_type = "changed"
+        else:
+            change_type = "unchanged"
+        counts[change_type] += 1
+
+        if full or change_type != "unchanged":
+            live[key] = emit(values, key, change_type, content_hash)
+
+    for key, prior in carried.items():
+        if key in seen:
+            continue
+        counts["removed"] += 1
+        if not full:
+            emit(dict.fromkeys(HASHED_FIELDS), key, "removed", None)
+            plan.removed[prior.id] = plan.rows[-1]
+            live.pop(key)
+
+    plan.live_ids = list(live.values())
+    plan.counts = counts
+    return plan
+
+
+async def label_removed_rows(db: AsyncSession, plan: VersionPlan) -> None:
+    # Tombstones keep the identifier and email of the row they remove; only
+    # the removed rows are looked up.
+    prior_ids = list(plan.removed)
+    for offset in range(0, len(prior_ids), INDEX_FETCH_BATCH_SIZE):
+        result = await db.execute(
+            select(ReferenceRecord.id, ReferenceRecord.identifier, ReferenceRecord.email).where(
+                ReferenceRecord.id.in_(prior_ids[offset : offset + INDEX_FETCH_BATCH_SIZE])
+            )
+        )
+        for record_id, identifier, email in result:
+            plan.removed[record_id].update(identifier=identifier, email=email)
+
+
+async def resolve_previous_version(
+    db: AsyncSession,
+    name: str,
+    data_type: str,
+    previous_version_id: uuid.UUID | None,
+) -> ReferenceDataset | None:
+    query = select(ReferenceDataset).where(ReferenceDataset.is_active.is_(True))
+    if previous_version_id is not None:
+        query = query.where(ReferenceDataset.id == previous_version_id)
+    else:
+        query = query.where(ReferenceDataset.name == name, ReferenceDataset.data_type == data_type).order_by(
+            ReferenceDataset.uploaded_at.desc(), ReferenceDataset.version_number.desc()
+        )
+    result = await db.execute(query.limit(1))
+    return result.scalar_one_or_none()
+
+
+async def lock_previous_version(
+    db: AsyncSession,
+    name: str,
+    data_type: str,
+    previous_version_id: uuid.UUID | None,
+) -> ReferenceDataset | None:
+    # Uploads to one lineage are serialised on its root row. The previous
+    # version is then resolved again, so a queued upload builds on whatever
+    # the upload ahead of it committed instead of forking the lineage.
+    previous = await resolve_previous_version(db, name, data_type, previous_version_id)
+    if previous is None:
+        return None
+    await db.execute(
+        select(ReferenceDataset.id).where(ReferenceDataset.id == (previous.lineage_id or previous.id)).with_for_update()
+    )
+    return await resolve_previous_version(db, name, data_type, previous_version_id)
+
+
+async def next_version_number(db: AsyncSession, previous: ReferenceDataset) -> int:
+    # Numbered after the newest version in the lineage, not the previous
+    # one, so branching from an older or deactivated version cannot collide.
+    lineage_id = previous.lineage_id or previous.id
+    latest = await db.scalar(
+        select(func.max(ReferenceDataset.version_number)).where(
+            (ReferenceDataset.lineage_id == lineage_id) | (ReferenceDataset.id == lineage_id)
+        )
+    )
+    return (latest or previous.version_number) + 1
+
+
+async def delta_chain_length(db: AsyncSession, dataset: ReferenceDataset) -> int:
+    chain = await version_chain(db, dataset)
+    return sum(1 for item in chain if item.storage_mode == "delta")
+
+
+async def write_version_index(dataset_id: uuid.UUID, record_ids: list[uuid.UUID]) -> None:
+    await asyncio.to_thread(_write_index, dataset_id, record_ids)
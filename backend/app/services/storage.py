@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from jose import JWTError, jwt
+
+from app.core.config import get_settings
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TOKEN_PURPOSE = "storage_download"
+
+
+class StorageError(Exception):
+    pass
+
+
+class StorageObjectNotFound(StorageError):
+    pass
+
+
+def content_disposition(filename: str) -> str:
+    # The quoted filename only carries printable ASCII without quotes or
+    # backslashes; the full UTF-8 name goes in the RFC 5987 parameter.
+    name = "".join(char for char in filename if char.isprintable()).strip() or "download"
+    fallback = "".join(char if char.isascii() and char not in '"\\' else "_" for char in name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+def create_download_token(key: str, filename: str, ttl_seconds: int) -> tuple[str, datetime]:
+    expires_at = datetime.now(UTC) + timedelta(seconds=ttl_seconds)
+    payload = {
+        "purpose": DOWNLOAD_TOKEN_PURPOSE,
+        "key": key,
+        "filename": filename,
+        "exp": int(expires_at.timestamp()),
+    }
+    return jwt.encode(payload, get_settings().secret_key, algorithm="HS256"), expires_at
+
+
+def decode_download_token(token: str) -> dict[str, Any]:
+    try:
+        payload = jwt.decode(token, get_settings().secret_key, algorithms=["HS256"])
+    except JWTError as exc:
+        raise StorageError("Invalid download token") from exc
+    if payload.get("purpose") != DOWNLOAD_TOKEN_PURPOSE or "key" not in payload:
+        raise StorageError("Invalid download token")
+    return payload
+
+
+class StorageBackend(ABC):
+    name: str
+
+    @abstractmethod
+    async def put_file(self, key: str, source: Path) -> None: ...
+
+    @abstractmethod
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int: ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def size(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def open_stream(self, key: str, start: int = 0, end: int | None = None) -> Iterator[bytes]: ...
+
+    def local_path(self, key: str) -> Path | None:
+        return None
+
+    async def iter_bytes(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        stream = await asyncio.to_thread(self.open_stream, key, start, end)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, stream, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(stream.close)
+
+    async def read_range(self, key: str, start: int, end: int) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_bytes(key, start, end)])
+
+    async def create_download_url(self, key: str, filename: str, ttl_seconds: int) -> tuple[str, datetime]:
+        token, expires_at = create_download_token(key, filename, ttl_seconds)
+        return f"{get_settings().api_prefix}/storage/download?token={quote(token)}", expires_at
+
+
+class LocalStorageBackend(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _resolve(self, key: str) -> Path:
+        path = Path(key)
+        if path.is_absolute():
+            return path
+        candidate = self.root / path
+        if not candidate.exists() and path.exists():
+            return path
+        return candidate
+
+    def local_path(self, key: str) -> Path | None:
+        return self._resolve(key)
+
+    def _put_file(self, key: str, source: Path) -> None:
+        destination = self.root / key
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(source, destination)
+        except OSError:
+            shutil.move(str(source), destination)
+
+    async def put_file(self, key: str, source: Path) -> None:
+        await asyncio.to_thread(self._put_file, key, source)
+
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        destination = self.root / key
+        temp_path = destination.with_name(f"{destination.name}.part")
+        await asyncio.to_thread(destination.parent.mkdir, parents=True, exist_ok=True)
+        handle = await asyncio.to_thread(temp_path.open, "wb")
+        written = 0
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+                written += len(chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(os.replace, temp_path, destination)
+        return written
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._resolve(key).exists)
+
+    async def size(self, key: str) -> int:
+        try:
+            stat = await asyncio.to_thread(self._resolve(key).stat)
+        except FileNotFoundError as exc:
+            raise StorageObjectNotFound(key) from exc
+        return stat.st_size
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._resolve(key).unlink, missing_ok=True)
+
+    def open_stream(self, key: str, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        try:
+            handle = self._resolve(key).open("rb")
+        except FileNotFoundError as exc:
+            raise StorageObjectNotFound(key) from exc
+        return self._read_file(handle, start, end)
+
+    @staticmethod
+    def _read_file(handle: Any, start: int, end: int | None) -> Iterator[bytes]:
+        with handle:
+            handle.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining)
+                chunk = handle.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+
+class S3StorageBackend(StorageBackend):
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region_name: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        client: Any = None,
+    ) -> None:
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region_name,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+            )
+        self.client = client
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _is_missing(self, exc: Exception) -> bool:
+        error = getattr(exc, "response", {}).get("Error", {})
+        return error.get("Code") in {"404", "NoSuchKey", "NotFound"}
+
+    def _put_file(self, key: str, source: Path) -> None:
+        self.client.upload_file(str(source), self.bucket, self._object_key(key))
+        source.unlink(missing_ok=True)
+
+    async def put_file(self, key: str, source: Path) -> None:
+        await asyncio.to_thread(self._put_file, key, source)
+
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        object_key = self._object_key(key)
+        upload = await asyncio.to_thread(self.client.create_multipart_upload, Bucket=self.bucket, Key=object_key)
+        upload_id = upload["UploadId"]
+        parts: list[dict[str, Any]] = []
+        buffer = bytearray()
+        written = 0
+
+        async def flush_part() -> None:
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=bytes(buffer),
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                written += len(chunk)
+                if len(buffer) >= 8 * STREAM_CHUNK_SIZE:
+                    await flush_part()
+            if buffer or not parts:
+                await flush_part()
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload, Bucket=self.bucket, Key=object_key, UploadId=upload_id
+            )
+            raise
+        return written
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self._object_key(key))
+        except Exception as exc:
+            if self._is_missing(exc):
+                return False
+            raise
+        return True
+
+    async def size(self, key: str) -> int:
+        try:
+            head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self._object_key(key))
+        except Exception as exc:
+            if self._is_missing(exc):
+                raise StorageObjectNotFound(key) from exc
+            raise
+        return int(head["ContentLength"])
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key))
+
+    def open_stream(self, key: str, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            response = self.client.get_object(**params)
+        except Exception as exc:
+            if self._is_missing(exc):
+                raise StorageObjectNotFound(key) from exc
+            raise
+        return self._read_body(response["Body"])
+
+    @staticmethod
+    def _read_body(body: Any) -> Iterator[bytes]:
+        try:
+            yield from body.iter_chunks(STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    async def create_download_url(self, key: str, filename: str, ttl_seconds: int) -> tuple[str, datetime]:
+        url = await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._object_key(key),
+                "ResponseContentDisposition": content_disposition(filename),
+            },
+            ExpiresIn=ttl_seconds,
+        )
+        return url, datetime.now(UTC) + timedelta(seconds=ttl_seconds)
+
+
+@lru_cache
+def get_storage_backend() -> StorageBackend:
+    settings = get_settings()
+    if settings.storage_backend == "s3":
+        if not settings.s3_bucket:
+            raise StorageError("S3_BUCKET must be set when STORAGE_BACKEND=s3")
+        return S3StorageBackend(
+            settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            endpoint_url=settings.s3_endpoint_url,
+            region_name=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+        )
+    return LocalStorageBackend(Path(settings.file_storage_path))
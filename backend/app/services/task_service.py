@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskState:
+    id: str
+    type: str
+    status: str = "pending"
+    progress: int = 0
+    message: str | None = None
+    review_id: str | None = None
+    group_id: str | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    error_message: str | None = None
+    result: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["started_at"] = self.started_at.isoformat() if self.started_at else None
+        payload["completed_at"] = self.completed_at.isoformat() if self.completed_at else None
+        return payload
+
+
+class TaskRegistry:
+    def __init__(self, max_tasks: int = 1000) -> None:
+        self._tasks: dict[str, TaskState] = {}
+        self._max_tasks = max_tasks
+
+    def create(
+        self,
+        task_type: str,
+        review_id: uuid.UUID | str | None = None,
+        group_id: str | None = None,
+    ) -> TaskState:
+        task = TaskState(
+            id=str(uuid.uuid4()),
+            type=task_type,
+            review_id=str(review_id) if review_id else None,
+            group_id=group_id,
+        )
+        self._tasks[task.id] = task
+        self._evict()
+        return task
+
+    def get(self, task_id: str) -> TaskState | None:
+        return self._tasks.get(task_id)
+
+    def list_for_review(self, review_id: uuid.UUID | str) -> list[TaskState]:
+        return [task for task in self._tasks.values() if task.review_id == str(review_id)]
+
+    def list_for_group(self, group_id: str) -> list[TaskState]:
+        return [task for task in self._tasks.values() if task.group_id == group_id]
+
+    def start(self, task: TaskState, message: str | None = None) -> None:
+        task.status = "processing"
+        task.started_at = datetime.now(UTC)
+        task.message = message
+
+    def report(self, task: TaskState, done: int, total: int, message: str | None = None) -> None:
+        task.progress = 100 if total <= 0 else min(100, int(done * 100 / total))
+        if message is not None:
+            task.message = message
+
+    def complete(self, task: TaskState, result: dict[str, Any] | None = None) -> None:
+        task.status = "completed"
+        task.progress = 100
+        task.completed_at = datetime.now(UTC)
+        if result:
+            task.result = {**task.result, **result}
+
+    def fail(self, task: TaskState, error_message: str) -> None:
+        task.status = "failed"
+        task.completed_at = datetime.now(UTC)
+        task.error_message = error_message
+
+    def _evict(self) -> None:
+        if len(self._tasks) <= self._max_tasks:
+            return
+        finished = [t for t in self._tasks.values() if t.status in {"completed", "failed"}]
+        finished.sort(key=lambda t: t.completed_at or datetime.min.replace(tzinfo=UTC))
+        for task in finished[: len(self._tasks) - self._max_tasks]:
+            self._tasks.pop(task.id, None)
+
+
+class BackgroundJobRunner:
+    def __init__(self, concurrency: int) -> None:
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._jobs: set[asyncio.Task[None]] = set()
+
+    def submit(self, job: Awaitable[None]) -> asyncio.Task[None]:
+        handle = asyncio.create_task(self._run(job))
+        self._jobs.add(handle)
+        handle.add_done_callback(self._jobs.discard)
+        return handle
+
+    async def _run(self, job: Awaitable[None]) -> None:
+        async with self._slots:
+            try:
+                await job
+            except Exception:
+                logger.exception("Background job failed")
+
+    async def drain(self) -> None:
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+
+
+task_registry = TaskRegistry()
+background_jobs = BackgroundJobRunner(get_settings().batch_upload_concurrency)
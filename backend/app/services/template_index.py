@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DocumentTemplate
+from app.services.extraction_service import normalize_key
+
+REFRESH_INTERVAL_SECONDS = 5.0
+DETECTION_CACHE_SIZE = 4096
+
+DetectionKey = tuple[str, uuid.UUID, str]
+# Postings are scoped by owning application; shared templates live under a
+# single sentinel scope that every application probes.
+SHARED_SCOPE = None
+PostingKey = tuple[uuid.UUID | None, str, str]
+
+
+def template_fingerprint(detection: dict[str, Any] | None) -> frozenset[str]:
+    return frozenset(normalize_key(str(column)) for column in (detection or {}).get("required_columns", []))
+
+
+@dataclass(frozen=True)
+class IndexedTemplate:
+    id: uuid.UUID
+    application_id: uuid.UUID
+    format: str
+    is_shared: bool
+    required: frozenset[str]
+
+    @property
+    def scope(self) -> uuid.UUID | None:
+        return SHARED_SCOPE if self.is_shared else self.application_id
+
+
+class TemplateDetectionIndex:
+    def __init__(self) -> None:
+        self._templates: dict[uuid.UUID, IndexedTemplate] = {}
+        self._postings: dict[PostingKey, set[uuid.UUID]] = defaultdict(set)
+        self._signature: tuple[int, datetime | None] | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._detections: OrderedDict[DetectionKey, tuple[uuid.UUID | None, float]] = OrderedDict()
+
+    def upsert(self, template: DocumentTemplate) -> None:
+        self.remove(template.id)
+        self._detections.clear()
+        if not template.is_active:
+            return
+        required = template_fingerprint(template.detection)
+        if not required:
+            return
+        entry = IndexedTemplate(
+            id=template.id,
+            application_id=template.application_id,
+            format=(template.format or "").lower(),
+            is_shared=bool(template.is_shared),
+            required=required,
+        )
+        self._templates[entry.id] = entry
+        for column in required:
+            self._postings[(entry.scope, entry.format, column)].add(entry.id)
+
+    def remove(self, template_id: uuid.UUID) -> None:
+        self._detections.clear()
+        entry = self._templates.pop(template_id, None)
+        if entry is None:
+            return
+        for column in entry.required:
+            key = (entry.scope, entry.format, column)
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            postings.discard(template_id)
+            if not postings:
+                del self._postings[key]
+
+    def detect(self, application_id: uuid.UUID, fmt: str, columns: list[str]) -> tuple[uuid.UUID | None, float]:
+        hits: Counter[uuid.UUID] = Counter()
+        for column in set(columns):
+            for scope in (application_id, SHARED_SCOPE):
+                hits.update(self._postings.get((scope, fmt, column), ()))
+
+        best: tuple[uuid.UUID | None, float] = (None, 0.0)
+        best_rank: tuple[float, bool, str] | None = None
+        for template_id, count in hits.items():
+            entry = self._templates[template_id]
+            overlap = count / len(entry.required)
+            rank = (overlap, entry.application_id == application_id, str(template_id))
+            if best_rank is None or rank > best_rank:
+                best_rank = rank
+                best = (template_id, overlap)
+        return best
+
+    def cached_detection(self, key: DetectionKey) -> tuple[uuid.UUID | None, float] | None:
+        result = self._detections.get(key)
+        if result is not None:
+            self._detections.move_to_end(key)
+        return result
+
+    def remember_detection(self, key: DetectionKey, result: tuple[uuid.UUID | None, float]) -> None:
+        self._detections[key] = result
+        self._detections.move_to_end(key)
+        while len(self._detections) > DETECTION_CACHE_SIZE:
+            self._detections.popitem(last=False)
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if self._signature is not None and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS:
+            return
+
+        async with self._lock:
+            result = await db.execute(select(func.count(DocumentTemplate.id), func.max(DocumentTemplate.updated_at)))
+            signature = tuple(result.one())
+            if signature != self._signature:
+                # Always a full rebuild: updated_at is stamped when a write
+                # starts, so a transaction that began earlier can commit rows
+                # older than the last max and an incremental reload would miss them.
+                templates = (await db.execute(select(DocumentTemplate))).scalars().all()
+                self._templates.clear()
+                self._postings.clear()
+                self._detections.clear()
+                for template in templates:
+                    self.upsert(template)
+                self._signature = signature
+            self._checked_at = time.monotonic()
+
+
+template_index = TemplateDetectionIndex()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+@dataclass
+class StagedUpload:
+    path: Path
+    file_hash: str
+    size: int
+
+
+def _open_temp_file(directory: Path) -> tuple[BinaryIO, Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=directory, suffix=".part")
+    return os.fdopen(fd, "wb"), Path(name)
+
+
+def _write_chunk(handle: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+def _close_and_remove(handle: BinaryIO, path: Path) -> None:
+    handle.close()
+    path.unlink(missing_ok=True)
+
+
+async def stage_upload(file: UploadFile, directory: Path, max_bytes: int) -> StagedUpload:
+    handle, temp_path = await asyncio.to_thread(_open_temp_file, directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError("FILE_TOO_LARGE")
+            await asyncio.to_thread(_write_chunk, handle, digest, chunk)
+        await asyncio.to_thread(handle.close)
+    except BaseException:
+        await asyncio.to_thread(_close_and_remove, handle, temp_path)
+        raise
+    return StagedUpload(path=temp_path, file_hash=digest.hexdigest(), size=size)
+
+
+async def commit_upload(staged: StagedUpload, destination: Path) -> Path:
+    await asyncio.to_thread(os.replace, staged.path, destination)
+    return destination
+
+
+async def discard_upload(staged: StagedUpload) -> None:
+    await asyncio.to_thread(staged.path.unlink, missing_ok=True)
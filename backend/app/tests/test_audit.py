@@ -1,12 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.core.config import get_settings
 from app.db.base import Base
-from app.services.audit_service import record_audit_event, verify_audit_hash_chain
+from app.models import AuditArchiveSegment, AuditChainHead, AuditLog, AuditVerificationCheckpoint
+from app.services import audit_archive, audit_retention, storage
+from app.services.audit_archive import archive_segments
+from app.services.audit_export import ExportEncoder
+from app.services.audit_retention import archive_audit_log
+from app.services.audit_query import AuditFilters, InvalidCursorError, audit_filters, page_audit_entries
+from app.services.audit_writer import AuditWriter
+from app.services.storage import LocalStorageBackend
+from app.services.audit_service import (
+    CHAIN_HEAD_ID,
+    AuditEvent,
+    get_verification_executor,
+    record_audit_event,
+    record_audit_events_batch,
+    record_verification_checkpoint,
+    shutdown_verification_executor,
+    verify_audit_hash_chain,
+)
 
 
 @pytest.mark.asyncio
@@ -47,3 +71,526 @@ async def test_audit_chain_verifies() -> None:
         result = await verify_audit_hash_chain(session)
         assert result.valid is True
         assert result.checked_entries == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_keep_the_chain_linear(tmp_path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def writer(index: int) -> None:
+        for step in range(5):
+            async with session_maker() as session:
+                await record_audit_event(
+                    session,
+                    actor_id=None,
+                    actor_type="SYSTEM",
+                    action="update",
+                    entity_type="review",
+                    entity_id=uuid.uuid4(),
+                    before_state=None,
+                    after_state={"writer": index, "step": step},
+                    request_id=f"req-{index}-{step}",
+                )
+                await asyncio.sleep(0)
+                if step == 2:
+                    await session.rollback()
+                else:
+                    await session.commit()
+
+    await asyncio.gather(*(writer(index) for index in range(8)))
+
+    async with session_maker() as session:
+        result = await verify_audit_hash_chain(session)
+        assert result.valid is True
+        assert result.checked_entries == 32
+        head = await session.get(AuditChainHead, CHAIN_HEAD_ID)
+        tail = (await session.execute(select(AuditLog).order_by(AuditLog.id.desc()).limit(1))).scalar_one()
+        assert (head.last_entry_id, head.last_hash, head.entry_count) == (tail.id, tail.content_hash, 32)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_chain_lock_is_released_when_a_session_closes_uncommitted() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def append(request_id: str) -> None:
+        await record_audit_event(
+            session,
+            actor_id=None,
+            actor_type="SYSTEM",
+            action="create",
+            entity_type="review",
+            entity_id=uuid.uuid4(),
+            before_state=None,
+            after_state=None,
+            request_id=request_id,
+        )
+
+    with pytest.raises(RuntimeError):
+        async with session_maker() as session:
+            await append("abandoned")
+            raise RuntimeError("route failed after recording")
+
+    async with session_maker() as session:
+        await asyncio.wait_for(append("kept"), timeout=5)
+        await session.commit()
+
+    async with session_maker() as session:
+        request_ids = (await session.execute(select(AuditLog.request_id))).scalars().all()
+        assert request_ids == ["kept"]
+        assert (await verify_audit_hash_chain(session)).valid is True
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_batch_events_extend_the_chain() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        first = await record_audit_event(
+            session,
+            actor_id=None,
+            actor_type="SYSTEM",
+            action="create",
+            entity_type="review",
+            entity_id=uuid.uuid4(),
+            before_state=None,
+            after_state={"name": "r"},
+            request_id="req-1",
+        )
+        events = [
+            AuditEvent(
+                actor_id=None,
+                actor_type="USER",
+                action="update",
+                entity_type="finding",
+                entity_id=uuid.uuid4(),
+                before_state=None,
+                after_state={"disposition": "accepted", "bulk": True},
+                request_id="req-2",
+                metadata={"bulk_count": 50},
+            )
+            for _ in range(50)
+        ]
+        entry_ids = await record_audit_events_batch(session, events)
+        assert entry_ids == list(range(first.id + 1, first.id + 51))
+        await session.commit()
+
+    async with session_maker() as session:
+        result = await verify_audit_hash_chain(session)
+        assert result.valid is True
+        assert result.checked_entries == 51
+        head = await session.get(AuditChainHead, CHAIN_HEAD_ID)
+        assert (head.last_entry_id, head.entry_count) == (entry_ids[-1], 51)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_filtered_entries_once() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    actors = [uuid.uuid4(), uuid.uuid4()]
+    entity_id = uuid.uuid4()
+    async with session_maker() as session:
+        events = [
+            AuditEvent(
+                actor_id=actors[step % 2],
+                actor_type="USER",
+                action="update",
+                entity_type="finding",
+                entity_id=entity_id if step % 3 == 0 else uuid.uuid4(),
+                before_state=None,
+                after_state={"step": step},
+                request_id=f"req-{step % 4}",
+            )
+            for step in range(40)
+        ]
+        entry_ids = await record_audit_events_batch(session, events)
+        # Ties on timestamp must be broken by id without skipping rows.
+        await session.execute(
+            update(AuditLog).where(AuditLog.id.in_(entry_ids[10:20])).values(timestamp=datetime(2026, 1, 1, tzinfo=UTC))
+        )
+        await session.commit()
+
+    async def collect(filters: AuditFilters, limit: int) -> list[int]:
+        seen: list[int] = []
+        cursor = None
+        async with session_maker() as session:
+            while True:
+                entries, cursor = await page_audit_entries(session, filters, cursor=cursor, limit=limit)
+                seen.extend(entry.id for entry in entries)
+                if cursor is None:
+                    return seen
+
+    async with session_maker() as session:
+        rows = (await session.execute(select(AuditLog.id, AuditLog.timestamp, AuditLog.actor_id, AuditLog.entity_id))).all()
+
+    def expected(predicate) -> list[int]:
+        matching = [row for row in rows if predicate(row)]
+        return [row.id for row in sorted(matching, key=lambda row: (row.timestamp, row.id), reverse=True)]
+
+    assert await collect(AuditFilters(), 7) == expected(lambda row: True)
+    assert await collect(audit_filters(actor_id=actors[0]), 3) == expected(lambda row: row.actor_id == actors[0])
+    assert await collect(audit_filters(entity_type="finding", entity_id=entity_id), 4) == expected(
+        lambda row: row.entity_id == entity_id
+    )
+    assert len(await collect(audit_filters(request_id="req-1"), 500)) == 10
+
+    async with session_maker() as session:
+        with pytest.raises(InvalidCursorError):
+            await page_audit_entries(session, AuditFilters(), cursor="not-a-cursor")
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_queue_blocks_when_full_and_keeps_order() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    writer = AuditWriter(session_maker, max_size=4, batch_size=3)
+
+    def access(step: int) -> AuditEvent:
+        return AuditEvent(
+            actor_id=None,
+            actor_type="USER",
+            action="read",
+            entity_type="review",
+            entity_id=None,
+            before_state=None,
+            after_state=None,
+            request_id=f"read-{step}",
+        )
+
+    high_water = 0
+    for step in range(25):
+        await writer.enqueue(access(step))
+        high_water = max(high_water, writer.pending)
+    assert high_water <= 4
+    await writer.stop()
+    assert writer.pending == 0
+
+    async with session_maker() as session:
+        request_ids = (await session.execute(select(AuditLog.request_id).order_by(AuditLog.id))).scalars().all()
+        assert request_ids == [f"read-{step}" for step in range(25)]
+        assert (await verify_audit_hash_chain(session)).valid is True
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_stop_gives_up_and_logs_unwritten_events(caplog: pytest.LogCaptureFixture) -> None:
+    # No tables exist, so every batch fails and is retried until shutdown.
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    writer = AuditWriter(async_sessionmaker(engine, expire_on_commit=False), max_size=10, batch_size=2)
+    for step in range(5):
+        await writer.enqueue(
+            AuditEvent(
+                actor_id=None,
+                actor_type="USER",
+                action="read",
+                entity_type="review",
+                entity_id=None,
+                before_state=None,
+                after_state=None,
+                request_id=f"lost-{step}",
+            )
+        )
+
+    await asyncio.wait_for(writer.stop(timeout=0.2), timeout=5)
+
+    assert writer.pending == 0
+    unwritten = [record for record in caplog.records if record.getMessage().startswith("Unwritten audit event")]
+    assert [json.loads(record.getMessage().split(" ", 3)[3])["request_id"] for record in unwritten] == [
+        f"lost-{step}" for step in range(5)
+    ]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_archived_periods_stay_verifiable_and_queryable(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "file_storage_path", str(tmp_path))
+    backend = LocalStorageBackend(tmp_path)
+    monkeypatch.setattr(audit_archive, "get_storage_backend", lambda: backend)
+    monkeypatch.setattr(audit_retention, "get_storage_backend", lambda: backend)
+    # Small storage chunks make segments decode across many partial reads.
+    monkeypatch.setattr(storage, "STREAM_CHUNK_SIZE", 64)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    tracked = uuid.UUID(int=1000)
+
+    def events(start: int, stop: int) -> list[AuditEvent]:
+        return [
+            AuditEvent(
+                actor_id=None,
+                actor_type="USER",
+                action="update",
+                entity_type="finding",
+                entity_id=tracked if step == 5 else uuid.UUID(int=step),
+                before_state=None,
+                after_state={"step": step},
+                request_id=f"req-{step}",
+            )
+            for step in range(start, stop)
+        ]
+
+    async with session_maker() as session:
+        entry_ids = await record_audit_events_batch(session, events(0, 30))
+        await session.commit()
+        assert await record_verification_checkpoint(session, await verify_audit_hash_chain(session))
+        entry_ids += await record_audit_events_batch(session, events(30, 40))
+        for offset, month in ((0, 1), (10, 2), (20, 3)):
+            await session.execute(
+                update(AuditLog)
+                .where(AuditLog.id.in_(entry_ids[offset : offset + 10]))
+                .values(timestamp=datetime(2024, month, 10, tzinfo=UTC))
+            )
+        await session.commit()
+
+    async with session_maker() as session:
+        segments = await archive_audit_log(session, before=datetime(2024, 6, 1, tzinfo=UTC))
+        # March stops short of the checkpoint anchor, which stays live.
+        assert [(item.period, item.first_entry_id, item.last_entry_id) for item in segments] == [
+            ("2024-01", entry_ids[0], entry_ids[9]),
+            ("2024-02", entry_ids[10], entry_ids[19]),
+            ("2024-03", entry_ids[20], entry_ids[28]),
+        ]
+        live_ids = (await session.execute(select(AuditLog.id).order_by(AuditLog.id))).scalars().all()
+        assert live_ids == entry_ids[29:]
+
+        result = await verify_audit_hash_chain(session, full=True)
+        assert (result.valid, result.checked_entries) == (True, 40)
+
+        seen: list[int] = []
+        cursor = None
+        while True:
+            entries, cursor = await page_audit_entries(session, AuditFilters(), cursor=cursor, limit=7)
+            seen.extend(entry.id for entry in entries)
+            if cursor is None:
+                break
+        assert sorted(seen) == entry_ids and len(seen) == 40
+        timeline, _ = await page_audit_entries(session, audit_filters(entity_type="finding", entity_id=tracked))
+        assert [entry.request_id for entry in timeline] == ["req-5"]
+        # Only the January segment can hold the tracked entity.
+        candidates = await archive_segments(session, keys=audit_filters(entity_id=tracked).archive_keys())
+        assert [segment.period for segment in candidates] == ["2024-01"]
+
+        first = await session.scalar(select(AuditArchiveSegment).order_by(AuditArchiveSegment.first_entry_id))
+        path = tmp_path / first.storage_key
+        path.write_bytes(path.read_bytes()[:-8] + b"\x00" * 8)
+        result = await verify_audit_hash_chain(session, full=True)
+        assert (result.valid, result.first_invalid_id) == (False, entry_ids[0])
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_streaming_verification_reports_progress_and_tampering(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "audit_verify_chunk_size", 5)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        for index in range(12):
+            await record_audit_event(
+                session,
+                actor_id=uuid.uuid4(),
+                actor_type="USER",
+                action="update",
+                entity_type="review",
+                entity_id=uuid.uuid4(),
+                before_state={"name": "before", "amount": 1.5},
+                after_state={"name": f"é-{index}", "tags": ["a", "b"]},
+                request_id=f"req-{index}",
+            )
+        await session.commit()
+
+    progress: list[tuple[int, int]] = []
+
+    async def report(checked: int, total: int) -> None:
+        progress.append((checked, total))
+
+    async with session_maker() as session:
+        result = await verify_audit_hash_chain(session, on_progress=report)
+        assert result.valid is True
+        assert progress == [(5, 12), (10, 12), (12, 12)]
+
+        await session.execute(update(AuditLog).where(AuditLog.id == 7).values(after_state={"name": "tampered"}))
+        await session.commit()
+
+    async with session_maker() as session:
+        result = await verify_audit_hash_chain(session)
+        assert result.valid is False
+        assert result.first_invalid_id == 7
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_verification_resumes_from_signed_checkpoint() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def append(count: int) -> None:
+        async with session_maker() as session:
+            for index in range(count):
+                await record_audit_event(
+                    session,
+                    actor_id=None,
+                    actor_type="SYSTEM",
+                    action="update",
+                    entity_type="review",
+                    entity_id=uuid.uuid4(),
+                    before_state=None,
+                    after_state={"index": index},
+                    request_id=None,
+                )
+            await session.commit()
+
+    async def verify(full: bool = False):
+        async with session_maker() as session:
+            result = await verify_audit_hash_chain(session, full=full)
+            await record_verification_checkpoint(session, result)
+            await session.commit()
+            return result
+
+    await append(5)
+    first = await verify()
+    assert (first.valid, first.checked_entries, first.start_after_id) == (True, 5, None)
+
+    await append(3)
+    second = await verify()
+    assert (second.valid, second.checked_entries, second.start_after_id, second.entry_count) == (True, 3, 5, 8)
+
+    async with session_maker() as session:
+        await session.execute(update(AuditLog).where(AuditLog.id == 2).values(after_state={"index": 99}))
+        await session.commit()
+
+    assert (await verify()).checked_entries == 0
+    full = await verify(full=True)
+    assert (full.valid, full.first_invalid_id) == (False, 2)
+
+    async with session_maker() as session:
+        await session.execute(update(AuditVerificationCheckpoint).values(entry_count=1000))
+        await session.commit()
+    unsigned = await verify()
+    assert (unsigned.start_after_id, unsigned.first_invalid_id) == (None, 2)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool", ["thread", "process"])
+async def test_parallel_segment_verification_matches_serial(
+    pool: str, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "audit_verify_chunk_size", 4)
+    monkeypatch.setattr(get_settings(), "audit_verify_workers", 2)
+    # "process" runs the same spawn pool the service starts for large logs.
+    executor = ThreadPoolExecutor(max_workers=3) if pool == "thread" else get_verification_executor()
+    # Workers read their id ranges over their own connections, so the
+    # database has to be one they can open.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        for index in range(14):
+            await record_audit_event(
+                session,
+                actor_id=None,
+                actor_type="SYSTEM",
+                action="update",
+                entity_type="review",
+                entity_id=uuid.uuid4(),
+                before_state=None,
+                after_state={"index": index},
+                request_id=None,
+            )
+        await session.commit()
+
+    async def both() -> tuple:
+        async with session_maker() as session:
+            serial = await verify_audit_hash_chain(session, full=True)
+        async with session_maker() as session:
+            parallel = await verify_audit_hash_chain(session, full=True, executor=executor)
+        return serial, parallel
+
+    serial, parallel = await both()
+    assert serial == parallel
+    assert (parallel.valid, parallel.checked_entries, parallel.last_entry_id) == (True, 14, 14)
+
+    tampering = [
+        (AuditLog.id == 11, {"after_state": {"index": -1}}, 11, "Content hash mismatch at entry 11"),
+        (AuditLog.id == 9, {"previous_hash": "0" * 64}, 9, "Previous hash mismatch at entry 9"),
+        (AuditLog.id == 6, {"content_hash": "f" * 64}, 6, "Content hash mismatch at entry 6"),
+    ]
+    for condition, values, invalid_id, message in tampering:
+        async with session_maker() as session:
+            await session.execute(update(AuditLog).where(condition).values(**values))
+            await session.commit()
+        serial, parallel = await both()
+        assert serial == parallel
+        assert (parallel.first_invalid_id, parallel.checked_entries, parallel.message) == (invalid_id, invalid_id, message)
+
+    if pool == "thread":
+        executor.shutdown()
+    else:
+        shutdown_verification_executor()
+        assert get_verification_executor.cache_info().currsize == 0
+    await engine.dispose()
+
+
+def test_export_encoder_streams_valid_documents() -> None:
+    rows = [
+        SimpleNamespace(
+            id=index,
+            timestamp=datetime(2026, 1, 1, tzinfo=UTC),
+            actor_id=None,
+            action="create",
+            entity_type="review",
+            entity_id=None,
+            content_hash="a" * 64,
+            previous_hash=None,
+            audit_metadata={"n": index},
+        )
+        for index in range(5)
+    ]
+    batches = [rows[:2], rows[2:]]
+
+    def render(fmt: str, parts: list) -> bytes:
+        encoder = ExportEncoder(fmt)
+        return b"".join(encoder.encode(batch) for batch in parts) + encoder.finish()
+
+    assert [item["id"] for item in json.loads(render("json", batches))] == [0, 1, 2, 3, 4]
+    assert json.loads(render("json", [])) == []
+    assert [json.loads(line)["metadata"] for line in render("ndjson", batches).splitlines()] == [
+        {"n": index} for index in range(5)
+    ]
+    csv_lines = render("csv", batches).decode().splitlines()
+    assert csv_lines[0].startswith("id,timestamp") and len(csv_lines) == 6
+    assert render("csv", []).decode().splitlines() == [csv_lines[0]]
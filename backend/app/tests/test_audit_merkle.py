@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.services.audit_merkle import (
+    _path,
+    _subproof,
+    append_leaves,
+    consistency_proof,
+    inclusion_proof,
+    leaf_hash,
+    node_hash,
+    root_from_peaks,
+    verify_consistency,
+    verify_inclusion,
+)
+from app.services.audit_service import record_audit_event
+
+
+def _reference_root(leaves: list[bytes]) -> bytes:
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1 << ((len(leaves) - 1).bit_length() - 1)
+    return node_hash(_reference_root(leaves[:k]), _reference_root(leaves[k:]))
+
+
+def _content_hashes(count: int) -> list[str]:
+    return [hashlib.sha256(str(index).encode()).hexdigest() for index in range(count)]
+
+
+def test_incremental_tree_matches_rfc6962_and_proofs_verify() -> None:
+    hashes = _content_hashes(33)
+    size, peaks, nodes = 0, [], []
+    roots: dict[int, bytes] = {}
+    for index, content_hash in enumerate(hashes):
+        size, peaks, added = append_leaves(size, peaks, [(index + 100, content_hash)])
+        nodes.extend(added)
+        roots[size] = bytes.fromhex(root_from_peaks(peaks))
+        assert roots[size] == _reference_root([leaf_hash(item) for item in hashes[:size]])
+
+    stored = {(node["level"], node["node_index"]): bytes.fromhex(node["hash"]) for node in nodes}
+    assert len(stored) == len(nodes) < 2 * len(hashes)
+    get = lambda level, index: stored[(level, index)]  # noqa: E731
+
+    for tree_size in (1, 2, 7, 8, 33):
+        for index in range(tree_size):
+            proof = _path(index, 0, tree_size, get)
+            assert verify_inclusion(leaf_hash(hashes[index]), index, tree_size, proof, roots[tree_size])
+            assert not verify_inclusion(leaf_hash(hashes[index]), index, tree_size, proof, bytes(32))
+
+    for first in range(1, 34):
+        for second in range(first, 34):
+            proof = _subproof(first, 0, second, True, get) if first < second else []
+            assert verify_consistency(first, second, proof, roots[first], roots[second])
+            if first < second:
+                assert not verify_consistency(first, second, proof, roots[second], roots[second])
+
+
+@pytest.mark.asyncio
+async def test_proofs_from_stored_index() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    entries = []
+    async with session_maker() as session:
+        for index in range(12):
+            entries.append(
+                await record_audit_event(
+                    session,
+                    actor_id=None,
+                    actor_type="SYSTEM",
+                    action="create",
+                    entity_type="review",
+                    entity_id=uuid.uuid4(),
+                    before_state=None,
+                    after_state={"index": index},
+                    request_id=None,
+                )
+            )
+            if index == 4:
+                await session.commit()
+        await session.commit()
+
+    async with session_maker() as session:
+        proof = await inclusion_proof(session, entries[6].id, 12)
+        assert proof["leaf_index"] == 6
+        assert verify_inclusion(
+            leaf_hash(entries[6].content_hash),
+            6,
+            12,
+            [bytes.fromhex(node) for node in proof["proof"]],
+            bytes.fromhex(proof["root_hash"]),
+        )
+
+        consistency = await consistency_proof(session, 5, 12)
+        assert verify_consistency(
+            5,
+            12,
+            [bytes.fromhex(node) for node in consistency["proof"]],
+            bytes.fromhex(consistency["first_root"]),
+            bytes.fromhex(consistency["second_root"]),
+        )
+        assert consistency["second_root"] == proof["root_hash"]
+
+    await engine.dispose()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import uuid
+
+from app.services.delta_service import delta_key, diff_records
+
+
+def _row(identifier: str | None, email: str | None, content_hash: str | None) -> tuple:
+    return (uuid.uuid4(), identifier, email, content_hash)
+
+
+def test_delta_key_prefers_identifier_then_email() -> None:
+    assert delta_key(" U1 ", "u1@example.com") == "u1"
+    assert delta_key("", "User@Example.com ") == "user@example.com"
+    assert delta_key(None, None) is None
+
+
+def test_diff_records_classifies_in_one_pass() -> None:
+    previous = [_row("u1", None, "a"), _row("u2", None, "b"), _row("u3", None, "c")]
+    current = [
+        _row("U1", None, "a"),
+        _row("u2", None, "changed"),
+        _row("u4", None, "d"),
+        _row("u4", None, "d"),
+        _row(None, None, "e"),
+    ]
+
+    delta = diff_records(current, previous, detail_limit=1)
+
+    assert delta["counts"] == {"added": 1, "removed": 1, "changed": 1, "unchanged": 1, "unkeyed": 1, "duplicate": 1}
+    assert [entry["key"] for entry in delta["added"]] == ["u4"]
+    assert [entry["key"] for entry in delta["removed"]] == ["u3"]
+    assert delta["changed"][0]["previous_record_id"] == str(previous[1][0])
+    assert delta["truncated"] is False
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.models import ReferenceDataset, ReferenceRecord
+from app.services.bulk_loader import bulk_insert_rows
+from app.services.extraction_service import (
+    ENCODING_SAMPLE_SIZE,
+    ExtractionChecksum,
+    apply_mapping,
+    canonical_record_bytes,
+    compute_extraction_checksum,
+    detect_encoding,
+    infer_column_types,
+    infer_date_format,
+    iter_rows_from_stream,
+    load_rows_from_bytes,
+    parse_date_column,
+    read_header,
+)
+from app.services.parallel_extraction import (
+    AmbiguousCsvSplitError,
+    extract_csv_parallel,
+    shutdown_extraction_executor,
+    split_csv_ranges,
+)
+from app.services.parse_cache import ParsedDocumentCache
+
+
+def test_infer_date_format_prefers_concrete_format() -> None:
+    assert infer_date_format(["2024-01-15", "2024-02-01T10:30:00"]) == "iso"
+    assert infer_date_format(["01/15/2024", "12/31/2023"]) == "%m/%d/%Y"
+    assert infer_date_format(["15/01/2024", "31/12/2023"]) == "%d/%m/%Y"
+
+
+def test_parse_date_column_falls_back_for_outliers() -> None:
+    result = parse_date_column(["01/15/2024", "", "March 3rd 2024", "not a date"])
+
+    assert result.format == "%m/%d/%Y"
+    assert result.values[0] == "2024-01-15T00:00:00"
+    assert result.values[1] == ""
+    assert result.values[2] == "2024-03-03T00:00:00"
+    assert result.values[3] is None
+    assert result.failed_rows == [4]
+
+
+def test_apply_mapping_reports_date_failures_per_column() -> None:
+    rows = [
+        {"user": "a", "state": "active", "last_login": "01/15/2024"},
+        {"user": "b", "state": "active", "last_login": "garbage"},
+    ]
+    mapping = {
+        "identifier": {"source": "user"},
+        "status": {"source": "state"},
+        "last_activity": {"source": "last_login", "transform": "parse_date"},
+    }
+
+    records, warnings, confidence = apply_mapping(rows, mapping)
+
+    assert records[0]["last_activity"] == "2024-01-15T00:00:00"
+    assert records[1]["last_activity"] is None
+    assert confidence == 1.0
+    assert warnings == [
+        {
+            "type": "date_parse_failed",
+            "field": "last_activity",
+            "source": "last_login",
+            "format": "%m/%d/%Y",
+            "count": 1,
+            "rows": [2],
+        }
+    ]
+
+
+def test_extraction_checksum_is_canonical_and_streaming() -> None:
+    assert canonical_record_bytes({"b": 1, "a": [None, "x"]}) == canonical_record_bytes({"a": [None, "x"], "b": 1})
+
+    rows = [{"user": "a", "state": "active"}, {"user": "b", "state": ""}]
+    mapping = {"identifier": {"source": "user"}, "status": {"source": "state"}}
+    checksum = ExtractionChecksum()
+    records, _, _ = apply_mapping(rows, mapping, checksum=checksum)
+
+    assert checksum.count == 2
+    assert all(len(record["content_hash"]) == 64 for record in records)
+    assert records[0]["content_hash"] != records[1]["content_hash"]
+    assert checksum.hexdigest() == compute_extraction_checksum(records)
+    assert checksum.hexdigest() == compute_extraction_checksum(apply_mapping(rows, mapping)[0])
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_rows_batches_and_reports_progress() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        dataset = ReferenceDataset(
+            name="hr", data_type="hr", file_path="hr.csv", file_hash="0" * 64, record_count=25, uploaded_by=None
+        )
+        session.add(dataset)
+        await session.flush()
+
+        progress: list[int] = []
+        inserted = await bulk_insert_rows(
+            session,
+            ReferenceRecord.__table__,
+            ({"dataset_id": dataset.id, "record_index": i, "email": f"u{i}@example.com"} for i in range(25)),
+            batch_size=10,
+            on_progress=progress.append,
+        )
+        await session.commit()
+
+        assert inserted == 25
+        assert progress == [10, 20, 25]
+        count = await session.execute(select(func.count(func.distinct(ReferenceRecord.id))))
+        assert count.scalar() == 25
+        sample = (await session.execute(select(ReferenceRecord).limit(1))).scalar_one()
+        assert isinstance(sample.id, uuid.UUID)
+        assert sample.extended_attributes == {}
+
+
+def test_read_header_reads_only_first_row() -> None:
+    def chunks():
+        yield b"User ID,Sta"
+        yield b"tus\nu1,active\n"
+        # Encoding detection may read ahead by at most one bounded sample.
+        yield b"u2,active\n" * (ENCODING_SAMPLE_SIZE // 10)
+        raise AssertionError("header read consumed the whole stream")
+
+    assert read_header("users.csv", chunks()) == ["user_id", "status"]
+
+
+def test_preview_reads_only_requested_rows_and_infers_types() -> None:
+    def chunks():
+        yield b"user_id,logins,score,active,last_login,notes\n"
+        yield b"u1,3,1.5,yes,2024-01-15,\nu2,4,2,no,2024-02-01,hello\n"
+        yield b"u3,5,3,yes,2024-03-01,\n" * (ENCODING_SAMPLE_SIZE // 20)
+        raise AssertionError("preview consumed the whole stream")
+
+    rows = list(iter_rows_from_stream("users.csv", chunks(), limit=2))
+
+    assert [row["user_id"] for row in rows] == ["u1", "u2"]
+    assert infer_column_types(rows) == {
+        "user_id": "string",
+        "logins": "integer",
+        "score": "number",
+        "active": "boolean",
+        "last_login": "date",
+        "notes": "string",
+    }
+
+
+def test_parse_cache_round_trip_and_lru_eviction(tmp_path: Path) -> None:
+    rows = [{"user_id": "u1", "status": "active", "count": 3}, {"user_id": "u2", "status": None, "count": 1.5}]
+    cache = ParsedDocumentCache(tmp_path, max_bytes=10_000)
+
+    cache.put("first", rows)
+    assert cache.get("first") == rows
+    assert cache.get("first", limit=1) == rows[:1]
+    assert cache.get("missing") is None
+
+    cache.max_bytes = (tmp_path / "first.rows.gz").stat().st_size
+    cache.put("second", rows)
+    assert cache.get("first") is None
+    assert cache.get("second") == rows
+
+
+PARALLEL_MAPPING = {
+    "identifier": {"source": "User ID"},
+    "status": {"source": "Status", "transform": "lowercase"},
+    "email": {"source": "Email", "transform": "lowercase"},
+    "last_activity": {"source": "Last Login", "transform": "parse_date"},
+    "notes": {"source": "Notes"},
+}
+
+
+def _write_users_csv(path: Path, stray: str | None = None) -> Path:
+    lines = ["User ID,Status,Email,Last Login,Notes\n"]
+    for i in range(400):
+        status = "" if i % 37 == 0 else "Active"
+        last_login = "bad date" if i % 53 == 0 else f"01/{(i % 28) + 1:02d}/2024"
+        notes = f'"multi\nline, ""quoted"" {i}"' if i % 11 == 0 else f"note {i}"
+        if stray is not None and i == 5:
+            notes = stray
+        lines.append(f"u{i},{status},U{i}@x.com,{last_login},{notes}\n")
+    path.write_text("".join(lines))
+    return path
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_parallel_csv_extraction_matches_serial(pool: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = _write_users_csv(tmp_path / "users.csv")
+    mapping = PARALLEL_MAPPING
+
+    header_end, ranges = split_csv_ranges(path, parts=9)
+    assert len(ranges) > 1
+    assert ranges[0][0] == header_end and ranges[-1][1] == path.stat().st_size
+
+    serial_checksum = ExtractionChecksum()
+    serial = apply_mapping(load_rows_from_bytes("users.csv", path.read_bytes()), mapping, checksum=serial_checksum)
+    parallel_checksum = ExtractionChecksum()
+    if pool == "thread":
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            parallel = extract_csv_parallel(path, mapping, checksum=parallel_checksum, executor=executor, parts=9)
+    else:
+        # The spawn pool the service uses: ranges and the plan must pickle.
+        monkeypatch.setattr(get_settings(), "extraction_workers", 2)
+        try:
+            parallel = extract_csv_parallel(path, mapping, checksum=parallel_checksum, parts=9)
+        finally:
+            shutdown_extraction_executor()
+
+    assert parallel == serial
+    assert parallel_checksum.hexdigest() == serial_checksum.hexdigest()
+    assert any(warning["type"] == "date_parse_failed" for warning in parallel[1])
+
+
+@pytest.mark.parametrize("stray", ['5" screen', 'size 5"'])
+def test_parallel_csv_split_refuses_stray_quotes(stray: str, tmp_path: Path) -> None:
+    # Mid-field quotes are caught while scanning; one ending a field flips the
+    # parity and is caught by the first record of the next range.
+    path = _write_users_csv(tmp_path / "users.csv", stray=stray)
+    serial = apply_mapping(load_rows_from_bytes("users.csv", path.read_bytes()), PARALLEL_MAPPING)
+    assert serial[0][5]["data"]["notes"] == stray
+
+    checksum = ExtractionChecksum()
+    with ThreadPoolExecutor(max_workers=3) as executor, pytest.raises(AmbiguousCsvSplitError):
+        extract_csv_parallel(path, PARALLEL_MAPPING, checksum=checksum, executor=executor, parts=9)
+    assert checksum.hexdigest() == ExtractionChecksum().hexdigest()
+
+
+@pytest.mark.parametrize(
+    ("content", "encoding"),
+    [
+        ("user_id,name\nu1,José Müller\n".encode("utf-8"), "utf-8"),
+        ("user_id,name\nu1,José Müller\n".encode("utf-8-sig"), "utf-8-sig"),
+        ("user_id,name\nu1,José Müller\n".encode("utf-16"), "utf-16"),
+        ("user_id,name\nu1,José Müller\n".encode("utf-16-le"), "utf-16-le"),
+        ("user_id,name\nu1,José Müller\n".encode("cp1252"), "cp1252"),
+    ],
+)
+def test_csv_encodings_are_detected_and_decoded(content: bytes, encoding: str) -> None:
+    assert detect_encoding(content).encoding == encoding
+    rows = load_rows_from_bytes("users.csv", content)
+    assert rows == [{"user_id": "u1", "name": "José Müller"}]
+
+
+def test_utf8_sample_tolerates_latin1_bytes_after_the_sample() -> None:
+    content = b"user_id,name\n" + b"u0,Plain\n" * (ENCODING_SAMPLE_SIZE // 9) + "u1,José\n".encode("cp1252")
+    assert detect_encoding(content[:ENCODING_SAMPLE_SIZE]).encoding == "utf-8"
+    rows = load_rows_from_bytes("users.csv", content)
+    assert rows[-1] == {"user_id": "u1", "name": "José"}
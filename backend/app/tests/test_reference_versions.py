@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import ReferenceDataset, ReferenceRecord
+from app.services import reference_versions
+from app.services.reference_versions import (
+    label_removed_rows,
+    load_reference_records,
+    next_version_number,
+    plan_version,
+    previous_version_state,
+    write_version_index,
+)
+
+
+def _people(count: int) -> list[dict[str, str]]:
+    return [
+        {"employee_id": f"E{index:04d}", "name": f"Person {index}", "email": f"p{index}@x.com", "status": "Active"}
+        for index in range(count)
+    ]
+
+
+async def _store_version(session, rows, previous, *, full=False):
+    previous_state = await previous_version_state(session, previous) if previous else None
+    plan = plan_version(rows, previous_state, full)
+    await label_removed_rows(session, plan)
+    dataset_id = uuid.uuid4()
+    dataset = ReferenceDataset(
+        id=dataset_id,
+        name="hr",
+        data_type="hr_roster",
+        file_path="k",
+        file_hash="0" * 64,
+        record_count=len(plan.live_ids),
+        lineage_id=previous.lineage_id if previous else dataset_id,
+        previous_version_id=previous.id if previous else None,
+        version_number=await next_version_number(session, previous) if previous else 1,
+        storage_mode=plan.storage_mode,
+        delta_summary=plan.counts,
+    )
+    session.add(dataset)
+    await session.flush()
+    if plan.rows:
+        await session.execute(insert(ReferenceRecord), [{**row, "dataset_id": dataset.id} for row in plan.rows])
+    await session.commit()
+    await write_version_index(dataset.id, plan.live_ids)
+    return dataset, plan
+
+
+@pytest.mark.asyncio
+async def test_delta_versions_replay_to_the_uploaded_rows(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(reference_versions, "index_root", lambda: tmp_path)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        first_rows = _people(50)
+        first, first_plan = await _store_version(session, first_rows, None)
+        assert first.storage_mode == "full"
+        assert len(first_plan.rows) == 50
+
+        second_rows = [row for row in first_rows if row["employee_id"] != "E0003"]
+        second_rows[0] = {**second_rows[0], "status": "Terminated"}
+        second_rows.append({"employee_id": "E9999", "name": "New Hire", "email": "new@x.com", "status": "Active"})
+        second, second_plan = await _store_version(session, second_rows, first)
+
+        assert second.storage_mode == "delta"
+        assert second_plan.counts == {"added": 1, "changed": 1, "removed": 1, "unchanged": 48}
+        assert len(second_plan.rows) == 3
+        assert [(row["identifier"], row["email"]) for row in second_plan.rows if row["change_type"] == "removed"] == [
+            ("E0003", "p3@x.com")
+        ]
+
+        # A missing index is rebuilt by replaying the chain.
+        (tmp_path / f"{second.id}.npy").unlink()
+        records = await load_reference_records(session, second)
+        assert [record.identifier for record in records] == [row["employee_id"] for row in second_rows]
+        assert records[0].employment_status == "terminated"
+        assert (tmp_path / f"{second.id}.npy").exists()
+
+        # A second read goes through the index file and returns the same rows.
+        assert [record.id for record in await load_reference_records(session, second)] == [
+            record.id for record in records
+        ]
+        # Earlier versions stay readable after later deltas are stored.
+        assert [record.identifier for record in await load_reference_records(session, first)] == [
+            row["employee_id"] for row in first_rows
+        ]
+
+        third, third_plan = await _store_version(session, second_rows, second, full=True)
+        assert third.storage_mode == "full"
+        assert len(third_plan.rows) == len(second_rows)
+        assert [record.identifier for record in await load_reference_records(session, third)] == [
+            row["employee_id"] for row in second_rows
+        ]
+        assert [record.id for record in await load_reference_records(session, second, limit=2)] == [
+            record.id for record in records[:2]
+        ]
+
+        # Branching from an older version is numbered after the newest one,
+        # and a lineage can never hold two versions with the same number.
+        assert await next_version_number(session, first) == 4
+        session.add(
+            ReferenceDataset(
+                name="hr",
+                data_type="hr_roster",
+                file_path="k",
+                file_hash="0" * 64,
+                record_count=0,
+                lineage_id=first.lineage_id,
+                previous_version_id=first.id,
+                version_number=2,
+            )
+        )
+        with pytest.raises(IntegrityError):
+            await session.flush()
+
+    await engine.dispose()
+
+
+def test_plan_keeps_unkeyed_and_duplicate_rows_as_added() -> None:
+    rows = [{"name": "No Key"}, {"employee_id": "E1"}, {"employee_id": "e1", "name": "Duplicate"}]
+    plan = plan_version(rows, None)
+    assert plan.storage_mode == "full"
+    assert [row["record_key"] for row in plan.rows] == [None, "e1", None]
+    assert len(plan.live_ids) == 3
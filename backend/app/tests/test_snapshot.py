@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Document, Extraction, ExtractedRecord, Review
+from app.services import extraction_snapshot
+
+
+@pytest.mark.asyncio
+async def test_snapshot_payloads_match_database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(extraction_snapshot, "snapshot_root", lambda: tmp_path)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        review = Review(name="r", application_id=uuid.uuid4(), framework_id=uuid.uuid4(), framework_version_label="1.0.0")
+        session.add(review)
+        await session.flush()
+        document = Document(
+            review_id=review.id, filename="u.csv", stored_path="k", file_hash="0" * 64, file_size=1, file_format="csv"
+        )
+        session.add(document)
+        await session.flush()
+        extraction = Extraction(
+            review_id=review.id, document_id=document.id, record_count=3, valid_record_count=3, checksum="c" * 64
+        )
+        session.add(extraction)
+        await session.flush()
+        session.add_all(
+            [
+                ExtractedRecord(
+                    extraction_id=extraction.id,
+                    record_index=1,
+                    identifier="u1",
+                    status="active",
+                    roles=["ADMIN", "USER"],
+                    last_activity=datetime(2024, 1, 15, 8, 30),
+                    extended_attributes={"region": "us"},
+                ),
+                ExtractedRecord(
+                    extraction_id=extraction.id, record_index=2, identifier="u2", email="u2@x.com", data={"cost_center": 7}
+                ),
+                ExtractedRecord(
+                    extraction_id=extraction.id,
+                    record_index=3,
+                    identifier="u3",
+                    roles=["USER"],
+                    extended_attributes={"region": "us"},
+                    content_hash="ab" * 32,
+                ),
+            ]
+        )
+        await session.commit()
+
+        from_db = await extraction_snapshot.load_record_payloads(session, [extraction])
+        assert extraction_snapshot.open_snapshot(extraction) is None
+
+        await extraction_snapshot.build_snapshot(session, extraction)
+        snapshot = extraction_snapshot.open_snapshot(extraction)
+        assert snapshot is not None and len(snapshot) == 3
+
+        from_snapshot = await extraction_snapshot.load_record_payloads(session, [extraction])
+        # SQLite hands back naive timestamps; snapshots always carry UTC.
+        from_db[0]["last_activity"] = from_db[0]["last_activity"].replace(tzinfo=UTC)
+        assert from_snapshot == from_db
+
+        wanted = [from_db[2]["id"], from_db[0]["id"]]
+        by_id = await extraction_snapshot.load_payloads_by_id(session, [extraction], wanted)
+        assert sorted(payload["id"] for payload in by_id) == sorted(wanted)
+
+        extraction.checksum = "d" * 64
+        assert extraction_snapshot.open_snapshot(extraction) is None
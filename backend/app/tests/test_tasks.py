@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.task_service import BackgroundJobRunner, TaskRegistry
+
+
+@pytest.mark.asyncio
+async def test_background_jobs_are_bounded_and_isolated() -> None:
+    registry = TaskRegistry()
+    runner = BackgroundJobRunner(concurrency=2)
+    running = 0
+    peak = 0
+
+    async def job(index: int) -> None:
+        nonlocal running, peak
+        task = registry.create("document_upload", group_id="batch-1")
+        registry.start(task)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if index == 1:
+            registry.fail(task, "boom")
+            raise RuntimeError("boom")
+        registry.complete(task, result={"index": index})
+
+    for index in range(5):
+        runner.submit(job(index))
+    await runner.drain()
+
+    tasks = registry.list_for_group("batch-1")
+    assert peak == 2
+    assert len(tasks) == 5
+    assert sorted(task.status for task in tasks) == ["completed"] * 4 + ["failed"]
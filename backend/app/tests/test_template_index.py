@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import DocumentTemplate
+from app.services.template_index import TemplateDetectionIndex
+
+
+def _template(application_id: uuid.UUID, columns: list[str], *, is_shared: bool = False) -> DocumentTemplate:
+    return DocumentTemplate(
+        id=uuid.uuid4(),
+        application_id=application_id,
+        name="template",
+        format="csv",
+        detection={"required_columns": columns},
+        is_shared=is_shared,
+        is_active=True,
+    )
+
+
+def test_detect_picks_best_overlap_for_application() -> None:
+    app_id = uuid.uuid4()
+    index = TemplateDetectionIndex()
+    partial = _template(app_id, ["User ID", "Status", "Email"])
+    exact = _template(app_id, ["User ID", "Status"])
+    other_app = _template(uuid.uuid4(), ["User ID", "Status"])
+    for template in (partial, exact, other_app):
+        index.upsert(template)
+
+    template_id, confidence = index.detect(app_id, "csv", ["user_id", "status", "department"])
+
+    assert template_id == exact.id
+    assert confidence == 1.0
+
+
+def test_shared_templates_match_any_application_and_removal_updates_index() -> None:
+    index = TemplateDetectionIndex()
+    shared = _template(uuid.uuid4(), ["Employee ID", "Status"], is_shared=True)
+    index.upsert(shared)
+
+    assert index.detect(uuid.uuid4(), "csv", ["employee_id", "status"]) == (shared.id, 1.0)
+    assert index.detect(uuid.uuid4(), "xlsx", ["employee_id", "status"]) == (None, 0.0)
+
+    index.remove(shared.id)
+    assert index.detect(uuid.uuid4(), "csv", ["employee_id", "status"]) == (None, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_templates_committed_with_older_timestamps() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    app_id = uuid.uuid4()
+    index = TemplateDetectionIndex()
+
+    async with session_maker() as session:
+        session.add(_template(app_id, ["User ID", "Status"]))
+        await session.commit()
+        await index.ensure_fresh(session)
+
+        # A writer that started earlier commits after the index last loaded.
+        late = _template(app_id, ["Employee ID", "Department"])
+        late.updated_at = datetime.now(UTC) - timedelta(hours=1)
+        session.add(late)
+        await session.commit()
+        index._checked_at = 0.0
+        await index.ensure_fresh(session)
+
+    assert index.detect(app_id, "csv", ["employee_id", "department"]) == (late.id, 1.0)
+    await engine.dispose()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.services import blob_store
+from app.services.storage import LocalStorageBackend
+from app.services.upload_service import UploadTooLargeError, commit_upload, stage_upload
+
+
+@pytest.mark.asyncio
+async def test_stage_upload_hashes_while_streaming(tmp_path: Path) -> None:
+    content = b"user_id,status\n" + b"u1,active\n" * 50_000
+    upload = UploadFile(file=io.BytesIO(content), filename="users.csv")
+
+    staged = await stage_upload(upload, tmp_path, max_bytes=len(content))
+    destination = await commit_upload(staged, tmp_path / "users.csv")
+
+    assert staged.file_hash == hashlib.sha256(content).hexdigest()
+    assert staged.size == len(content)
+    assert destination.read_bytes() == content
+    assert not staged.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_stage_upload_enforces_limit_and_cleans_up(tmp_path: Path) -> None:
+    upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="big.csv")
+
+    with pytest.raises(UploadTooLargeError):
+        await stage_upload(upload, tmp_path, max_bytes=1024)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_blob_store_deduplicates_and_reference_counts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = LocalStorageBackend(tmp_path)
+    monkeypatch.setattr(blob_store, "get_storage_backend", lambda: backend)
+    monkeypatch.setattr(blob_store, "staging_dir", lambda: tmp_path / "staging")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    content = b"employee_id,status\ne1,active\n"
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        first = await stage_upload(UploadFile(file=io.BytesIO(content), filename="hr.csv"), blob_store.staging_dir(), 1024)
+        second = await stage_upload(UploadFile(file=io.BytesIO(content), filename="hr.csv"), blob_store.staging_dir(), 1024)
+        blob = await blob_store.store_blob(session, first)
+        same_blob = await blob_store.store_blob(session, second)
+        await session.commit()
+
+        assert same_blob is blob
+        assert blob.ref_count == 2
+        assert blob.storage_path == blob_store.blob_key(first.file_hash)
+        assert (tmp_path / blob.storage_path).read_bytes() == content
+        assert list(blob_store.staging_dir().iterdir()) == []
+
+        await blob_store.release_blob(session, blob.sha256)
+        assert await blob_store.collect_unreferenced_blobs(session, grace=timedelta(0)) == 0
+        await blob_store.release_blob(session, blob.sha256)
+        assert blob.released_at is not None
+        # Freshly released blobs are kept for the grace period.
+        assert await blob_store.collect_unreferenced_blobs(session) == 0
+
+        third = await stage_upload(UploadFile(file=io.BytesIO(content), filename="hr.csv"), blob_store.staging_dir(), 1024)
+        assert await blob_store.store_blob(session, third) is blob
+        assert blob.ref_count == 1 and blob.released_at is None
+        await blob_store.release_blob(session, blob.sha256)
+        assert await blob_store.collect_unreferenced_blobs(session, grace=timedelta(0)) == 1
+        await session.commit()
+        assert not (tmp_path / blob.storage_path).exists()
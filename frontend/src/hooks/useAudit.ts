@@ -1,15 +1,17 @@
-import { useMutation, useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation } from '@tanstack/react-query';
 
 import { api } from '../lib/api';
-import type { AuditEntry } from '../types';
+import type { AuditEntryPage } from '../types';
 
-export function useAuditEntries() {
-  return useQuery({
-    queryKey: ['audit'],
-    queryFn: async () => {
-      const resp = await api.get<AuditEntry[]>('/audit');
+export function useAuditEntries(filters: Record<string, string> = {}) {
+  return useInfiniteQuery({
+    queryKey: ['audit', filters],
+    initialPageParam: undefined as string | undefined,
+    queryFn: async ({ pageParam }) => {
+      const resp = await api.get<AuditEntryPage>('/audit', { params: { ...filters, cursor: pageParam } });
       return resp.data;
-    }
+    },
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined
   });
 }
 
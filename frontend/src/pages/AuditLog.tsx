@@ -5,7 +5,8 @@ import { useAuditEntries, useVerifyAuditChain } from '../hooks/useAudit';
 import { formatDateTime } from '../lib/utils';
 
 export function AuditLogPage() {
-  const { data: entries = [], isLoading } = useAuditEntries();
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useAuditEntries();
+  const entries = data?.pages.flatMap((page) => page.items) ?? [];
   const verify = useVerifyAuditChain();
   const [verificationMessage, setVerificationMessage] = useState<string>('');
 
@@ -66,6 +67,17 @@ export function AuditLogPage() {
                 ))}
               </tbody>
             </table>
+            {hasNextPage ? (
+              <div className="border-t border-slate-100 px-4 py-3">
+                <button
+                  onClick={() => fetchNextPage()}
+                  disabled={isFetchingNextPage}
+                  className="rounded border border-slate-300 px-3 py-1.5 text-sm text-slate-700 hover:bg-slate-50 disabled:opacity-50"
+                >
+                  {isFetchingNextPage ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            ) : null}
           </div>
         )}
       </section>
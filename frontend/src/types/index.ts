@@ -49,6 +49,7 @@ export interface Review {
   period_end?: string | null;
   due_date?: string | null;
   status: string;
+  previous_review_id?: string | null;
   analysis_checksum?: string | null;
   created_at: string;
   updated_at: string;
@@ -113,3 +114,9 @@ export interface AuditEntry {
   previous_hash?: string | null;
   metadata: Record<string, unknown>;
 }
+
+export interface AuditEntryPage {
+  items: AuditEntry[];
+  next_cursor?: string | null;
+  has_more: boolean;
+}